@@ -4,12 +4,574 @@
 import datetime
 import time
 import csv
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider
 import os
 import sys
 import configparser
 import difflib
+import collections
+import itertools
+import math
+import functools
+import bisect
+import hashlib
+import io
+import json
+import locale
+import mmap
+import array
+import struct
+import shutil
+import contextlib
+import threading
+import errno
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+
+
+class TurfEvent():
+    """Compact turf event, with the time as minutes since 1970 and interned names and reasons.\
+        Still works like the old (time, line) tuples, and a turf worth multiple turfjes is one event with a quantity.
+    """
+    __slots__ = ('minute','category','name','reason','quantity')
+
+    epoch = datetime.datetime(1970,1,1)
+
+    def __init__(self,minute,category,name,reason,quantity=1):
+        self.minute = minute
+        self.category = sys.intern(category)
+        self.name = sys.intern(name)
+        self.reason = sys.intern(reason)
+        self.quantity = quantity
+
+    @classmethod
+    def from_line(cls,eventtime,line):
+        """Creates a turf event from a line of the turf file.
+
+        Args:
+            eventtime (datetime.datetime): Time of the turf event.
+            line (list): Line of the turf file. Lines from before the quantity column was added count as 1 turf.
+
+        Returns:
+            TurfEvent: The turf event.
+        """
+        return cls(cls.to_minute(eventtime),line[0],line[1],line[6],int(line[7]) if len(line) > 7 else 1)
+
+    @classmethod
+    def to_minute(cls,eventtime):
+        """Converts a time to minutes since 1970.
+        """
+        return (eventtime - cls.epoch) // datetime.timedelta(minutes=1)
+
+    @property
+    def time(self):
+        """datetime.datetime: Time of the turf event.
+        """
+        return self.epoch + datetime.timedelta(minutes=self.minute)
+
+    @property
+    def line(self):
+        """list: The turf event as a line of the turf file.
+        """
+        eventtime = self.time
+        return [self.category,
+                self.name,
+                f'{eventtime.hour:02d}:{eventtime.minute:02d}',
+                str(eventtime.day),
+                ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'][eventtime.month-1],
+                str(eventtime.year),
+                self.reason,
+                str(self.quantity)]
+
+    def __getitem__(self,index):
+        return (self.time, self.line)[index]
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        return iter((self.time, self.line))
+
+    def __repr__(self):
+        return f'TurfEvent({self.time:%H:%M %d %b %Y}, {self.category}, {self.name}, {self.reason}, {self.quantity})'
+
+
+
+
+class TurfColumns():
+    """Read-only turf list of the binary turf file, kept in the columns it's stored in.\
+        Works like a list of TurfEvent objects, but those are only made for the turfs that are looked at.
+    """
+    categories = ['minus','turf']
+
+    def __init__(self,minutes,quantity,nameid,reasonid,category,names,reasons):
+        """Wraps the columns, as read by _map_Turfbinary.
+
+        Args:
+            minutes (array.array): Epoch minutes of every turf.
+            quantity (array.array): Amount of turfjes of every turf.
+            nameid (array.array): Id of the name of every turf, in names.
+            reasonid (array.array): Id of the reason of every turf, in reasons.
+            category (array.array): Category of every turf, 1 for turf and 0 for minus.
+            names (list): Names in order of their id.
+            reasons (list): Reasons in order of their id.
+        """
+        self.minutes = minutes
+        self.quantity = quantity
+        self.nameid = nameid
+        self.reasonid = reasonid
+        self.category = category
+        self.names = names
+        self.reasons = reasons
+
+    @property
+    def columns(self):
+        """list: The minutes, quantity, name id, reason id and category columns.
+        """
+        return [self.minutes, self.quantity, self.nameid, self.reasonid, self.category]
+
+    def __len__(self):
+        return len(self.minutes)
+
+    def __getitem__(self,index):
+        if isinstance(index, slice):
+            return TurfColumns(*[column[index] for column in self.columns], self.names, self.reasons)
+        return TurfEvent(self.minutes[index],
+                         self.categories[self.category[index]],
+                         self.names[self.nameid[index]],
+                         self.reasons[self.reasonid[index]],
+                         self.quantity[index])
+
+    def __iter__(self):
+        for index in range(len(self.minutes)):
+            yield self[index]
+
+    def sorted(self):
+        """The same turfs sorted by time. The sort is stable, so turfs with the same time keep the order in which they were written.
+
+        Returns:
+            TurfColumns: The sorted turfs, which is itself if they already were.
+        """
+        minutes = self.minutes
+        if all(minutes[i] <= minutes[i + 1] for i in range(len(minutes) - 1)):
+            return self
+        order = sorted(range(len(minutes)), key=minutes.__getitem__)
+        return TurfColumns(*[array.array(column.typecode, [column[i] for i in order]) for column in self.columns], self.names, self.reasons)
+
+    def insert(self,turfs):
+        """Adds turfs at the given places, like the solidarity turfs.
+
+        Args:
+            turfs (list): Turfs to add formatted as [(index1,turf1),...], sorted by index. The index is where the turf goes.
+
+        Returns:
+            TurfColumns: The turfs with the new ones added.
+        """
+        names, reasons = list(self.names), list(self.reasons)
+        nameids = {name: i for i, name in enumerate(names)}
+        reasonids = {reason: i for i, reason in enumerate(reasons)}
+        # Solidarity turfs can be worth more turfjes than fit in the quantity column of the file
+        columns = [array.array(typecode) for typecode in ['i','l','H','H','B']]
+        oldcolumns = [column if column.typecode == newcolumn.typecode else array.array(newcolumn.typecode, column)
+                      for column, newcolumn in zip(self.columns, columns)]
+
+        previndex = 0
+        for index, turf in turfs:
+            for column, newcolumn in zip(oldcolumns, columns):
+                newcolumn.extend(column[previndex:index])
+            for value, ids, table in [(turf.name, nameids, names), (turf.reason, reasonids, reasons)]:
+                if value not in ids:
+                    ids[value] = len(table)
+                    table.append(value)
+            for newcolumn, value in zip(columns, [turf.minute, turf.quantity, nameids[turf.name], reasonids[turf.reason],
+                                                  self.categories.index(turf.category)]):
+                newcolumn.append(value)
+            previndex = index
+        for column, newcolumn in zip(oldcolumns, columns):
+            newcolumn.extend(column[previndex:])
+
+        return TurfColumns(*columns, names, reasons)
+
+    def balance(self,names,alltime=False):
+        """Turf balance, the same as TurfTool._calc_Turfbalance.
+
+        Args:
+            names (list): Names to give the balance of.
+            alltime (bool, optional): Whether to consider inned turfs. Defaults to False.
+
+        Returns:
+            dict: Turf balance.
+        """
+        totals = [0] * len(self.names)
+        for nameid, category, quantity in zip(self.nameid, self.category, self.quantity):
+            if category == 1:
+                totals[nameid] += quantity
+            elif not alltime:
+                totals[nameid] -= quantity
+
+        turfbalance = {name: 0 for name in names}
+        for nameid, name in enumerate(self.names):
+            if name in turfbalance:
+                turfbalance[name] += totals[nameid]
+        return turfbalance
+
+
+
+
+class AliasIndex():
+    """Precompiled alias translator for one alias set, so {key: [aliases]}. Gives the same answers as _aliastranslate,\
+        but only the keys that share enough letters with the response are given to difflib.
+    """
+    def __init__(self,aliasset,cutoff=0.6):
+        self.cutoff = cutoff
+
+        # Lowercase lookups, the first key or alias wins when two only differ in case. Just like the old translator,
+        # an alias used twice belongs to the last key that has it.
+        self.keys = {}
+        for key in aliasset.keys():
+            self.keys.setdefault(key.lower(), key)
+        inv_aliasset = {}
+        for key in aliasset.keys():
+            for alias in aliasset[key]:
+                inv_aliasset[alias] = key
+        self.aliases = {}
+        for alias in inv_aliasset.keys():
+            self.aliases.setdefault(alias.lower(), inv_aliasset[alias])
+
+        # For every letter, which keys have it and how often
+        self.letterindex = {}
+        self.keylengths = {}
+        for key in aliasset.keys():
+            self.keylengths[key] = len(key)
+            for letter, count in collections.Counter(key).items():
+                self.letterindex.setdefault(letter, []).append((key, count))
+
+    def match(self,response):
+        """Looks up a key or alias, ignoring case.
+
+        Args:
+            response (str): Key or alias.
+
+        Returns:
+            str: The key, or None if the response isn't a key or alias.
+        """
+        if response.lower() in self.keys:
+            return self.keys[response.lower()]
+        return self.aliases.get(response.lower())
+
+    def correct(self,response):
+        """Spelling corrector, same as difflib.get_close_matches(response, keys)[0].
+
+        Args:
+            response (str): Misspelled key.
+
+        Returns:
+            str: The closest key, or None if nothing is close enough.
+        """
+        # The letters a key shares with the response give the quick ratio, which is never lower than the real ratio
+        shared = {}
+        for letter, count in collections.Counter(response).items():
+            for key, keycount in self.letterindex.get(letter, []):
+                shared[key] = shared.get(key, 0) + min(count, keycount)
+
+        quickratios = sorted(((2.0 * sharedcount / (self.keylengths[key] + len(response)), key) for key, sharedcount in shared.items()),
+                             reverse=True)
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(response)
+        best = None
+        # Go from the highest quick ratio down, once it drops below the cutoff or the best score so far nothing can beat it anymore
+        for quickratio, key in quickratios:
+            if quickratio < self.cutoff or (best is not None and quickratio < best[0]):
+                break
+            matcher.set_seq1(key)
+            score = matcher.ratio()
+            # difflib picks the highest score, and with equal scores the key that sorts last
+            if score >= self.cutoff and (best is None or (score, key) > best):
+                best = (score, key)
+
+        return None if best is None else best[1]
+
+    @classmethod
+    def from_State(cls,state):
+        """Puts an index back together from its state, as kept in the compiled settings, without compiling the aliases again.
+
+        Args:
+            state (dict): The attributes of the index.
+
+        Returns:
+            AliasIndex: The index.
+        """
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        return index
+
+    def translate(self,response):
+        """Translates a response to its key.
+
+        Args:
+            response (str): Response that needs to be translated from an alias.
+
+        Returns:
+            str: Either translated input or the normal input.
+        """
+        key = self.match(response)
+        if key is None:
+            key = self.correct(response)
+        return response if key is None else key
+
+
+
+
+class TurfIndex():
+    """Balances at any moment, so "what was everyone's balance at time T", by bisecting a list per person.\
+        Follows the turfs over time graph in Statistics, so with the no-negative-turf rule and the solidarity turfs.
+    """
+    def __init__(self,turfset,names,forcenonegative=False):
+        """Builds the index.
+
+        Args:
+            turfset (list): List of turfs sorted by time as TurfEvent objects, with the solidarity turfs, as given by read_TurfFile.
+            names (list): Names to keep track of.
+            forcenonegative (bool, optional): Whether to implement the no-negative-turf rule. Defaults to False.
+        """
+        self.names = list(dict.fromkeys(names))
+        self.forcenonegative = forcenonegative
+
+        # Solidarity turfs in the future go in front of the last turf, so the times aren't always in order.
+        # A turf counts from the latest time up to and including it, which always goes up and can be bisected.
+        self.minutes = {name: [] for name in self.names}
+        self.balances = {name: [] for name in self.names}
+        self.alltimes = {name: [] for name in self.names}
+        # Per person and (category, reason): the times and the amount of turfs with that reason so far
+        self.reasonminutes = {name: {} for name in self.names}
+        self.reasoncounts = {name: {} for name in self.names}
+
+        balance = {name: 0 for name in self.names}
+        alltime = {name: 0 for name in self.names}
+        latest = None
+        for turf in turfset:
+            latest = turf.minute if latest is None or turf.minute > latest else latest
+            if turf.name not in balance:
+                continue
+            if turf.category == 'turf':
+                balance[turf.name] += turf.quantity
+                alltime[turf.name] += turf.quantity
+            elif turf.category == 'minus':
+                balance[turf.name] -= turf.quantity
+                if forcenonegative and balance[turf.name] < 0:
+                    balance[turf.name] = 0
+            else:
+                continue
+            self.minutes[turf.name].append(latest)
+            self.balances[turf.name].append(balance[turf.name])
+            self.alltimes[turf.name].append(alltime[turf.name])
+
+            key = (turf.category, turf.reason)
+            if key not in self.reasonminutes[turf.name]:
+                self.reasonminutes[turf.name][key] = []
+                self.reasoncounts[turf.name][key] = [0]
+            counts = self.reasoncounts[turf.name][key]
+            self.reasonminutes[turf.name][key].append(latest)
+            counts.append(counts[-1] + turf.quantity)
+
+    def _select(self,names):
+        """Checks the selected names, None selects everyone.
+        """
+        if names is None:
+            return self.names
+        unknown = [name for name in names if name not in self.minutes]
+        if len(unknown) > 0:
+            raise KeyError(f'Unknown name "{unknown[0]}".')
+        return list(dict.fromkeys(names))
+
+    @staticmethod
+    def _find(minutes,values,minute):
+        """Last value at or before the minute, 0 if there is none yet.
+        """
+        index = bisect.bisect_right(minutes, minute)
+        return values[index - 1] if index > 0 else 0
+
+    def balance(self,moment,names=None):
+        """Balance and all-time turfs of everyone at a moment.
+
+        Args:
+            moment (datetime.datetime): Moment to look at. Turfs at that exact minute are counted.
+            names (list, optional): Names to give the balance of. Defaults to everyone in the index.
+
+        Returns:
+            dict: Turf balance at the moment.
+            dict: All-time turf balance at the moment.
+        """
+        minute = TurfEvent.to_minute(moment)
+        names = self._select(names)
+        return ({name: self._find(self.minutes[name], self.balances[name], minute) for name in names},
+                {name: self._find(self.minutes[name], self.alltimes[name], minute) for name in names})
+
+    def reasons(self,moment,names=None,start=None):
+        """Amount of turfs and innings per reason up to a moment, optionally only counting from a start moment.
+
+        Args:
+            moment (datetime.datetime): Moment to count up to, turfs at that exact minute are counted.
+            names (list, optional): Names to count the turfs of. Defaults to everyone in the index.
+            start (datetime.datetime, optional): Only count turfs after this moment. Defaults to counting from the first turf.
+
+        Returns:
+            dict: Amount of turfs per turf reason.
+            dict: Amount of inned turfs per inning reason.
+        """
+        minute = TurfEvent.to_minute(moment)
+        startminute = None if start is None else TurfEvent.to_minute(start)
+        counts = {'turf': {}, 'minus': {}}
+        for name in self._select(names):
+            for (category, reason), minutes in self.reasonminutes[name].items():
+                # The count lists start with a 0 for before the first turf
+                index = bisect.bisect_right(minutes, minute)
+                count = self.reasoncounts[name][(category, reason)][index]
+                if startminute is not None:
+                    count -= self.reasoncounts[name][(category, reason)][min(index, bisect.bisect_right(minutes, startminute))]
+                if count > 0:
+                    counts[category][reason] = counts[category].get(reason, 0) + count
+        return counts['turf'], counts['minus']
+
+    def query(self,moment,names=None):
+        """Everything there is to know at a moment.
+
+        Args:
+            moment (datetime.datetime): Moment to look at. Turfs at that exact minute are counted.
+            names (list, optional): Names to look at. Defaults to everyone in the index.
+
+        Returns:
+            dict: The balance, all-time turfs, turf reasons and inning reasons, as "balance", "alltime", "reasons" and "innings".
+        """
+        balance, alltime = self.balance(moment, names)
+        reasons, innings = self.reasons(moment, names)
+        return {'balance': balance, 'alltime': alltime, 'reasons': reasons, 'innings': innings}
+
+    def query_Range(self,start,end,names=None):
+        """Everything that happened between two moments, so after start up to and including end.
+
+        Args:
+            start (datetime.datetime): Start of the range, turfs at that exact minute are not counted.
+            end (datetime.datetime): End of the range, turfs at that exact minute are counted.
+            names (list, optional): Names to look at. Defaults to everyone in the index.
+
+        Returns:
+            dict: The balance at the start and at the end, the turfs received in between, and the turf and inning reasons
+                  in between, as "start", "end", "turfed", "reasons" and "innings".
+        """
+        if end < start:
+            raise ValueError('The end of the range is before its start.')
+        startbalance, startalltime = self.balance(start, names)
+        endbalance, endalltime = self.balance(end, names)
+        reasons, innings = self.reasons(end, names, start=start)
+        return {'start': startbalance,
+                'end': endbalance,
+                'turfed': {name: endalltime[name] - startalltime[name] for name in endalltime.keys()},
+                'reasons': reasons,
+                'innings': innings}
+
+
+
+
+class TurfProfiler():
+    """Named timers and counters, which do next to nothing while disabled so they can stay in the code.\
+        Can be written as a JSON trace for chrome://tracing or ui.perfetto.dev, optionally with cProfile alongside.
+    """
+    # Handed out for every phase while disabled, a nullcontext can be entered any number of times
+    nophase = contextlib.nullcontext()
+
+    def __init__(self,enabled=False,profile=False,maxphases=10000):
+        """Sets up the profiler.
+
+        Args:
+            enabled (bool, optional): Whether to time the phases and keep the counters. Defaults to False.
+            profile (bool, optional): Whether to also run cProfile, which implies enabled. Defaults to False.
+            maxphases (int, optional): Amount of phases kept for the trace, the summary still adds up all of them. Defaults to 10000.
+        """
+        self.enabled = enabled or profile
+        self.start = time.perf_counter()
+        # The last timed phases as (name, start, duration, thread), and the timings per phase of all of them
+        self.phases = collections.deque(maxlen=maxphases)
+        self.totals = {}
+        self.counters = collections.Counter()
+        self.profile = None
+        if profile:
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def phase(self,name):
+        """Times a phase for as long as the with-block lasts.
+
+        Args:
+            name (str): Name of the phase.
+
+        Returns:
+            contextmanager: The timer.
+        """
+        if not self.enabled:
+            return TurfProfiler.nophase
+        return self._time_Phase(name)
+
+    @contextlib.contextmanager
+    def _time_Phase(self,name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.phases.append((name, start, duration, threading.get_ident()))
+            if name not in self.totals:
+                self.totals[name] = {'calls': 0, 'total': 0.0, 'max': 0.0}
+            self.totals[name]['calls'] += 1
+            self.totals[name]['total'] += duration
+            self.totals[name]['max'] = max(self.totals[name]['max'], duration)
+
+    def count(self,name,amount=1):
+        """Adds to a counter.
+
+        Args:
+            name (str): Name of the counter.
+            amount (int, optional): Amount to add. Defaults to 1.
+        """
+        if self.enabled:
+            self.counters[name] += amount
+
+    def summary(self):
+        """The timings per phase, also of the phases that were dropped already.
+
+        Returns:
+            dict: Amount of calls, total and longest time in seconds per phase, in the order they were first timed.
+        """
+        return {name: dict(timing) for name, timing in self.totals.items()}
+
+    def export_Trace(self,path):
+        """Writes everything timed as a JSON trace in the Trace Event format, with the summary and counters next to it.
+
+        Args:
+            path (str): Path to write the trace to.
+        """
+        events = [{'name': name, 'ph': 'X', 'ts': (start - self.start) * 1e6, 'dur': duration * 1e6, 'pid': os.getpid(), 'tid': thread}
+                  for name, start, duration, thread in self.phases]
+        tracefile = open(path, 'w')
+        json.dump({'traceEvents': events, 'phases': self.summary(), 'counters': dict(self.counters)}, tracefile, indent=1)
+        tracefile.close()
+
+    def export_Profile(self,path):
+        """Stops cProfile and writes its statistics, which can be read with pstats or e.g. snakeviz.
+
+        Args:
+            path (str): Path to write the statistics to.
+        """
+        if self.profile is None:
+            raise ValueError('cProfile is not running, create the profiler with profile=True.')
+        self.profile.disable()
+        self.profile.dump_stats(path)
+
 
 
 
@@ -17,7 +579,7 @@ import difflib
 class TurfTool():
     """Main TurfTool class.
     """    
-    def __init__(self, config,**kwargs):
+    def __init__(self, config,profiler=None,**kwargs):
         super().__init__(**kwargs)
         
         # Initiate the main loop state
@@ -26,13 +588,29 @@ class TurfTool():
         # Initiate a debug state
         self.debug = False
 
+        # Timers and counters, which do nothing unless enabled
+        self.profiler = profiler if profiler is not None else TurfProfiler()
+
         # Read the base settings, files and data
         self._check_filepresence(config)
-        self._readconfig(config)
+        with self.profiler.phase('config'):
+            self._readconfig(config)
+        self._sync_TurfFormats()
 
         # Determine current time
         self.currenttime = datetime.datetime.now()
 
+        # Cache for the statistics, such that opening them again doesn't read everything again. Holds the last few
+        # read turf files and turf matrices, the least recently used one is thrown out first.
+        self.statisticscache = collections.OrderedDict()
+        self.cachesize = 8
+
+        # Where reading the csv turf file stopped last time, together with the turfs read so far. See _follow_TurfFile.
+        self.turftail = None
+
+        # String tables of the binary turf file after the last write, such that the next write doesn't read the whole file
+        self.binarytables = None
+
 
 
 
@@ -63,7 +641,13 @@ class TurfTool():
             print("Checking existence of turf file...")
 
         # Check whether Turfjes.csv is present
-        self.turfpath = os.path.dirname(config) + '\\Turfjes.csv'
+        self.turfpath = os.path.join(os.path.dirname(os.path.abspath(config)), 'Turfjes.csv')
+        # The checkpoint file lives next to it, it holds the balances as of some point in the turf file
+        self.checkpointpath = os.path.splitext(self.turfpath)[0] + '.checkpoint'
+        # As does the binary version of the turf file, which is only used if selected in the settings cfg file
+        self.binarypath = os.path.splitext(self.turfpath)[0] + '.turf'
+        # And the lock file, which makes sure multiple TurfTools using the same turf file don't write through each other
+        self.lockpath = os.path.splitext(self.turfpath)[0] + '.lock'
         turfpresent = os.path.exists(self.turfpath)
 
         if not turfpresent:
@@ -72,10 +656,13 @@ class TurfTool():
             # If not present, create a fresh file
             turffile = open(self.turfpath,'x',newline='')
             writer = csv.writer(turffile,delimiter=';')
-            writer.writerow(['Category','Name','Time','Day','Month','Year','Reason'])
+            writer.writerow(['Category','Name','Time','Day','Month','Year','Reason','Quantity'])
             turffile.close()
-        elif self.debug:
-            print("Existing turf file found, proceeding...")
+        else:
+            if self.debug:
+                print("Existing turf file found, proceeding...")
+            # Turf files from before the quantity column need to be migrated once
+            self.migrate_TurfFile()
 
         if self.debug:
             # Print that file checks have been completed
@@ -84,15 +671,84 @@ class TurfTool():
 
 
 
+    # Bump this when the compiled settings change, such that compiled files of older versions are compiled again
+    configversion = 2
+
+    # Compiled settings that JSON can't hold, with how they're written down and read back
+    compiledtypes = {'day0': (datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+                     'solidaritydelta': (datetime.timedelta.total_seconds, lambda seconds: datetime.timedelta(seconds=seconds))}
+
     def _readconfig(self,config):
-        """Functionally important function that interprets the settings cfg file for further use.
+        """Functionally important function that interprets the settings cfg file for further use.\
+            The settings cfg file is only interpreted and checked once, the result is kept in a compiled file next to it.
+            As long as the settings cfg file stays the same, the compiled file is loaded instead.
 
         Args:
             config (str): path to the settings cfg file.
         """
+        configfile = open(config,'rb')
+        configdata = configfile.read()
+        configstat = os.fstat(configfile.fileno())
+        configfile.close()
+
+        # The compiled file belongs to this exact settings cfg file
+        compiledpath = os.path.splitext(config)[0] + '.compiled'
+        compiledkey = [TurfTool.configversion, configstat.st_mtime_ns, hashlib.sha1(configdata).hexdigest()]
+        compiled = self._load_Compiledconfig(compiledpath,compiledkey)
+        if compiled is None:
+            compiled = self._compile_Config(configdata,config)
+            compiled['key'] = compiledkey
+            self._save_Compiledconfig(compiledpath,compiled)
+            self.profiler.count('config compiled')
+
+        for setting, value in compiled['settings'].items():
+            setattr(self, setting, value)
+        # The alias lookups are compiled as well, so they only need to be put back
+        for setting, state in compiled['indexes'].items():
+            setattr(self, setting, AliasIndex.from_State(state))
+
+
+
+    def _compile_Config(self,configdata,config):
+        """Interprets and checks the settings cfg file. All mistakes are gathered before complaining, so they can be
+            fixed in one go instead of being run into one by one while using the TurfTool.
+
+        Args:
+            configdata (bytes): Contents of the settings cfg file.
+            config (str): path to the settings cfg file, for the error message.
+
+        Raises:
+            ValueError: If there are mistakes in the settings cfg file, with the line number of every mistake.
+
+        Returns:
+            dict: The settings as {'settings': {attribute: value}, 'indexes': {attribute: alias index state}}.
+        """
+        # Decode the same way as ConfigParser.read does
+        configtext = configdata.decode(locale.getpreferredencoding(False))
         ConfigParser = configparser.ConfigParser()
         ConfigParser.optionxform = str
-        ConfigParser.read(config)
+        try:
+            ConfigParser.read_string(configtext,source=config)
+        except configparser.Error as error:
+            # These already say on which line it went wrong
+            raise ValueError(f'Mistake in the settings file {config}:\n{error}') from None
+
+        # ConfigParser doesn't remember where everything is, so look that up for the error messages
+        linenumbers = {}
+        section = None
+        for linenumber, line in enumerate(configtext.splitlines(), 1):
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                section = stripped[1:-1]
+                linenumbers[(section, None)] = linenumber
+            elif section is not None and stripped != '' and stripped[0] not in '#;' and not line[0].isspace():
+                delimiters = [line.find(delimiter) for delimiter in '=:' if delimiter in line]
+                if len(delimiters) > 0:
+                    linenumbers[(section, line[:min(delimiters)].strip())] = linenumber
+
+        mistakes = []
+        def mistake(section,option,message):
+            mistakes.append((linenumbers.get((section, option), linenumbers.get((section, None), 0)), message))
 
         def listdecoder(string,type=list):
             # Select type 
@@ -107,40 +763,243 @@ class TurfTool():
                 lst = [item.lstrip() for item in string]
                 return [item for item in lst if item != '']
 
+        def items(section):
+            # A whole section, or nothing if it's not there
+            if not ConfigParser.has_section(section):
+                mistake(section, None, f'The [{section}] section is missing')
+                return []
+            try:
+                return ConfigParser.items(section)
+            except configparser.Error as error:
+                mistake(section, None, str(error))
+                return []
+
+        def get(section,option,convert=str,fallback=None,required=True):
+            # A single setting, converted to what it should be. Gives the fallback if it's missing or wrong.
+            if not ConfigParser.has_option(section, option):
+                if required and ConfigParser.has_section(section):
+                    mistake(section, None, f'The {option} setting is missing from [{section}]')
+                return fallback
+            try:
+                return convert(ConfigParser.get(section, option))
+            except configparser.Error as error:
+                mistake(section, option, str(error))
+            except ValueError as error:
+                mistake(section, option, f'{option} {error}')
+            return fallback
+
+        def boolean(string):
+            if string.lower() not in ConfigParser.BOOLEAN_STATES:
+                raise ValueError(f'should be True or False, not "{string}"')
+            return ConfigParser.BOOLEAN_STATES[string.lower()]
+
+        def integer(string):
+            try:
+                return int(string)
+            except ValueError:
+                raise ValueError(f'should be a whole number, not "{string}"') from None
+
+        def noduplicates(section,aliasset):
+            # Aliases are looked up ignoring case, so two that only differ in case are the same alias
+            seen = {}
+            for key, aliases in aliasset.items():
+                for alias in aliases:
+                    if alias.lower() in seen and seen[alias.lower()] != key:
+                        mistake(section, key, f'The alias "{alias}" of {key} is also an alias of {seen[alias.lower()]}')
+                    seen.setdefault(alias.lower(), key)
+
+        settings = {}
 
         # Read the names
-        self.names = {item[0]: item[1] for item in ConfigParser.items('names')}
-        # Read the aliases for the names
-        self.aliases = {item[0]: listdecoder(item[1]) for item in ConfigParser.items('aliases')}
-        # Slightly transform this to be {Name:Aliases}
-        self.aliases = {self.names[key]: self.aliases[key] for key in self.aliases.keys()}
-        # Read the groups
-        self.groups = {item[0]: listdecoder(item[1]) for item in ConfigParser.items('groups')}
+        names = dict(items('names'))
+        seen = {}
+        for function, name in names.items():
+            if name != '' and name in seen:
+                mistake('names', function, f'{function} has the same name as {seen[name]}, "{name}"')
+            seen.setdefault(name, function)
+        settings['names'] = names
+        # Read the aliases for the names, slightly transformed to be {Name:Aliases}
+        aliases = {function: listdecoder(value) for function, value in items('aliases')}
+        for function in aliases.keys():
+            if function not in names:
+                mistake('aliases', function, f'There are aliases for {function}, but {function} is not in [names]')
+        for function in names.keys():
+            if ConfigParser.has_section('aliases') and function not in aliases:
+                mistake('aliases', None, f'{function} is missing from [aliases], give it an empty list ([]) if it has no aliases')
+        noduplicates('aliases', aliases)
+        settings['aliases'] = {names[function]: aliases[function] for function in aliases.keys() if function in names}
+
+        # Read the groups, everyone in a group should be a committee member
+        groups = {group: listdecoder(value) for group, value in items('groups')}
+        for group, members in groups.items():
+            for member in members:
+                if member not in names.values():
+                    mistake('groups', group, f'{member} is in the group {group}, but is not in [names]')
+        settings['groups'] = groups
         # Read the aliases for the groups
-        self.groupsaliases = {item[0]: listdecoder(item[1]) for item in ConfigParser.items('groupsaliases')}
-        
-        # Read the turf reasons
-        self.turfreasons = {item[0]:    {'aliases': listdecoder(item[1].split('],')[0]),
-                                        'value': int(item[1].split('],')[1])} for item in ConfigParser.items('turfreasons')}
-        # Read the inning reasons
-        self.inningreasons = {item[0]:  {'aliases': listdecoder(item[1].split('],')[0]),
-                                        'value': int(item[1].split('],')[1])} for item in ConfigParser.items('inningreasons')}
-        # Read the turf rules
-        self.solidarity = bool(ConfigParser.get('turfrules','solidarity'))
-        if self.solidarity:
-            self.solidarityday = ConfigParser.get('turfrules','solidarityday')
-            self.solidaritytime = ConfigParser.get('turfrules','solidaritytime')
-        self.forcenonegative = bool(ConfigParser.get('turfrules','forcenonegative'))
+        groupsaliases = {}
+        for group, value in items('groupsaliases'):
+            if group not in groups:
+                mistake('groupsaliases', group, f'There are aliases for the group {group}, but {group} is not in [groups]')
+            groupsaliases[group] = listdecoder(value)
+        for group in groups.keys():
+            if ConfigParser.has_section('groupsaliases') and group not in groupsaliases:
+                mistake('groupsaliases', None, f'The group {group} is missing from [groupsaliases], give it an empty list ([]) if it has no aliases')
+        noduplicates('groupsaliases', groupsaliases)
+        settings['groupsaliases'] = groupsaliases
+
+        # Read the turf and inning reasons, formatted as [ALIASES], STANDARD AMOUNT
+        for section in ['turfreasons', 'inningreasons']:
+            reasons = {}
+            for reason, value in items(section):
+                if len(value.split('],')) != 2:
+                    mistake(section, reason, f'{reason} should look like "[aliases], amount", not "{value}"')
+                    continue
+                try:
+                    reasons[reason] = {'aliases': listdecoder(value.split('],')[0]),
+                                       'value': int(value.split('],')[1])}
+                except ValueError:
+                    mistake(section, reason, f'The amount of {reason} should be a whole number, not "{value.split("],")[1].strip()}"')
+            noduplicates(section, {reason: reasons[reason]['aliases'] for reason in reasons.keys()})
+            settings[section] = reasons
+
+        # Read the turf rules, the solidarity moment is only needed if solidarity is on
+        settings['solidarity'] = get('turfrules','solidarity',boolean,False)
+        settings['solidarityday'] = get('turfrules','solidarityday',fallback=None,required=settings['solidarity'])
+        settings['solidaritytime'] = get('turfrules','solidaritytime',fallback=None,required=settings['solidarity'])
+        settings['forcenonegative'] = get('turfrules','forcenonegative',boolean,False)
 
         # Read the plot settings
-        self.day0 = datetime.datetime.strptime(ConfigParser.get('plotsettings','day0'),"%H:%M %d %b %Y")
-        self.day0event = ConfigParser.get('plotsettings','day0event')
-        self.graphxticks = int(ConfigParser.get('plotsettings','graphxticks'))
-        self.usecolours = ConfigParser.get('plotsettings','usecolours').lower() == 'true'
-        self.colours = [f'#{i}' for i in listdecoder(ConfigParser.get('plotsettings','colours'))]
-        self.barcolours = [int(i) for i in listdecoder(ConfigParser.get('plotsettings','barcolours'))]
-        self.maxreasons = int(ConfigParser.get('plotsettings','maxreasons'))
-        self.anytimeramount = int(ConfigParser.get('plotsettings','anytimeramount'))
+        def moment(string):
+            try:
+                return datetime.datetime.strptime(string,"%H:%M %d %b %Y")
+            except ValueError:
+                raise ValueError(f'should look like "16:02 07 May 2002", not "{string}"') from None
+        settings['day0'] = get('plotsettings','day0',moment,datetime.datetime(2000,1,1))
+        settings['day0event'] = get('plotsettings','day0event',fallback='')
+        settings['graphxticks'] = get('plotsettings','graphxticks',integer,10)
+        settings['usecolours'] = get('plotsettings','usecolours',boolean,False)
+        settings['colours'] = get('plotsettings','colours',lambda string: [f'#{i}' for i in listdecoder(string)],[])
+        settings['barcolours'] = get('plotsettings','barcolours',lambda string: [integer(i) for i in listdecoder(string)],[0, 0])
+        settings['maxreasons'] = get('plotsettings','maxreasons',integer,14)
+        settings['anytimeramount'] = get('plotsettings','anytimeramount',integer,16)
+        if settings['usecolours'] and len(settings['colours']) < len(names):
+            mistake('plotsettings', 'colours', f'There are {len(names)} people but only {len(settings["colours"])} colours')
+        if any(i < 0 or i >= len(settings['colours']) for i in settings['barcolours']) and ConfigParser.has_option('plotsettings','barcolours'):
+            mistake('plotsettings', 'barcolours', f'barcolours should pick colours from the colours list, which has {len(settings["colours"])} colours')
+
+        # Read the file settings, older settings files don't have these yet
+        settings['turfformat'] = get('files','turfformat',str.lower,'csv',required=False)
+        if settings['turfformat'] not in ['csv','binary']:
+            mistake('files', 'turfformat', f'Unknown turf file format "{settings["turfformat"]}", choose either csv or binary.')
+        settings['durablewrites'] = get('files','durablewrites',boolean,False,required=False)
+
+        # Work out the solidarity moment, which is the same for every turf file read
+        settings['solidaritydelta'] = None
+        if settings['solidarityday'] is not None and settings['solidaritytime'] is not None:
+            weekdays = ['mo','tu','we','th','fr','sa','su']
+            daysolidarity, solidaritytime = None, None
+            if settings['solidarityday'][:2].lower() in weekdays:
+                daysolidarity = weekdays.index(settings['solidarityday'][:2].lower()) + 1
+            else:
+                mistake('turfrules', 'solidarityday', f'solidarityday should be a day of the week like Tue, not "{settings["solidarityday"]}"')
+            try:
+                solidaritytime = datetime.datetime.strptime(settings['solidaritytime'],'%H:%M')
+            except ValueError:
+                mistake('turfrules', 'solidaritytime', f'solidaritytime should be a time like 12:45, not "{settings["solidaritytime"]}"')
+            if daysolidarity is not None and solidaritytime is not None:
+                settings['solidaritydelta'] = self._calc_Solidaritydelta(settings['day0'], daysolidarity, solidaritytime)
+
+        if len(mistakes) > 0:
+            raise ValueError(f'Mistakes in the settings file {config}:\n' +
+                             '\n'.join(f'Line {linenumber}: {message}' if linenumber > 0 else message for linenumber, message in sorted(mistakes)))
+
+        # Compile the alias lookups once, instead of for every translated alias
+        indexes = {'nameindex': AliasIndex(settings['aliases']),
+                   'groupindex': AliasIndex(settings['groupsaliases']),
+                   'turfreasonindex': AliasIndex({reason: settings['turfreasons'][reason]['aliases'] for reason in settings['turfreasons'].keys()}),
+                   'inningreasonindex': AliasIndex({reason: settings['inningreasons'][reason]['aliases'] for reason in settings['inningreasons'].keys()})}
+
+        return {'settings': settings, 'indexes': {setting: vars(index) for setting, index in indexes.items()}}
+
+
+
+    def _calc_Solidaritydelta(self,day0,daysolidarity,solidaritytime):
+        """Works out how long it is from day 0 until the first solidarity moment.
+
+        Args:
+            day0 (datetime.datetime): Day 0.
+            daysolidarity (int): Day of the week of the solidarity moment, with Monday as 1.
+            solidaritytime (datetime.datetime): Time of the solidarity moment, only the hours and minutes count.
+
+        Returns:
+            datetime.timedelta: Time until the first solidarity moment.
+        """
+        # It's the handiest to set a date to the first occurrence of the specified date and time after day 0
+        # Find out what day of the week day0 is
+        weekday_day0 = day0.isoweekday()
+        timesolidarity = datetime.timedelta(hours=solidaritytime.hour,minutes=solidaritytime.minute)
+
+        deltaday_solidarity = datetime.timedelta(days=(weekday_day0-daysolidarity)%7)
+        delta_solidarity = deltaday_solidarity - (datetime.timedelta(hours=day0.hour,
+                                                    minutes=day0.minute) 
+                                                    - timesolidarity)                   # I hate datetime
+                                                                                        # With a passion
+
+        if delta_solidarity.days < 0:
+            delta_solidarity += datetime.timedelta(days=7)
+
+        # Okay that was hellish to code, but now we have a delta until the next moment from day 0 until the
+        # next moment solidarity needs to be applied.
+        return delta_solidarity
+
+
+
+    def _load_Compiledconfig(self,compiledpath,compiledkey):
+        """Loads the compiled settings, if they were compiled from the settings cfg file as it is now.
+
+        Args:
+            compiledpath (str): Path to the compiled file.
+            compiledkey (list): Version, modification time and sha1 hash of the settings cfg file.
+
+        Returns:
+            dict: The compiled settings as made by _compile_Config, or None if they need to be compiled again.
+        """
+        try:
+            with open(compiledpath,'r',encoding='utf-8') as compiledfile:
+                compiled = json.load(compiledfile)
+            if compiled['key'] != compiledkey:
+                return None
+            for setting, (_, decode) in TurfTool.compiledtypes.items():
+                if setting in compiled['settings']:
+                    compiled['settings'][setting] = decode(compiled['settings'][setting])
+            return compiled
+        except (OSError, KeyError, TypeError, ValueError):
+            # Not compiled yet, or by something else than this TurfTool
+            return None
+
+
+
+    def _save_Compiledconfig(self,compiledpath,compiled):
+        """Writes the compiled settings. If that's not possible, the settings are simply compiled every time.
+
+        Args:
+            compiledpath (str): Path to the compiled file.
+            compiled (dict): The compiled settings with their key.
+        """
+        # Write to a temporary file first so a half-written file can never be read, also not by another TurfTool starting at the same time
+        temppath = f'{compiledpath}.{os.getpid()}.tmp'
+        settings = dict(compiled['settings'])
+        for setting, (encode, _) in TurfTool.compiledtypes.items():
+            if setting in settings:
+                settings[setting] = encode(settings[setting])
+        try:
+            with open(temppath,'w',encoding='utf-8') as compiledfile:
+                json.dump(dict(compiled, settings=settings), compiledfile)
+            os.replace(temppath, compiledpath)
+        except OSError:
+            pass
+
 
 
     def launch(self):
@@ -159,9 +1018,35 @@ class TurfTool():
                             'Pressing Enter also closes the program.\n\n')
             
             # Interpret the commands
+            timed = self.profiler.summary()
             self._interpret_commands(command)
             self._print_topline()
 
+            # In debug mode, show where the time went
+            if self.debug:
+                self._print_Timings(timed)
+
+
+
+    def _print_Timings(self,before=None):
+        """Prints how long every phase took, for debugging.
+
+        Args:
+            before (dict, optional): Summary of the profiler from earlier, only what was timed since is printed. Defaults to None.
+        """
+        before = before if before is not None else {}
+        timings = {}
+        for name, timing in self.profiler.summary().items():
+            previous = before.get(name, {'calls': 0, 'total': 0.0})
+            if timing['calls'] > previous['calls']:
+                timings[name] = (timing['calls'] - previous['calls'], timing['total'] - previous['total'])
+        if len(timings) == 0:
+            return
+        for name, (calls, total) in timings.items():
+            print(f"{name.ljust(12)} {calls:>4}x {total*1000:9.1f} ms")
+        if len(self.profiler.counters) > 0:
+            print('Since startup: ' + ', '.join(f'{name} {count}' for name, count in self.profiler.counters.items()))
+
 
 
     def _print_topline(self,welcomemsg = False):
@@ -232,6 +1117,8 @@ class TurfTool():
         
         elif command.lower() == 'debug':
             self.debug = not self.debug
+            # Debug mode also times everything. The timers stay on afterwards, so a trace asked for at startup isn't cut short
+            self.profiler.enabled = self.profiler.enabled or self.debug
             self._interpret_commands(input(f"Debug mode {'en'*self.debug}{'dis'*(1-self.debug)}abled\n\n"))
 
         else:
@@ -260,7 +1147,7 @@ class TurfTool():
         
         else:
             # Separate the targets (or put it in a list if no comma is present) and translate the aliases
-            turftargets =   [self._aliastranslate(self.aliases,target.lstrip()) 
+            turftargets =   [self._aliastranslate(self.nameindex,target.lstrip()) 
                             for target in nameresponse.split(',')]
             
             # Check if there are unknown names
@@ -327,8 +1214,7 @@ class TurfTool():
 
             else:
                 # Decode the reason
-                turfreason = self._aliastranslate({reason: self.turfreasons[reason]['aliases'] for reason in self.turfreasons.keys()},
-                                                    reasonresponse)
+                turfreason = self._aliastranslate(self.turfreasonindex,reasonresponse)
 
 
         # Third step is to ask how many turfjes this action is worth
@@ -398,15 +1284,8 @@ class TurfTool():
         # After this we can write the turf and ask if the user wants to write another turf
         if turfcontinue:
             self._print_topline()
-            for name in turftargets:
-                for i in range(turfamount):
-                    self.write_TurfFile('turf',
-                                        name,
-                                        timeturf,
-                                        day,
-                                        month,
-                                        year,
-                                        turfreason)
+            self.write_TurfBatch([['turf',name,timeturf,day,month,year,turfreason,turfamount]
+                                  for name in turftargets if turfamount > 0])
             
             # Write the confirmation message
             print(  'The following turf was written succesfully:\n'\
@@ -446,7 +1325,7 @@ class TurfTool():
         
         else:
             # Separate the targets (or put it in a list if no comma is present) and translate the aliases
-            inningtargets =   [self._aliastranslate(self.aliases,target.lstrip()) 
+            inningtargets =   [self._aliastranslate(self.nameindex,target.lstrip()) 
                             for target in nameresponse.split(',')]
             
             # Check if there are unknown names
@@ -513,8 +1392,7 @@ class TurfTool():
 
             else:
                 # Decode the reason
-                inningreason = self._aliastranslate({reason: self.inningreasons[reason]['aliases'] for reason in self.inningreasons.keys()},
-                                                    reasonresponse)
+                inningreason = self._aliastranslate(self.inningreasonindex,reasonresponse)
 
         # Third step is to ask how many turfjes this action is worth
         if inningcontinue:
@@ -583,15 +1461,8 @@ class TurfTool():
         # After this we can write the turf and ask if the user wants to write another turf
         if inningcontinue:
             self._print_topline()
-            for name in inningtargets:
-                for i in range(inningamount):
-                    self.write_TurfFile('minus',
-                                        name,
-                                        timeinning,
-                                        day,
-                                        month,
-                                        year,
-                                        inningreason)
+            self.write_TurfBatch([['minus',name,timeinning,day,month,year,inningreason,inningamount]
+                                  for name in inningtargets if inningamount > 0])
             
             # Write the confirmation message
             print(  'The following inning action was written succesfully:\n'\
@@ -653,13 +1524,13 @@ class TurfTool():
             group = list(self.names.values())
 
         # Check if the response is a group alias
-        elif self._aliastranslate(self.groupsaliases,groupresponse) in self.groupsaliases.keys():
-            group = self.groups[self._aliastranslate(self.groupsaliases,groupresponse)]
+        elif self._aliastranslate(self.groupindex,groupresponse) in self.groupsaliases.keys():
+            group = self.groups[self._aliastranslate(self.groupindex,groupresponse)]
 
         # Else the only usable option left is if the response is a name/group of names
         else:
             # Separate the targets (or put it in a list if no comma is present) and translate the aliases
-            group = [self._aliastranslate(self.aliases,target.lstrip()) 
+            group = [self._aliastranslate(self.nameindex,target.lstrip()) 
                             for target in groupresponse.split(',')]
             
             # Check if there are unknown names
@@ -685,128 +1556,31 @@ class TurfTool():
             print('Current turf balance:\n')
             print(''.join([name+': '+str(turfbalance[name])+'\n' for name in group]))
 
-            # Reshape the turf list to a balance-per-event form
-            ## Create a time-zero event for plotting reasons
-            turfmat = {name:{'alltime':[0],
-                            'current':[0]
-                            } for name in group}
-            turfmat['time'] = [min(turfset[0][0],self.day0)]
-            turfmat['event'] = [None]
-            turfmat['eventtype'] = [None]
-            # From testing the pie chart was pretty slow, so precompile all the turf reason counts
-            turfmat['turfeventcount'] = [{}]
-
-            nondisplayedreasons = []
-            # Walk through the turf list
-            for turf in turfset:
-                if turf[1][1] in group:
-                    # Add the time, event and event type of the turf to the relevant lists
-                    turfmat['time'].append(turf[0])
-                    turfmat['eventtype'].append(turf[1][0])
-                    turfmat['turfeventcount'].append(turfmat['turfeventcount'][-1].copy())
-
-                    # For the event, make sure it is in the reason list. Otherwise assign it as Other.
-                    if turf[1][6] in self.turfreasons.keys() or turf[1][6] in self.inningreasons.keys():
-                        turfmat['event'].append(turf[1][6])
-                    else:
-                        nondisplayedreasons.append(turf[1][6])
-                        turfmat['event'].append('Other')
-
-                    # Add 1 to the event count if the event type is 'turf'.
-                    if turfmat['eventtype'][-1] != 'turf':
-                        pass
-                    elif turfmat['event'][-1] in turfmat['turfeventcount'][-1].keys():
-                        turfmat['turfeventcount'][-1][turfmat['event'][-1]] += 1
-                    else:
-                        turfmat['turfeventcount'][-1][turfmat['event'][-1]] = 1
-
-                    # Copy the value over for each person within the group
-                    for name in group:
-                        turfmat[name]['alltime'].append(turfmat[name]['alltime'][-1])
-                        turfmat[name]['current'].append(turfmat[name]['current'][-1])
-
-                    # If it is a inned turf, check for nonzero
-                    if turf[1][0] == 'minus' and turfmat[turf[1][1]]['current'][-1] > 0:
-                        turfmat[turf[1][1]]['current'][-1] -= 1
-
-                    elif turf[1][0] == 'minus' and self.forcenonegative == False:
-                        turfmat[turf[1][1]]['current'][-1] -= 1
-
-                    elif turf[1][0] == 'turf':
-                        turfmat[turf[1][1]]['alltime'][-1] += 1
-                        turfmat[turf[1][1]]['current'][-1] += 1
-
-            # Do some postprocessing on the turf event count to limit the reasons
-            for turfcountid in range(len(turfmat['turfeventcount'])):
-                if len(turfmat['turfeventcount'][turfcountid].keys()) > self.maxreasons:
-                    # Sort the turf count
-                    s_turfcount = dict(sorted(turfmat['turfeventcount'][turfcountid].items(), 
-                                                        key=lambda x:x[1], 
-                                                        reverse=True))
-
-                    # Add the highest counting turf reasons until the maximum amount of reasons are reached
-                    turfcount_disp = {"Other": 0}
-                    while len(turfcount_disp.keys()) < self.maxreasons:
-                        if list(s_turfcount.keys())[0] == "Other":
-                            turfcount_disp["Other"] += s_turfcount["Other"]
-                        else:
-                            turfcount_disp[list(s_turfcount.keys())[0]] = s_turfcount[list(s_turfcount.keys())[0]]
-                        s_turfcount.pop(list(s_turfcount.keys())[0])
-
-                    # Add the remaining reasons to others
-                    turfcount_disp["Other"] += sum(s_turfcount.values())
-
-                    # Update the turf matrix
-                    turfmat['turfeventcount'][turfcountid] = turfcount_disp
-
-
-            # Make a last column at the current time for plotting reasons
-            for name in group:
-                turfmat[name]['alltime'].append(turfmat[name]['alltime'][-1])
-                turfmat[name]['current'].append(turfmat[name]['current'][-1])
-            
-
-            tend = self.currenttime
-            turfmat['time'].append(tend)
-            turfmat['event'].append(None)
-            turfmat['eventtype'].append(None)
-            turfmat['turfeventcount'].append(turfmat['turfeventcount'][-1].copy())
+            # Only now load matplotlib, it takes longer to import than everything else together
+            plotting = self._import_Plotting()
+            if plotting is None:
+                input(  'The plots need matplotlib, which is not installed. Run requirements.bat to install it.\n\n'\
+                        'Press Enter to continue...\n\n')
+                return
+            plt, Slider = plotting
+
+            # Reshape the turf list to a balance-per-event form, unless it was already done for this group and turf list
+            cachekey = ('turfmat', id(turfset), tuple(group), self.forcenonegative, self.day0, self.currenttime)
+            cached = self._cache_Get(cachekey)
+            if cached is not None and cached[0] is turfset:
+                _, turfmat, nondisplayedreasons = cached
+            else:
+                with self.profiler.phase('turfmat'):
+                    turfmat, nondisplayedreasons = self._build_Turfmat(turfset,group)
+                # The turf list is kept in the cache as well, so its id can't be reused by another list
+                self._cache_Put(cachekey, (turfset, turfmat, nondisplayedreasons))
 
             # Print which turfs are grouped into 'Other'
             print('The following turfing reasons were grouped into "Other" for plotting reasons:\n')
             print(''.join([reason + '\n' for reason in set(nondisplayedreasons)]))
 
-            # Prepare the subplots
-            ## Bar chart for all-time/current turf standings
-            ax1 = plt.subplot(2,2,1)
-            X_axis = list(range(len(group)))
-            width = 0.4
-
-            # Pie chart for the turf reasons
-            ax2 = plt.subplot(2,2,2)
-
-
-            # Graph for turfs over time
-            ax3 = plt.subplot(2,2,(3,4))
-            ## Plot the crossover line for anytimers
-            ax3.plot([self.day0, self.currenttime],[self.anytimeramount]*2, color='red')
-            ## This can just be pre-plotted since we can just shift the x limit
-            colourid = 0
-            for name in group:
-                if self.usecolours:
-                    ax3.step(   turfmat['time'],
-                                turfmat[name]['current'],
-                                label=name,
-                                color=self.colours[colourid],
-                                where='post')
-                else:
-                    ax3.step(   turfmat['time'],
-                                turfmat[name]['current'],
-                                label=name,
-                                where='post')
-                colourid += 1
-            ax3.set_title('Turfs Over Time')
-            ax3.grid()
+            # Draw the plots
+            updateplots = self._plot_Statistics(plt,turfmat,group)
 
             # Slider below the bottom graph
             slider_ax = plt.axes([0.05, 0.05, 0.9, 0.03])  # [left, bottom, width, height]
@@ -814,142 +1588,627 @@ class TurfTool():
             slider.valtext.set_visible(False)
 
 
-            # Define an internal function which fills the plots based on the slider value
-            def updateplots(val):
-                # Clear the pie chart and the bar chart
-                ax1.clear()
-                ax2.clear()
+            # Assign the update function to the slider and display the plot
+            slider.on_changed(updateplots)
+            plt.show()
+
+
 
-                # Determine the selected time and which index corresponds to that time
-                tselect = min(turfmat['time'][0],self.day0) + val*(self.currenttime - min(turfmat['time'][0],self.day0)+datetime.timedelta(minutes=1)) # Beunoplossingen hell yeah
-                try:
-                    index_t = [tselect <= t for t in turfmat['time']].index(True) - 1
-                except:
-                    index_t = len(turfmat['time']) - 1
-                
-                # Update the bar plot
+    def _plot_Statistics(self,plt,turfmat,group):
+        """Draws the bar chart, the pie chart and the turfs over time graph into the current figure, at the current time.
+
+        Args:
+            plt (module): matplotlib.pyplot.
+            turfmat (dict): The turf matrix, as made by _build_Turfmat.
+            group (list): Names of the people to plot.
+
+        Returns:
+            function: Updates the plots to a moment between the first turf (0) and now (1), for the slider.
+        """
+        # Prepare the subplots
+        ## Bar chart for all-time/current turf standings
+        ax1 = plt.subplot(2,2,1)
+        X_axis = list(range(len(group)))
+        width = 0.4
+
+        # Pie chart for the turf reasons
+        ax2 = plt.subplot(2,2,2)
+
+
+        # Graph for turfs over time
+        ax3 = plt.subplot(2,2,(3,4))
+        ## Plot the crossover line for anytimers
+        ax3.plot([self.day0, self.currenttime],[self.anytimeramount]*2, color='red')
+        ## This can just be pre-plotted since we can just shift the x limit
+        colourid = 0
+        for name in group:
+            if self.usecolours:
+                ax3.step(   turfmat['time'],
+                            turfmat[name]['current'],
+                            label=name,
+                            color=self.colours[colourid],
+                            where='post')
+            else:
+                ax3.step(   turfmat['time'],
+                            turfmat[name]['current'],
+                            label=name,
+                            where='post')
+            colourid += 1
+        ax3.set_title('Turfs Over Time')
+        ax3.grid()
+
+        # These only need to be set once, the slider only changes the x limit of the turfs over time graph
+        ax3.tick_params(axis='x',labelrotation=-45)
+        ax3.legend(loc='upper left')
+
+        # Solidarity turfs can be a bit in the future and still come before the last turf, so the times aren't always sorted.
+        # The running maximum is, and the first time it reaches a moment is also the first time the times themselves do
+        timeindex = list(itertools.accumulate(turfmat['time'], max))
+
+        # The bars, pie wedges and legends are made on the first update and after that only changed in place
+        plotartists = {'currentbars': None, 'alltimebars': None, 'wedges': None, 'autotexts': None, 'pielegend': None}
+
+
+        # Define an internal function which fills the plots based on the slider value
+        def updateplots(val):
+            with self.profiler.phase('updateplots'):
+                fillplots(val)
+            self.profiler.count('redraws')
+
+        def fillplots(val):
+            # Determine the selected time and which index corresponds to that time
+            tselect = min(turfmat['time'][0],self.day0) + val*(self.currenttime - min(turfmat['time'][0],self.day0)+datetime.timedelta(minutes=1)) # Beunoplossingen hell yeah
+            index_t = bisect.bisect_left(timeindex, tselect) - 1
+
+            # Update the bar plot
+            currentturfs = [turfmat[name]['current'][index_t] for name in group]
+            alltimeturfs = [turfmat[name]['alltime'][index_t] for name in group]
+            if plotartists['currentbars'] is None:
                 if self.usecolours:
-                    ax1.bar([x - width / 2 for x in X_axis], 
-                            [turfmat[name]['current'][index_t] for name in group], 
-                            width, 
-                            color=self.colours[self.barcolours[0]], 
-                            label='Current turfs')
-                    ax1.bar([x + width / 2 for x in X_axis], 
-                            [turfmat[name]['alltime'][index_t] for name in group], 
-                            width, 
-                            color=self.colours[self.barcolours[1]], 
-                            label='All-time turfs')
+                    plotartists['currentbars'] = ax1.bar([x - width / 2 for x in X_axis],
+                                                         currentturfs,
+                                                         width,
+                                                         color=self.colours[self.barcolours[0]],
+                                                         label='Current turfs')
+                    plotartists['alltimebars'] = ax1.bar([x + width / 2 for x in X_axis],
+                                                         alltimeturfs,
+                                                         width,
+                                                         color=self.colours[self.barcolours[1]],
+                                                         label='All-time turfs')
                 else:
-                    ax1.bar([x - width / 2 for x in X_axis], 
-                            [turfmat[name]['current'][index_t] for name in group], 
-                            width, 
-                            label='Current turfs')
-                    ax1.bar([x + width / 2 for x in X_axis], 
-                            [turfmat[name]['alltime'][index_t] for name in group], 
-                            width, 
-                            label='All-time turfs')
-                    
+                    plotartists['currentbars'] = ax1.bar([x - width / 2 for x in X_axis],
+                                                         currentturfs,
+                                                         width,
+                                                         label='Current turfs')
+                    plotartists['alltimebars'] = ax1.bar([x + width / 2 for x in X_axis],
+                                                         alltimeturfs,
+                                                         width,
+                                                         label='All-time turfs')
+
                 ax1.set_xticks(X_axis,group)
                 ax1.legend()
+                ax1.set_title('All-time and Current Turf Standings')
+            else:
+                for bar, height in zip(plotartists['currentbars'], currentturfs):
+                    bar.set_height(height)
+                for bar, height in zip(plotartists['alltimebars'], alltimeturfs):
+                    bar.set_height(height)
+                ax1.relim()
+                ax1.autoscale_view()
+
+            # Update the pie chart. The wedges are made once, for as many reasons as the pie can ever show, and the ones
+            # that aren't needed at this moment are hidden. The colours go by position, so only the angles, numbers and legend change.
+            turfeventcount = self._count_Turfreasons(turfmat,index_t)
+            turftotal = sum(turfeventcount.values())
+            if plotartists['wedges'] is None:
+                # Grouping into "Other" keeps it at maxreasons, "Other" included
+                maxwedges = min(len(turfmat['reasons']), self.maxreasons)
+                piechart = [], [], []
+                if maxwedges > 0 and self.usecolours:
+                    piechart = ax2.pie([1]*maxwedges,
+                                       colors=self.colours,
+                                       startangle=90,
+                                       autopct='%d',
+                                       pctdistance=1.1
+                                       )
+                elif maxwedges > 0:
+                    piechart = ax2.pie([1]*maxwedges,
+                                       startangle=90,
+                                       autopct='%d',
+                                       pctdistance=1.1
+                                       )
+                ax2.autoscale()
+                ax2.set_title('Turf Reasons')
+                plotartists['wedges'], plotartists['autotexts'] = piechart[0], piechart[2]
+
+            # Same as the pie chart does itself, so in turns starting at 90 degrees and going counterclockwise.
+            # Without any turfs there's no pie to draw.
+            shown = len(turfeventcount) if turftotal > 0 else 0
+            theta1 = 90 / 360
+            for wedge, autotext, key in zip(plotartists['wedges'][:shown], plotartists['autotexts'], turfeventcount.keys()):
+                theta2 = theta1 + turfeventcount[key] / turftotal
+                wedge.set_theta1(360 * theta1)
+                wedge.set_theta2(360 * theta2)
+                thetam = 2 * math.pi * 0.5 * (theta1 + theta2)
+                autotext.set_position((1.1 * math.cos(thetam), 1.1 * math.sin(thetam)))
+                autotext.set_text(str(turfeventcount[key]))
+                theta1 = theta2
+            for i, (wedge, autotext) in enumerate(zip(plotartists['wedges'], plotartists['autotexts'])):
+                wedge.set_visible(i < shown)
+                autotext.set_visible(i < shown)
+
+            # The legend only has to be made again when the amount of reasons changes
+            labels = [f"{key} ({turfeventcount[key]})" for key in list(turfeventcount.keys())[:shown]]
+            if plotartists['pielegend'] is not None and len(plotartists['pielegend'].get_texts()) == shown:
+                for legendtext, label in zip(plotartists['pielegend'].get_texts(), labels):
+                    legendtext.set_text(label)
+            else:
+                plotartists['pielegend'] = ax2.legend(plotartists['wedges'][:shown],
+                                                      labels,
+                                                      loc='center right',
+                                                      bbox_to_anchor=(-0.16, 0.5),
+                                                      frameon=False
+                                                      )
 
-                # Update the pie chart
-                if self.usecolours:
-                    ax2.pie(turfmat['turfeventcount'][index_t].values(),
-                            colors=self.colours,
-                            startangle=90,
-                            autopct=lambda i: int(round((i/100)*sum(turfmat['turfeventcount'][index_t].values()))),
-                            pctdistance=1.1
-                            )
+            # Shift the x limit of the turfs over time graph
+            ax3.set_xticks([min(self.day0,turfmat['time'][0])+(i/(self.graphxticks-1))*(tselect-min(self.day0,turfmat['time'][0]))
+                            for i in range(self.graphxticks)])
+            ax3.set_xlim(min(self.day0,turfmat['time'][0]),tselect)
 
-                else:
-                    ax2.pie(turfmat['turfeventcount'][index_t].values(),
-                            startangle=90,
-                            autopct=lambda i: int(round((i/100)*sum(turfmat['turfeventcount'][index_t].values()))),
-                            pctdistance=1.1
-                            )
-
-
-                ax2.legend([f"{key} ({turfmat['turfeventcount'][index_t][key]})" for key in turfmat['turfeventcount'][index_t].keys()],
-                        loc='center right', 
-                        bbox_to_anchor=(-0.16, 0.5),
-                        frameon=False
-                        )
-                ax2.autoscale()
 
-                # Shift the x limit of the turfs over time graph
-                ax3.tick_params(axis='x',labelrotation=-45)
-                ax3.set_xticks([min(self.day0,turfmat['time'][0])+(i/(self.graphxticks-1))*(tselect-min(self.day0,turfmat['time'][0]))
-                                for i in range(self.graphxticks)])
-                ax3.set_xlim(min(self.day0,turfmat['time'][0]),tselect)
-                ax3.legend(loc='upper left')
+        # Show the current standings and make some adjustments to the window positions
+        updateplots(1)
+        # try:
+        #     wm = plt.get_current_fig_manager()
+        #     wm.window.showMaximized()
+        # except:
+        #     print('Failed to maximize window, display regular window instead...')
+        plt.subplots_adjust(left=0.05,right=0.95,bottom=0.2,top=0.9)
 
-                # Set the titles for ax1 and ax2 because those get deleted on update
-                ax1.set_title('All-time and Current Turf Standings')
-                ax2.set_title('Turf Reasons')
+        # Set the title with actual grammar
+        if len(group) == 1:
+            plt.suptitle(f'Turf Statistics for {group[0]}')
+        elif len(group) == 2:
+            plt.suptitle(f'Turf Statistics for {group[0]} and {group[1]}')
+        elif len(group) > 2:
+            titlestr = ''.join(f'{name}, ' for name in group[:-2])
+            plt.suptitle(f'Turf Statistics for {titlestr}{group[-2]} and {group[-1]}')
 
+        return updateplots
 
-            # Maximize the window and make some adjustments to the window positions
-            updateplots(1)
-            # try:
-            #     wm = plt.get_current_fig_manager()
-            #     wm.window.showMaximized()
-            # except:
-            #     print('Failed to maximize window, display regular window instead...')
-            plt.subplots_adjust(left=0.05,right=0.95,bottom=0.2,top=0.9)
-
-            # Set the title with actual grammar
-            if len(group) == 1:
-                plt.suptitle(f'Turf Statistics for {group[0]}')
-            elif len(group) == 2:
-                plt.suptitle(f'Turf Statistics for {group[0]} and {group[1]}')
-            elif len(group) > 2:
-                titlestr = ''.join(f'{name}, ' for name in group[:-2])
-                plt.suptitle(f'Turf Statistics for {titlestr}{group[-2]} and {group[-1]}')
 
-            # Assign the update function to the slider and display the plot
-            slider.on_changed(updateplots)
-            plt.show()
 
+    def _build_Turfmat(self,turfset,group):
+        """Reshapes the turf list to a balance-per-event form for the plots, with NumPy. Every selected turf gets a row,\
+            plus a time-zero row at the start and a row at the current time at the end.
 
+        Args:
+            turfset (list): List of turfs sorted by time, as TurfEvent objects or a TurfColumns.
+            group (list): Names of the people to plot.
 
-    def _aliastranslate(self,aliasset,response):
-        """"Alias translator.
+        Returns:
+            dict: The turf matrix. Has the times, the current and all-time balance per name and the turf reasons per row.
+            list: Reasons that aren't in the settings cfg file, which are grouped into "Other".
+        """
+        import numpy as np
+
+        people = {name: i for i, name in enumerate(dict.fromkeys(group))}
+        if isinstance(turfset, TurfColumns):
+            # The binary turf file is already in columns, so the turfs of the group are picked straight out of those
+            def column(values):
+                return np.frombuffer(values, dtype=values.typecode) if len(values) > 0 else np.zeros(0, dtype=np.int64)
+            nameperson = np.array([people.get(name, -1) for name in turfset.names] + [-1], dtype=np.int64)
+            person = nameperson[column(turfset.nameid)]
+            selected = np.flatnonzero(person >= 0)
+            person = person[selected]
+            quantity = column(turfset.quantity)[selected].astype(np.int64)
+            isturf = column(turfset.category)[selected] == 1
+            isminus = ~isturf
+            minutes = column(turfset.minutes)[selected].astype(np.int64)
+            reasonid = column(turfset.reasonid)[selected].astype(np.int64)
+            reasonlist = turfset.reasons
+        else:
+            turfs = [turf for turf in turfset if turf.name in people]
+            quantity = np.fromiter((turf.quantity for turf in turfs), dtype=np.int64, count=len(turfs))
+            person = np.fromiter((people[turf.name] for turf in turfs), dtype=np.int64, count=len(turfs))
+            isturf = np.fromiter((turf.category == 'turf' for turf in turfs), dtype=bool, count=len(turfs))
+            isminus = np.fromiter((turf.category == 'minus' for turf in turfs), dtype=bool, count=len(turfs))
+            minutes = np.fromiter((turf.minute for turf in turfs), dtype=np.int64, count=len(turfs))
+            reasontable = {}
+            reasonid = np.fromiter((reasontable.setdefault(turf.reason, len(reasontable)) for turf in turfs),
+                                   dtype=np.int64, count=len(turfs))
+            reasonlist = list(reasontable.keys())
+        count = len(quantity)
+        rows = np.arange(1, count + 1)
+
+        # Put every turf in the column of its person and sum up the columns
+        alltime = np.zeros((count + 2, len(people)), dtype=np.int64)
+        alltime[rows, person] = np.where(isturf, quantity, 0)
+        np.cumsum(alltime, axis=0, out=alltime)
+
+        current = np.zeros((count + 2, len(people)), dtype=np.int64)
+        current[rows, person] = np.where(isturf, quantity, np.where(isminus, -quantity, 0))
+        np.cumsum(current, axis=0, out=current)
+        if self.forcenonegative:
+            # An inning can't go below zero, which works out to the cumulative sum minus the lowest it has been so far.
+            # The first row is 0, so the lowest point so far is never above zero
+            current -= np.minimum.accumulate(current, axis=0)
+
+        turfmat = {name: {'alltime': alltime[:, i],
+                          'current': current[:, i]} for name, i in people.items()}
+        turftimes = (np.datetime64(TurfEvent.epoch, 'm') + minutes.astype('timedelta64[m]')).tolist()
+        turfmat['time'] = [min(turfset[0].time,self.day0)] + turftimes + [self.currenttime]
+
+        # For the pie chart, remember per row which reason was turfed. The counts are only added up for the row that is shown,
+        # starting from the nearest checkpoint before it
+        shown = [reason in self.turfreasons.keys() or reason in self.inningreasons.keys() for reason in reasonlist]
+        nondisplayedreasons = [reasonlist[i] for i in reasonid.tolist() if not shown[i]]
+        displaynames = list(dict.fromkeys(reason if isshown else 'Other' for reason, isshown in zip(reasonlist, shown)))
+        display = np.array([displaynames.index(reason if isshown else 'Other') for reason, isshown in zip(reasonlist, shown)],
+                           dtype=np.int64)
+
+        # Reasons get their id in the order they are first turfed
+        turfrows = rows[isturf]
+        turfdisplay = display[reasonid[isturf]]
+        firstdisplay, firstindex = np.unique(turfdisplay, return_index=True)
+        order = np.argsort(firstindex)
+        newid = np.zeros(len(displaynames), dtype=np.int64)
+        newid[firstdisplay[order]] = np.arange(len(order))
+        turfmat['reasonid'] = np.full(count + 2, -1, dtype=np.int64)
+        turfmat['reasonid'][turfrows] = newid[turfdisplay]
+        turfmat['reasonrow'] = turfrows[firstindex[order]].tolist()
+        turfmat['quantity'] = np.concatenate(([0], quantity, [0]))
+        turfmat['reasons'] = [displaynames[i] for i in firstdisplay[order].tolist()]
+
+        # Checkpoint k holds the counts of all rows up to row k*checkpointrows. A row counts for every checkpoint
+        # from the first one at or after it, so add it there and sum up.
+        checkpointrows = 1024
+        counted = np.flatnonzero(turfmat['reasonid'] >= 0)
+        checkpoints = np.zeros(((count + 1) // checkpointrows + 2, len(turfmat['reasons'])), dtype=np.int64)
+        np.add.at(checkpoints, (-(-counted // checkpointrows), turfmat['reasonid'][counted]), turfmat['quantity'][counted])
+        np.cumsum(checkpoints, axis=0, out=checkpoints)
+        turfmat['reasoncheckpoints'] = checkpoints
+        turfmat['checkpointrows'] = checkpointrows
+
+        return turfmat, nondisplayedreasons
+
+
+
+    def _count_Turfreasons(self,turfmat,index):
+        """Counts the turf reasons up to a row of the turf matrix, for the pie chart. Starts from the checkpoint before the row,
+            so at most a checkpoint's worth of rows needs to be added up.\
+            If there are more reasons than maxreasons, the least common ones are grouped into "Other".
 
         Args:
-            aliasset (dict): Dictionary with the alias lists keyed by name.
-            response (str): Response that needs to be translated from an alias.
+            turfmat (dict): The turf matrix, as made by _build_Turfmat.
+            index (int): Row of the turf matrix. Negative rows count from the end, like a list.
 
         Returns:
-            str: Either translated input or the normal input.
+            dict: Amount of turfs per reason, in the order the reasons were first turfed.
         """
+        import numpy as np
+
+        if index < 0:
+            index += len(turfmat['reasonid'])
+
+        checkpoint = index // turfmat['checkpointrows']
+        start = checkpoint * turfmat['checkpointrows'] + 1
+        reasonid = turfmat['reasonid'][start:index + 1]
+        counted = reasonid >= 0
+        counts = turfmat['reasoncheckpoints'][checkpoint] + np.bincount(reasonid[counted],
+                                                                        weights=turfmat['quantity'][start:index + 1][counted],
+                                                                        minlength=len(turfmat['reasons'])).astype(np.int64)
+        turfcount = {turfmat['reasons'][i]: int(counts[i]) for i in range(bisect.bisect_right(turfmat['reasonrow'], index))}
+
+        if len(turfcount.keys()) > self.maxreasons:
+            # Sort the turf count
+            s_turfcount = dict(sorted(turfcount.items(),
+                                                key=lambda x:x[1],
+                                                reverse=True))
+
+            # Add the highest counting turf reasons until the maximum amount of reasons are reached
+            turfcount_disp = {"Other": 0}
+            while len(turfcount_disp.keys()) < self.maxreasons:
+                if list(s_turfcount.keys())[0] == "Other":
+                    turfcount_disp["Other"] += s_turfcount["Other"]
+                else:
+                    turfcount_disp[list(s_turfcount.keys())[0]] = s_turfcount[list(s_turfcount.keys())[0]]
+                s_turfcount.pop(list(s_turfcount.keys())[0])
 
-        # First we need to convert the alias set to be basically the reverse of its current form,
-        # so {alias: true value}
-        inv_aliasset = {}
-        for key in aliasset.keys():
-            if len(aliasset[key]) != 0:
-                for alias in aliasset[key]:
-                    inv_aliasset[alias] = key
+            # Add the remaining reasons to others
+            turfcount_disp["Other"] += sum(s_turfcount.values())
+            turfcount = turfcount_disp
 
+        return turfcount
 
-        # After which we can try to match it to an alias key(e.g. a name)
-        if response.lower() in [key.lower() for key in aliasset.keys()]:
-            TrueResponse = list(aliasset.keys())[[key.lower() for key in aliasset.keys()].index(response.lower())]
-            return TrueResponse
-        
-        # Otherwise we check whether it is an alias
-        elif response.lower() in [key.lower() for key in inv_aliasset.keys()]:
-            TrueAlias = list(inv_aliasset.keys())[[key.lower() for key in inv_aliasset.keys()].index(response.lower())]
-            return inv_aliasset[TrueAlias]
-        
-        # It can also just be an alias key, throw in a spelling mistake corrector for good measure
-        # (not doing the spelling corrector for the aliases since its usually just 1 or 2 chars)
-        elif len(difflib.get_close_matches(response,aliasset.keys())) != 0:
-            return difflib.get_close_matches(response,aliasset.keys())[0]
-        
-        # Otherwise it's just plain unreadable, return the input s.t. it can be handled by the function itself
-        else:
-            return response
+
+
+    def _import_Plotting(self):
+        """Imports matplotlib on demand, such that turfing and inning also work on computers without matplotlib.
+
+        Returns:
+            tuple: The matplotlib.pyplot module and the Slider class, or None if matplotlib is not installed.
+        """
+        try:
+            import matplotlib.pyplot as plt
+            from matplotlib.widgets import Slider
+        except ImportError:
+            return None
+        return plt, Slider
+
+
+
+    def render_Report(self,outdir,formats=('png',),processes=None):
+        """Renders the statistics of every group and every person to image files without showing them, and writes an
+            index.html that shows them all with their standings. The figures are the same as in Statistics, at the current time.\
+            The turf file is read once, and the figures are spread over a couple of processes which all get that same turf list.
+
+        Args:
+            outdir (str): Folder to put the report in. It's created if it doesn't exist yet.
+            formats (tuple, optional): Image formats to render, png and/or svg. Defaults to ('png',).
+            processes (int, optional): Amount of processes to render with. Defaults to the amount of processors.
+
+        Returns:
+            str: Path to the index.html.
+        """
+        if self._import_Plotting() is None:
+            raise ImportError('The report needs matplotlib, which is not installed. Run requirements.bat to install it.')
+        for imageformat in formats:
+            if imageformat not in ['png','svg']:
+                raise ValueError(f'Unknown image format "{imageformat}", choose png or svg.')
+        os.makedirs(outdir, exist_ok=True)
+
+        turfbalance, turfset = self.read_TurfFile()
+        alltimebalance = self._calc_Turfbalance(turfset,list(self.names.values()),alltime=True)
+
+        # Every group with people in it, and then everyone separately
+        selections = [(f'group_{group}', group, self.groups[group]) for group in self.groups.keys() if len(self.groups[group]) > 0]
+        selections += [(f'person_{name}', name, [name]) for name in self.names.values()]
+        tasks = [(''.join(c if c.isalnum() else '_' for c in filename), group, outdir, formats)
+                 for filename, _, group in selections]
+
+        # The worker processes get a copy of this TurfTool and the turf list once, instead of for every figure
+        state = {key: value for key, value in self.__dict__.items() if key not in ['statisticscache', 'profiler']}
+        if processes == 1 or len(tasks) <= 1:
+            TurfTool._start_Reportworker(state, turfset)
+            images = [TurfTool._render_Reportfigure(task) for task in tasks]
+        else:
+            # Only the report and the TurfManager use processes, so multiprocessing isn't imported at every start
+            import multiprocessing
+            with multiprocessing.Pool(processes, initializer=TurfTool._start_Reportworker, initargs=(state, turfset)) as pool:
+                images = pool.map(TurfTool._render_Reportfigure, tasks)
+
+        # Write the index page with the standings next to the figures
+        import html
+        page = ['<!DOCTYPE html>',
+                '<html><head><meta charset="utf-8"><title>Turf Statistics</title>',
+                '<style>body{font-family:sans-serif} table{border-collapse:collapse} td,th{padding:2px 10px;text-align:right} img{max-width:100%}</style>',
+                '</head><body>',
+                f'<h1>Turf Statistics</h1><p>Standings at {self.currenttime:%H:%M %d %b %Y}</p>',
+                '<ul>' + ''.join(f'<li><a href="#{html.escape(task[0])}">{html.escape(title)}</a></li>'
+                                 for task, (_, title, _) in zip(tasks, selections)) + '</ul>']
+        for task, (_, title, group), files in zip(tasks, selections, images):
+            page.append(f'<h2 id="{html.escape(task[0])}">{html.escape(title)}</h2>')
+            page.append('<table><tr><th style="text-align:left">Name</th><th>Current</th><th>All-time</th></tr>'
+                        + ''.join(f'<tr><td style="text-align:left">{html.escape(name)}</td><td>{turfbalance.get(name, 0)}</td><td>{alltimebalance.get(name, 0)}</td></tr>'
+                                  for name in group)
+                        + '</table>')
+            page.append(f'<p><img src="{html.escape(files[0])}" alt="{html.escape(title)}"></p>')
+            if len(files) > 1:
+                page.append('<p>' + ' '.join(f'<a href="{html.escape(file)}">{html.escape(file)}</a>' for file in files) + '</p>')
+        page.append('</body></html>')
+
+        indexpath = os.path.join(outdir, 'index.html')
+        indexfile = open(indexpath, 'w', encoding='utf-8')
+        indexfile.write('\n'.join(page) + '\n')
+        indexfile.close()
+
+        return indexpath
+
+
+
+    # Set in every report process by _start_Reportworker, as (TurfTool, turf list)
+    reportworker = None
+
+    @staticmethod
+    def _start_Reportworker(state,turfset):
+        """Prepares a report process. Runs once per process, so the turf list only has to be sent over once.
+
+        Args:
+            state (dict): Attributes of the TurfTool that started the report.
+            turfset (list): List of turfs sorted by time, as TurfEvent objects.
+        """
+        # Without a window to draw to, matplotlib needs the Agg backend
+        import matplotlib
+        matplotlib.use('Agg')
+
+        tool = TurfTool.__new__(TurfTool)
+        tool.__dict__.update(state)
+        tool.statisticscache = collections.OrderedDict()
+        tool.profiler = TurfProfiler()
+        TurfTool.reportworker = (tool, turfset)
+
+    @staticmethod
+    def _render_Reportfigure(task):
+        """Renders the statistics figure of one group or person in a report process.
+
+        Args:
+            task (tuple): File name without extension, names in the figure, output folder and image formats.
+
+        Returns:
+            list: File names of the rendered images.
+        """
+        filename, group, outdir, formats = task
+        tool, turfset = TurfTool.reportworker
+        import matplotlib.pyplot as plt
+
+        turfmat, _ = tool._build_Turfmat(turfset,group)
+        figure = plt.figure(figsize=(16,9))
+        tool._plot_Statistics(plt,turfmat,group)
+
+        files = []
+        for imageformat in formats:
+            files.append(f'{filename}.{imageformat}')
+            figure.savefig(os.path.join(outdir, files[-1]))
+        plt.close(figure)
+
+        return files
+
+
+
+    def _aliastranslate(self,aliasset,response):
+        """"Alias translator.
+
+        Args:
+            aliasset (dict or AliasIndex): Dictionary with the alias lists keyed by name, or the index compiled from it.
+            response (str): Response that needs to be translated from an alias.
+
+        Returns:
+            str: Either translated input or the normal input.
+        """
+        if not isinstance(aliasset, AliasIndex):
+            aliasset = AliasIndex(aliasset)
+        return aliasset.translate(response)
+
+
+
+    def import_Turfs(self,importlines,check=False):
+        """Imports turfs and innings without the prompts, e.g. to write down a whole meeting at once.\
+            Every line looks like "Category;Names;Reason;Amount;Date;Time", so for example "turf;W, m;s;;03/07/2025;20:15".\
+            The category is turf (t) or inning (i), the names can be names, aliases, groups or group aliases separated by a comma.\
+            Reason, amount, date and time work the same as in the prompts, so leaving them empty gives Other, the standard value, today and 12:45.\
+            Empty lines and lines starting with # are skipped. All lines are checked first and the correct ones are written in one go.
+
+        Args:
+            importlines (iterable): Lines to import, e.g. an opened file.
+            check (bool, optional): Whether to only check the lines without writing anything. Defaults to False.
+
+        Returns:
+            int: Amount of turf lines written (or that would be written when checking).
+            list: Errors formatted as [(line number, message),...].
+        """
+        turfs, errors = self._compile_Imports(csv.reader(importlines,delimiter=';'))
+
+        if not check and len(turfs) > 0:
+            self.write_TurfBatch(turfs)
+
+        return len(turfs), errors
+
+
+
+    def _compile_Imports(self,importrows):
+        """Checks and translates imported turfs, see import_Turfs for the format.
+
+        Args:
+            importrows (iterable): Rows to import, each a list of the "Category;Names;Reason;Amount;Date;Time" fields.
+
+        Returns:
+            list: Turfs formatted as [Category,Name,Time,Day,Month,Year,Reason,Quantity], ready for write_TurfBatch.
+            list: Errors formatted as [(row number, message),...].
+        """
+        turfs = []
+        errors = []
+
+        # The same names and reasons come back a lot, so only translate every alias once
+        translated = {}
+        def translate(kind,response):
+            if (kind, response) not in translated:
+                if kind == 'names':
+                    translated[(kind, response)] = self._import_Names(response)
+                elif kind == 'turf':
+                    translated[(kind, response)] = self._aliastranslate(self.turfreasonindex,response) if response != '' else 'Other'
+                else:
+                    translated[(kind, response)] = self._aliastranslate(self.inningreasonindex,response) if response != '' else 'Other'
+            return translated[(kind, response)]
+
+        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        for linenumber, line in enumerate(importrows, start=1):
+            if len(line) == 0 or line[0].strip() == '' or line[0].lstrip().startswith('#'):
+                continue
+            # Fill up the optional columns
+            line = [field.strip() for field in line] + ['']*(6-len(line))
+            try:
+                if len(line) > 6:
+                    raise ValueError(f'Expected at most 6 columns, got {len(line)}')
+                category, nameresponse, reasonresponse, amount, date, eventtime = line
+
+                # Category, with the same first-letter leniency as the main prompt
+                if category.lower() in ['t','turf']:
+                    category, reasons = 'turf', self.turfreasons
+                elif category.lower() in ['i','inning','minus']:
+                    category, reasons = 'minus', self.inningreasons
+                else:
+                    raise ValueError(f'Unknown category "{category}", use turf or inning')
+
+                targets = translate('names', nameresponse)
+                reason = translate(category, reasonresponse)
+
+                if amount == '':
+                    amount = reasons[reason]['value'] if reason in reasons.keys() else 1
+                elif not amount.isdigit() or int(amount) == 0:
+                    raise ValueError(f'Amount "{amount}" is not a positive whole number')
+                else:
+                    amount = int(amount)
+
+                if date == '':
+                    day, month, year = time.ctime()[8:10].lstrip(' '), time.ctime()[4:7], time.ctime()[-4:]
+                else:
+                    try:
+                        day, month, year = date.split('/')
+                        day, month, year = str(int(day)), months[int(month) - 1], str(int(year))
+                        self._decode_Turfdate(day, month, year)
+                    except (ValueError, IndexError):
+                        raise ValueError(f'Date "{date}" is not a valid DD/MM/YYYY date')
+
+                if eventtime == '':
+                    eventtime = '12:45'
+                elif eventtime.lower() == 'now':
+                    eventtime = time.ctime()[11:16]
+                else:
+                    try:
+                        hours, minutes = eventtime.split(':')
+                        eventtime = datetime.time(int(hours), int(minutes)).strftime('%H:%M')
+                    except ValueError:
+                        raise ValueError(f'Time "{eventtime}" is not a valid HH:MM time')
+
+            except ValueError as error:
+                errors.append((linenumber, str(error)))
+                continue
+
+            turfs += [[category,name,eventtime,day,month,year,reason,amount] for name in targets]
+
+        return turfs, errors
+
+
+
+    def _import_Names(self,nameresponse):
+        """Translates the names column of an imported line. Names and their aliases go before groups, and groups are only
+            matched exactly, since the spelling corrector would otherwise happily turn a name into a group.
+
+        Args:
+            nameresponse (str): Names, aliases, groups or group aliases separated by a comma.
+
+        Returns:
+            list: The names, without doubles.
+        """
+        targets = []
+        for target in nameresponse.split(','):
+            target = target.strip()
+            if target == '':
+                continue
+            elif self.nameindex.match(target) is not None:
+                targets.append(self.nameindex.match(target))
+            elif self.groupindex.match(target) in self.groups.keys():
+                targets += self.groups[self.groupindex.match(target)]
+            else:
+                name = self._aliastranslate(self.nameindex,target)
+                if name not in self.names.values():
+                    raise ValueError(f'Unknown name "{target}"')
+                targets.append(name)
+
+        if len(targets) == 0:
+            raise ValueError('No names given')
+        return list(dict.fromkeys(targets))
 
 
 
@@ -973,14 +2232,186 @@ class TurfTool():
             Year (str): Year of the turf event in format YYYY.
             Reason (str): Reason for the turf event.
         """        
-        # Open the turf file
-        turffile = open(self.turfpath,'a',newline='')
-        turfwriter = csv.writer(turffile,delimiter=';')
+        self.write_TurfBatch([[Category,Name,Time,Day,Month,Year,Reason]])
+
+
+
+    def write_TurfBatch(self,turfs,durable=None):
+        """Writes a batch of turfs to the turf file in one go, so the file is only opened and flushed once.
+
+        Args:
+            turfs (list): List of turfs, each formatted as [Category,Name,Time,Day,Month,Year,Reason] like in write_TurfFile.
+                            Optionally a Quantity can be added as well. Identical turfs right after each other are written as one line.
+            durable (bool, optional): Whether to wait until the batch is actually on the disk. Defaults to the setting provided in the settings cfg file.
+        """
+        if durable == None:
+            durable = self.durablewrites
+
+        # Anything cached is outdated now
+        self.statisticscache.clear()
+
+        if self.turfformat == 'binary':
+            self._write_Turfbinary(turfs,durable=durable)
+            return
+
+        # Compile the turfs/minuses first, such that they can be written in one go
+        turfdata = io.StringIO(newline='')
+        turfwriter = csv.writer(turfdata,delimiter=';')
+        turfwriter.writerows(self._merge_Turflines(turfs))
+        turfdata = turfdata.getvalue().encode(locale.getpreferredencoding(False))
+
+        with self._lock_TurfFile() as lockfile:
+            # If a TurfTool crashed halfway through writing a batch, cut that batch off first
+            validend = self._find_Turfend(self.turfpath, self._complete_Turfsize(lockfile, os.stat(self.turfpath)))
+            self._append_Turfdata(self.turfpath, turfdata, validend, durable, lockfile)
+
+
+
+    @contextlib.contextmanager
+    def _lock_TurfFile(self,shared=False):
+        """Locks the turf file for as long as the with-block lasts, so other TurfTools using the same turf file have to wait.\
+            The lock is taken on a separate lock file, so reading the turf file itself is never blocked.
+            The lock file also holds the batch that is being written, see _append_Turfdata.
+
+        Args:
+            shared (bool, optional): Whether other readers may lock at the same time, Windows only knows exclusive locks. Defaults to False.
+
+        Yields:
+            file: The lock file, for _complete_Turfsize and _append_Turfdata.
+        """
+        lockfile = open(os.open(self.lockpath, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)), 'r+b')
+        locked = False
+        try:
+            if os.name == 'nt':
+                # Windows gives up after trying for 10 seconds, but a long write on a shared drive can take longer, so keep trying
+                while not locked:
+                    lockfile.seek(0)
+                    try:
+                        msvcrt.locking(lockfile.fileno(), msvcrt.LK_LOCK, 1)
+                        locked = True
+                    except OSError as error:
+                        if error.errno not in (errno.EDEADLOCK, errno.EACCES):
+                            raise
+            else:
+                fcntl.flock(lockfile.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                locked = True
+            yield lockfile
+        finally:
+            if locked and os.name == 'nt':
+                lockfile.seek(0)
+                msvcrt.locking(lockfile.fileno(), msvcrt.LK_UNLCK, 1)
+            elif locked:
+                fcntl.flock(lockfile.fileno(), fcntl.LOCK_UN)
+            lockfile.close()
+
+
+
+    def _complete_Turfsize(self,lockfile,turfstat):
+        """Size of the turf file up to the last complete batch. Should only be called while holding the lock.\
+            Only the size needs the lock, since appended data never changes afterwards, so the file can be read after letting go.
+
+        Args:
+            lockfile (file): The lock file, as given by _lock_TurfFile.
+            turfstat (os.stat_result): Stat of the turf file.
+
+        Returns:
+            int: The size of the turf file, or where the batch starts that a crashed TurfTool was writing.
+        """
+        lockfile.seek(0)
+        batch = lockfile.read(struct.calcsize('<QQQ'))
+        if len(batch) < struct.calcsize('<QQQ'):
+            return turfstat.st_size
+
+        # The batch belongs to this turf file if the inode is the same. If it's all there, it was only the clean up that didn't happen
+        inode, start, end = struct.unpack('<QQQ', batch)
+        if inode == turfstat.st_ino and start < end and turfstat.st_size < end:
+            return min(start, turfstat.st_size)
+        return turfstat.st_size
+
+
+
+    def _append_Turfdata(self,path,turfdata,validend,durable=False,lockfile=None):
+        """Appends data to the end of a turf file with a single write. Should only be called while holding the lock.\
+            The batch is noted in the lock file until it's written, so _complete_Turfsize can leave out a crashed batch.
+
+        Args:
+            path (str): Path to the turf file.
+            turfdata (bytes): Data to append.
+            validend (int): Up to where the turf file is complete. Anything after this is left over from a crashed write and is cut off.
+            durable (bool, optional): Whether to wait until the data is actually on the disk. Defaults to False.
+            lockfile (file, optional): The lock file, as given by _lock_TurfFile. Defaults to None, which doesn't keep track of the batch.
+        """
+        turffile = os.open(path, os.O_RDWR | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        try:
+            if os.fstat(turffile).st_size > validend:
+                os.ftruncate(turffile, validend)
+
+            if lockfile is not None:
+                lockfile.seek(0)
+                lockfile.write(struct.pack('<QQQ', os.fstat(turffile).st_ino, validend, validend + len(turfdata)))
+                lockfile.flush()
+                if durable:
+                    os.fsync(lockfile.fileno())
+
+            while len(turfdata) > 0:
+                turfdata = turfdata[os.write(turffile, turfdata):]
+            if durable:
+                os.fsync(turffile)
+
+            if lockfile is not None:
+                lockfile.seek(0)
+                lockfile.write(struct.pack('<QQQ', 0, 0, 0))
+                lockfile.flush()
+        finally:
+            os.close(turffile)
+
+
+
+    def _find_Turfend(self,path,size=None):
+        """Finds the end of the last complete line in the turf file.
+
+        Args:
+            path (str): Path to the turf file.
+            size (int, optional): Size of the turf file to consider. Defaults to the current size.
+
+        Returns:
+            int: Position right after the last newline.
+        """
+        turffile = open(path, 'rb')
+        if size is None:
+            size = os.fstat(turffile.fileno()).st_size
+
+        # Walk backwards through the file until a newline shows up, usually the very last byte already is one
+        end = size
+        while end > 0:
+            start = max(end - 4096, 0)
+            turffile.seek(start)
+            newline = turffile.read(end - start).rfind(b'\n')
+            if newline != -1:
+                turffile.close()
+                return start + newline + 1
+            end = start
+        turffile.close()
+        return 0
 
-        # Write the turf/minus and close the turf file
-        turfwriter.writerow([Category,Name,Time,Day,Month,Year,Reason])
+
+
+    def _snapshot_TurfFile(self):
+        """Reads the complete lines of the turf file.
+
+        Returns:
+            bytes: Contents of the turf file up to the last complete batch.
+        """
+        turffile = open(self.turfpath, 'rb')
+        with self._lock_TurfFile(shared=True) as lockfile:
+            size = self._complete_Turfsize(lockfile, os.fstat(turffile.fileno()))
+
+        turfdata = turffile.read(size)
         turffile.close()
 
+        # A line without newline at the end is left over from a crashed write, skip it
+        return turfdata[:turfdata.rfind(b'\n') + 1]
+
 
 
     def read_TurfFile(self,
@@ -996,7 +2427,7 @@ class TurfTool():
 
         Returns:
             dict: Current turf balance.
-            list: List of all turfs and their corresponding time. Formatted as [(t1,turf1),(t2,turf2),...,(tn,turfn)]
+            tuple: All turfs sorted by time, as TurfEvent objects (or a TurfColumns). Formatted as [(t1,turf1),(t2,turf2),...,(tn,turfn)]
         """
         # If no names have been given, get the name list from the settings cfg file
         if names == None:
@@ -1007,162 +2438,1727 @@ class TurfTool():
         if solidarity == None:
             solidarity = self.solidarity
 
-        # Now open the turf file and log the lines sorted by time
-        turffile = open(self.turfpath, 'r', newline='')
-        turfreader = csv.reader(turffile,delimiter=';')
-        
-        turffile_sorted = []
-        timelst = []
-        # Skip over the tile line
-        linecount = 1
-
-        for line in turfreader:
-            if linecount == 1:
-                linecount += 1
-            else:
-                # eventtime = time.mktime(time.strptime(line[-5] + line[-4] + line[-3] + line[-2], "%H:%M%d%b%Y"))
-                eventtime = datetime.datetime.strptime(line[-5] + line[-4] + line[-3] + line[-2], "%H:%M%d%b%Y")
-                # Find the location of where the line is supposed to go
-                timelst.append(eventtime)
-                timelst = sorted(timelst)
-                turffile_sorted.insert(timelst.index(eventtime),line)
+        # If the turf file and settings are still the same as last time, nothing needs to be read again
+        cachekey = ('turfset', self._fingerprint_TurfFile(), tuple(names), forcenonegative, solidarity, self.day0)
+        if solidarity:
+            cachekey += (self.solidarityday, self.solidaritytime)
+        cached = self._cache_Get(cachekey + (self.currenttime,))
+        if cached is not None:
+            return cached[0].copy(), cached[1]
+
+        # Now read the turf file, sorted by time
+        turfset = self._parse_TurfFile()
 
         # Here it might become apparent that someone turfed into the future, if so change current time
-        if timelst[-1] > self.currenttime:
-            self.currenttime = timelst[-1]
+        if turfset[-1].time > self.currenttime:
+            self.currenttime = turfset[-1].time
 
         # If enabled, we now need to consider solidarity. This is only applied at the user-specified moment as to
         # allow people to work away turfs together
         if solidarity:
-            # It's the handiest to set a date to the first occurrence of the specified date and time after day 0
-            # Find out what day of the week day0 is
-            weekdays = ['mo','tu','we','th','fr','sa','su']
-            weekday_day0 = self.day0.isoweekday()
-            daysolidarity = weekdays.index(self.solidarityday[:2].lower()) + 1
-            timesolidarity = datetime.timedelta(hours=int(self.solidaritytime[0:2]),minutes=int(self.solidaritytime[3:5]))
+            with self.profiler.phase('solidarity'):
+                if self.turfformat == 'binary':
+                    turfbalance, solidarityturfs, _ = self._sweep_Solidarity(turfset,names,forcenonegative)
+                else:
+                    turfbalance, solidarityturfs = self._follow_Solidarity(turfset,names,forcenonegative)
+
+                # Merge the solidarity turfs into the turf list in one go
+                if isinstance(turfset, TurfColumns):
+                    turfset = turfset.insert(solidarityturfs)
+                else:
+                    merged_turfs = []
+                    previndex = 0
+                    for index, turf in solidarityturfs:
+                        merged_turfs += turfset[previndex:index]
+                        merged_turfs.append(turf)
+                        previndex = index
+                    turfset = tuple(merged_turfs) + turfset[previndex:]
+
+        # If solidarity is not active, the turf balance needs to be determined still.
+        if not solidarity:
+            with self.profiler.phase('balance'):
+                turfbalance = self._follow_Balance(turfset,names)
 
+        # The current time might have moved to the last turf, which is also what the next call starts with
+        self._cache_Put(cachekey + (self.currenttime,), (turfbalance.copy(), turfset))
 
-            deltaday_solidarity = datetime.timedelta(days=(weekday_day0-daysolidarity)%7)
-            delta_solidarity = deltaday_solidarity - (datetime.timedelta(hours=self.day0.hour,
-                                                        minutes=self.day0.minute) 
-                                                        - timesolidarity)                   # I hate datetime
-                                                                                            # With a passion
+        return turfbalance, turfset
 
-            if delta_solidarity.days < 0:
-                delta_solidarity += datetime.timedelta(days=7)
 
-            # Okay that was hellish to code, but now we have a delta until the next moment from day 0 until the
-            # next moment solidarity needs to be applied.
 
-            # Now create a time object equal to day 0 we use to track turfs
-            timetrack = self.day0
+    def _fingerprint_TurfFile(self):
+        """Fingerprint of the turf file, which changes whenever anything in the file changes.\
+            The hash of the last bytes catches a binary turf file that was rewritten within the same clock tick.
 
-            # Begin with a custom range between day0 and day0+delta solidarity. 
-            # Read the amount of turfs and innings and determine whether solidarity needs applying with that balance.
-            
-            turfbalance_dummy = {name: 0 for name in names}
-            sync = False # Create a boolean for determining whether timetrack is already on the solidarity time and day
-
-            while timetrack <= self.currenttime+datetime.timedelta(days=7):
-                # Within the sorted list of turfjes, get a window between timetrack and timetrack - 7 days
-                turfs_window = [turffile_sorted[i] for i in range(len(turffile_sorted)) 
-                                if timetrack - datetime.timedelta(days=7) < timelst[i] and timelst[i] <= timetrack]
-                
-                # Add up the turfs within the window to the dummy turfbalance
-                for turf in turfs_window:
-                    if turf[0].lower() == 'turf':
-                        turfbalance_dummy[turf[1]] += 1
-                    elif turf[0].lower() == 'minus':
-                        if turfbalance_dummy[turf[1]] >= 1 and forcenonegative:
-                            turfbalance_dummy[turf[1]] -= 1
-                        else:
-                            turfbalance_dummy[turf[1]] -= 1
-
-                # Check if someone is lonely at the bottom
-                balancelist = turfbalance_dummy.values()
-                occurrences_minval = 0
-                for val in balancelist:
-                    if val == min(balancelist):
-                        occurrences_minval += 1
-
-                # If the minimum value of the balance list only occurs once, solidarity needs to be applied
-                if occurrences_minval == 1:
-                    # Determine at which index the solidarity turfs need to be inserted
-                    # It's not a bug that solidarity turfs aren't visible in the future it's a feature
-                    try:
-                        index = [timelst[i] >= timetrack for i in range(len(timelst))].index(True)
-                    except:
-                        index = -1
-                    for i in range(sorted(balancelist)[1] - sorted(balancelist)[0]):
-                        solidarityname = [key for key in names if turfbalance_dummy[key] == min(balancelist)][0]
-
-                        turffile_sorted.insert(index,['turf',
-                                                solidarityname,
-                                                str(timetrack.hour)+':'+str(timetrack.minute),
-                                                timetrack.day,
-                                                ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'][timetrack.month-1],
-                                                timetrack.year,
-                                                'Solidarity'])
-                        timelst.insert(index,timetrack)
-                        turfbalance_dummy[solidarityname] += 1
-
-
-                if sync:
-                    timetrack += datetime.timedelta(days=7)
-                else:
-                    timetrack += delta_solidarity
-                    sync = True
+        Returns:
+            tuple: Format, inode, size, modification time and hash of the end of the turf file, or the version of the followed csv turf list.
+        """
+        if self.turfformat != 'binary':
+            self._follow_TurfFile()
+            return self.turfformat, self.turftail['version']
+
+        turffile = open(self.binarypath, 'rb')
+        try:
+            with self._lock_TurfFile(shared=True):
+                turfstat = os.fstat(turffile.fileno())
+            turfhash = self._hash_Turfwindow(turffile, turfstat.st_size)
+        finally:
+            turffile.close()
 
-            turfbalance = turfbalance_dummy
+        return self.turfformat, turfstat.st_ino, turfstat.st_dev, turfstat.st_size, turfstat.st_mtime_ns, turfhash
+
+
+
+    def _cache_Get(self,key):
+        """Looks something up in the statistics cache and marks it as recently used.
+
+        Args:
+            key (tuple): Cache key.
+
+        Returns:
+            tuple: The cached value, or None if it isn't cached.
+        """
+        if key not in self.statisticscache:
+            self.profiler.count('cache misses')
+            return None
+        self.profiler.count('cache hits')
+        self.statisticscache.move_to_end(key)
+        return self.statisticscache[key]
+
+
+
+    def _cache_Put(self,key,value):
+        """Puts something in the statistics cache. If the cache is full, the least recently used value is thrown out.
+
+        Args:
+            key (tuple): Cache key.
+            value (tuple): Value to cache.
+        """
+        self.statisticscache[key] = value
+        self.statisticscache.move_to_end(key)
+        while len(self.statisticscache) > self.cachesize:
+            self.statisticscache.popitem(last=False)
+
+
+
+    def read_Turfindex(self,
+                       names=None,
+                       forcenonegative=None,
+                       solidarity=None):
+        """Gives an index of the turf file, which answers what the balances were at any moment. See TurfIndex.
+
+        Args:
+            names (list, optional): List of names. Defaults to the names list provided in the settings cfg file.
+            forcenonegative (bool, optional): Whether to implement the no-negative-turf rule. Defaults to the setting provided in the settings cfg file.
+            solidarity (bool, optional): Whether to implement the solidarity rule. Defaults to the setting provided in the settings cfg file.
+
+        Returns:
+            TurfIndex: The index. It's kept in the statistics cache, so it's only built again once the turf file changes.
+        """
+        if names == None:
+            names = list(self.names.values())
+        if forcenonegative == None:
+            forcenonegative = self.forcenonegative
+
+        _, turfset = self.read_TurfFile(names,forcenonegative,solidarity)
+
+        # The turf list is kept in the cache as well, so its id can't be reused by another list
+        cachekey = ('turfindex', id(turfset), tuple(names), forcenonegative)
+        cached = self._cache_Get(cachekey)
+        if cached is not None and cached[0] is turfset:
+            return cached[1]
+        with self.profiler.phase('turfindex'):
+            turfindex = TurfIndex(turfset,names,forcenonegative)
+        self._cache_Put(cachekey, (turfset, turfindex))
+        return turfindex
+
+
+
+    def read_Turfbalance(self,
+                         names=None,
+                         forcenonegative=None,
+                         solidarity=None):
+        """Quick turf balance reader. Gives the same balance as read_TurfFile, but continues from the checkpoint file\
+            such that only turfs written since the last call need to be read.
+
+        Args:
+            names (list, optional): List of names. Defaults to the names list provided in the settings cfg file.
+            forcenonegative (bool, optional): Whether to implement the no-negative-turf rule. Defaults to the setting provided in the settings cfg file.
+            solidarity (bool, optional): Whether to implement the solidarity rule. Defaults to the setting provided in the settings cfg file.
+
+        Returns:
+            dict: Current turf balance.
+            dict: All-time turf balance, so with no inning considered but with solidarity turfs.
+        """
+        # If no names have been given, get the name list from the settings cfg file
+        if names == None:
+            names = list(self.names.values())
+        # Apply standard values if nothing is selected
+        if forcenonegative == None:
+            forcenonegative = self.forcenonegative
+        if solidarity == None:
+            solidarity = self.solidarity
+
+        # The binary turf file is quick enough to read as a whole
+        if self.turfformat == 'binary':
+            turfbalance, turfset = self.read_TurfFile(names,forcenonegative,solidarity)
+            return turfbalance, self._calc_Turfbalance(turfset,names,alltime=True)
+
+        # The checkpoint is only valid for the settings it was made with
+        settings = self._checkpoint_Settings(names, forcenonegative, solidarity)
+
+        with self.profiler.phase('parse'):
+            turffile = open(self.turfpath, 'rb')
+            try:
+                with self._lock_TurfFile(shared=True) as lockfile:
+                    turfstat = os.fstat(turffile.fileno())
+                    size = self._complete_Turfsize(lockfile, turfstat)
+                checkpoint = self._load_Checkpoint(settings, turffile, turfstat)
+
+                # Read the turfs that came after the checkpoint. A line without newline at the end is left over from a crashed write.
+                turffile.seek(checkpoint['offset'])
+                turfdata = turffile.read(max(size - checkpoint['offset'], 0))
+                turfdata = turfdata[:turfdata.rfind(b'\n') + 1]
+                newturfs = self._decode_Turfbytes(turfdata, header=checkpoint['offset'] == 0)
+
+                if solidarity and checkpoint['state'] is not None:
+                    # Turfs before the start of the next solidarity window would change solidarity that was already applied,
+                    # so in that case start over. Turfs from before the first window never count for solidarity anyway.
+                    windowstart = TurfEvent.to_minute(checkpoint['state']['timetrack'] - datetime.timedelta(days=7))
+                    firstwindowstart = TurfEvent.to_minute(self.day0 - datetime.timedelta(days=7))
+                    if any(firstwindowstart < turf.minute <= windowstart for turf in newturfs):
+                        checkpoint = self._load_Checkpoint(settings, turffile, turfstat, fresh=True)
+                        turffile.seek(0)
+                        turfdata = turffile.read(size)
+                        turfdata = turfdata[:turfdata.rfind(b'\n') + 1]
+                        newturfs = self._decode_Turfbytes(turfdata, header=True)
+
+                # The next checkpoint goes right after the last complete line
+                end = checkpoint['offset'] + len(turfdata)
+                endhash = self._hash_Turfwindow(turffile, end)
+            finally:
+                turffile.close()
+        self.profiler.count('turfs parsed', len(newturfs))
+
+        # Inning and turfing without solidarity doesn't depend on the order, so just add the new turfs up
+        with self.profiler.phase('balance'):
+            for name, value in self._calc_Turfbalance(newturfs,names).items():
+                checkpoint['balance'][name] += value
+            for name, value in self._calc_Turfbalance(newturfs,names,alltime=True).items():
+                checkpoint['alltime'][name] += value
+
+        # Here it might become apparent that someone turfed into the future, if so change current time
+        if len(newturfs) > 0:
+            lasttime = TurfEvent.epoch + datetime.timedelta(minutes=max(turf.minute for turf in newturfs))
+            if checkpoint['lasttime'] is None or lasttime > checkpoint['lasttime']:
+                checkpoint['lasttime'] = lasttime
+        if checkpoint['lasttime'] is not None and checkpoint['lasttime'] > self.currenttime:
+            self.currenttime = checkpoint['lasttime']
 
-        # If solidarity is not active, the turf balance needs to be determined still.
         if not solidarity:
-            turfbalance = self._calc_Turfbalance(turffile_sorted,names)
+            turfbalance = checkpoint['balance'].copy()
+            alltimebalance = checkpoint['alltime'].copy()
+        else:
+            # Continue the solidarity sweep with the turfs that weren't part of a finished window yet
+            firstwindowstart = TurfEvent.to_minute(self.day0 - datetime.timedelta(days=7))
+            pending = checkpoint['pending'] + [turf for turf in newturfs if turf.minute > firstwindowstart]
+            with self.profiler.phase('solidarity'):
+                pending.sort(key=lambda turf: turf.minute)
+                state = checkpoint['state']
+                turfbalance, solidarityturfs, checkpoint['state'] = self._sweep_Solidarity(pending,
+                                                                                           names,
+                                                                                           forcenonegative,
+                                                                                           state=state,
+                                                                                           holdback=checkpoint['lasttime'])
+            windowstart = TurfEvent.to_minute(checkpoint['state']['timetrack'] - datetime.timedelta(days=7))
+            checkpoint['pending'] = [turf for turf in pending if turf.minute > windowstart]
+            # Keep the solidarity turfs that are final, such that read_TurfFile doesn't need to work them out again
+            statemoment = TurfEvent.to_minute(checkpoint['state']['timetrack'])
+            checkpoint['solidarity'] += [[turf.minute, turf.name, turf.quantity] for index, turf in solidarityturfs if turf.minute < statemoment]
+
+            # All-time turfs also count the solidarity turfs, both the ones from before the checkpoint and the new ones
+            alltimebalance = checkpoint['alltime'].copy()
+            if state is not None:
+                for name in state['solidaritycount'].keys():
+                    alltimebalance[name] += state['solidaritycount'][name]
+            for index, turf in solidarityturfs:
+                alltimebalance[turf.name] += turf.quantity
+
+        checkpoint['offset'] = end
+        checkpoint['hash'] = endhash
+        checkpoint['file'] = [turfstat.st_ino, turfstat.st_dev]
+        self._save_Checkpoint(checkpoint)
+
+        return turfbalance, alltimebalance
+
+
+
+    def _checkpoint_Settings(self,names,forcenonegative,solidarity):
+        """Settings that a checkpoint belongs to.
 
-        # Create the turf list return object
-        turfset = [(timelst[i],turffile_sorted[i]) for i in range(len(turffile_sorted))]
+        Args:
+            names (list): List of names.
+            forcenonegative (bool): Whether to implement the no-negative-turf rule.
+            solidarity (bool): Whether to implement the solidarity rule.
 
-        return turfbalance, turfset
+        Returns:
+            list: The settings, as they're written in the checkpoint file.
+        """
+        settings = [names, forcenonegative, solidarity, self.day0.isoformat()]
+        if solidarity:
+            settings += [self.solidarityday, self.solidaritytime]
+        return settings
 
 
 
-    def _calc_Turfbalance(self,turflist,names,alltime=False):
-        """Calculate the turf balance or all-time turf balance (so with no inning considered) from a given turf list.
+    # How much of the turf file right before the checkpoint is hashed to check that the turf file is still the same
+    checkpointwindow = 4096
+
+    def _load_Checkpoint(self,settings,turffile,turfstat,fresh=False):
+        """Loads the checkpoint file, or an empty checkpoint if it no longer belongs to the turf file.\
+            Only the size, which file it is and the end of what the checkpoint covers are checked.
 
         Args:
-            turflist (dict): Turf list as generated by read_Turffile()
-            names (list): List of names for which to generate the turflist. \
-                            Only considers these names when generating the balance.
-            alltime (bool, optional): Whether to consider inned turfs. Defaults to False.
+            settings (list): Settings the checkpoint should have been made with.
+            turffile (file): The turf file, opened in binary mode.
+            turfstat (os.stat_result): Size and identity of the turf file, as it was while holding the lock.
+            fresh (bool, optional): Whether to skip the checkpoint file and return an empty checkpoint. Defaults to False.
 
         Returns:
-            _type_: _description_
-        """        
-        turfbalance = {name: 0 for name in names}
-        for turf in turflist:
-            if turf[1] not in names:
-                pass
-            elif turf[0].lower() == 'turf':
-                turfbalance[turf[1]] += 1
-            elif turf[0].lower() == 'minus' and not alltime:
-                if turfbalance[turf[1]] >= 1 and self.forcenonegative:
-                    turfbalance[turf[1]] -= 1
-                else:
-                    turfbalance[turf[1]] -= 1
+            dict: Checkpoint with the balances up to a byte offset in the turf file.
+        """
+        try:
+            if fresh:
+                raise ValueError('Fresh checkpoint requested')
+
+            checkpointfile = open(self.checkpointpath, 'r')
+            checkpoint = json.load(checkpointfile)
+            checkpointfile.close()
+
+            # Check whether the turf file still is the same file, and ends the same way where the checkpoint was made
+            if checkpoint['settings'] != settings \
+                or checkpoint['file'] != [turfstat.st_ino, turfstat.st_dev] \
+                or turfstat.st_size < checkpoint['offset'] \
+                or self._hash_Turfwindow(turffile, checkpoint['offset']) != checkpoint['hash']:
+                raise ValueError('Checkpoint does not match the turf file')
+            checkpoint['solidarity'] = [list(turf) for turf in checkpoint['solidarity']]
+
+            if checkpoint['lasttime'] is not None:
+                checkpoint['lasttime'] = datetime.datetime.fromisoformat(checkpoint['lasttime'])
+            if checkpoint['state'] is not None:
+                checkpoint['state']['timetrack'] = datetime.datetime.fromisoformat(checkpoint['state']['timetrack'])
+                if checkpoint['state']['lastwindow'] is not None:
+                    checkpoint['state']['lastwindow'] = datetime.datetime.fromisoformat(checkpoint['state']['lastwindow'])
+            checkpoint['pending'] = [TurfEvent.from_line(self._decode_Turftime(turf[2], turf[3], turf[4], turf[5]), turf)
+                                     for turf in checkpoint['pending']]
+            return checkpoint
+
+        except (OSError, ValueError, KeyError, TypeError):
+            # Either no checkpoint yet or it's outdated, start from the top of the turf file
+            return {'settings': settings,
+                    'file': None,
+                    'offset': 0,
+                    'hash': None,
+                    'lasttime': None,
+                    'balance': {name: 0 for name in settings[0]},
+                    'alltime': {name: 0 for name in settings[0]},
+                    'state': None,
+                    'pending': [],
+                    'solidarity': []}
+
+
+
+    def _hash_Turfwindow(self,turffile,end):
+        """Hashes the bit of the turf file right before a position, see _load_Checkpoint.
 
-        return turfbalance
+        Args:
+            turffile (file): The turf file, opened in binary mode.
+            end (int): Position in the turf file.
 
+        Returns:
+            str: sha1 hash of at most checkpointwindow bytes before the position.
+        """
+        start = max(end - self.checkpointwindow, 0)
+        turffile.seek(start)
+        return hashlib.sha1(turffile.read(end - start)).hexdigest()
 
 
 
-if __name__ == '__main__':
-    sys.tracebacklimit = 0
-    # Weird thing that happens is that dirname reads two different things depending on whether you run the .py or the .bat file/
-    # This should catch all exceptions, let me know if you get the FileNotPresent error if the settings.cfg file is present.
-    if os.path.dirname(__file__).lower().startswith('c:'):
-        config = os.path.dirname(__file__) + '\\settings.cfg'
-    else:
-        config = os.getcwd() + os.path.dirname(__file__) + '\\settings.cfg'
-    
-    Turf = TurfTool(config)
-    Turf.launch()
+    def _save_Checkpoint(self,checkpoint):
+        """Writes the checkpoint file.
+
+        Args:
+            checkpoint (dict): Checkpoint as used in read_Turfbalance.
+        """
+        checkpoint = checkpoint.copy()
+        if checkpoint['lasttime'] is not None:
+            checkpoint['lasttime'] = checkpoint['lasttime'].isoformat()
+        if checkpoint['state'] is not None:
+            checkpoint['state'] = checkpoint['state'].copy()
+            checkpoint['state']['timetrack'] = checkpoint['state']['timetrack'].isoformat()
+            if checkpoint['state']['lastwindow'] is not None:
+                checkpoint['state']['lastwindow'] = checkpoint['state']['lastwindow'].isoformat()
+        checkpoint['pending'] = [turf.line for turf in checkpoint['pending']]
+
+        # Write to a temporary file first so a half-written checkpoint can never be read
+        checkpointfile = open(self.checkpointpath + '.tmp', 'w')
+        json.dump(checkpoint, checkpointfile)
+        checkpointfile.close()
+        os.replace(self.checkpointpath + '.tmp', self.checkpointpath)
+
+
+
+    def _decode_Turfbytes(self,turfdata,header=False):
+        """Decodes a piece of the turf file into turf lines with their times.
+
+        Args:
+            turfdata (bytes): Part of the turf file, starting at the beginning of a line.
+            header (bool, optional): Whether the data starts with the title line. Defaults to False.
+
+        Returns:
+            list: Turfs in file order, as TurfEvent objects.
+        """
+        # Decode the same way as open() does for the text files
+        turfreader = csv.reader(io.StringIO(turfdata.decode(locale.getpreferredencoding(False)), newline=''), delimiter=';')
+        if header:
+            next(turfreader, None)
+
+        return [TurfEvent.from_line(self._decode_Turftime(line[2], line[3], line[4], line[5]), line) for line in turfreader]
+
+
+
+    def _sweep_Solidarity(self,turfset,names,forcenonegative,state=None,holdback=None):
+        """Applies the solidarity rule by walking through the weekly solidarity moments and the sorted turfs together.\
+            Every solidarity moment looks at the turfs of the week before it, so the windows are walked through with moving pointers.
+
+        Args:
+            turfset (list): List of turfs sorted by time, as TurfEvent objects.
+            names (list): List of names.
+            forcenonegative (bool): Whether to implement the no-negative-turf rule.
+            state (dict, optional): Sweep state to continue from, as returned by an earlier sweep. Defaults to starting at day 0.
+            holdback (datetime.datetime, optional): Returns the state before the first solidarity moment from this time on, for the checkpoint file.
+
+        Returns:
+            dict: Turf balance.
+            list: Solidarity turfs formatted as [(index1,turf1),...]. The index is where the turf goes in turfset.
+            dict: Sweep state which can be continued from, so the balance, solidarity turf count, next solidarity moment and window start.
+        """
+        # The delta from day 0 until the first solidarity moment is worked out once when reading the settings, see _calc_Solidaritydelta
+        if self.solidaritydelta is None:
+            raise ValueError('Solidarity needs solidarityday and solidaritytime in the [turfrules] section of the settings file.')
+        delta_solidarity = self.solidaritydelta
+
+        # Begin with a custom range between day0 and day0+delta solidarity. 
+        # Read the amount of turfs and innings and determine whether solidarity needs applying with that balance.
+        if state is None:
+            state = {'balance': {name: 0 for name in names},
+                     'solidaritycount': {name: 0 for name in names},
+                     'timetrack': self.day0,
+                     'sync': False,             # Whether timetrack is already on the solidarity time and day
+                     'lastwindow': None}        # The last solidarity moment that was applied
+        checkpoint = state
+
+        turfbalance_dummy = state['balance'].copy()
+        solidaritycount = state['solidaritycount'].copy()
+        timetrack = state['timetrack']
+        sync = state['sync']
+        lastwindow = state['lastwindow']
+
+        # The lower pointers point at the first line inside the window, the upper pointers at the first line after it.
+        # Solidarity turfs are kept in a separate list and only merged into the turf list by the caller.
+        # Everything is compared in minutes since 1970, which is what the turf events store
+        timelst = turfset.minutes if isinstance(turfset, TurfColumns) else [turf.minute for turf in turfset]
+        solidarityturfs = []
+        solidaritytimes = []
+        turflow, turfhigh = 0, 0
+        solidaritylow, solidarityhigh = 0, 0
+
+        while timetrack <= self.currenttime+datetime.timedelta(days=7):
+            # Within the sorted list of turfjes, get a window between timetrack and timetrack - 7 days
+            windowstart = timetrack - datetime.timedelta(days=7)
+            minutetrack = TurfEvent.to_minute(timetrack)
+            minutestart = minutetrack - 7*24*60
+
+            # Remember the state before the first window that is not complete yet. The first two windows overlap,
+            # so only take it if this window starts after the last one
+            if holdback is not None and timetrack >= holdback:
+                if lastwindow is None or windowstart >= lastwindow:
+                    checkpoint = {'balance': turfbalance_dummy.copy(),
+                                  'solidaritycount': solidaritycount.copy(),
+                                  'timetrack': timetrack,
+                                  'sync': sync,
+                                  'lastwindow': lastwindow}
+                holdback = None
+
+            while turflow < len(timelst) and timelst[turflow] <= minutestart:
+                turflow += 1
+            while turfhigh < len(timelst) and timelst[turfhigh] <= minutetrack:
+                turfhigh += 1
+            while solidaritylow < len(solidaritytimes) and solidaritytimes[solidaritylow] <= minutestart:
+                solidaritylow += 1
+            while solidarityhigh < len(solidaritytimes) and solidaritytimes[solidarityhigh] <= minutetrack:
+                solidarityhigh += 1
+
+            # Only the first two windows overlap, after that turflow simply continues where turfhigh was last week
+            turfs_window = itertools.chain(turfset[turflow:turfhigh], [turf[1] for turf in solidarityturfs[solidaritylow:solidarityhigh]])
+
+            # Add up the turfs within the window to the dummy turfbalance
+            for turf in turfs_window:
+                if turf.category.lower() == 'turf':
+                    turfbalance_dummy[turf.name] += turf.quantity
+                elif turf.category.lower() == 'minus':
+                    if turfbalance_dummy[turf.name] >= 1 and forcenonegative:
+                        turfbalance_dummy[turf.name] -= turf.quantity
+                    else:
+                        turfbalance_dummy[turf.name] -= turf.quantity
+
+            # Check if someone is lonely at the bottom
+            balancelist = sorted(turfbalance_dummy.values())
+
+            # If the minimum value of the balance list only occurs once, solidarity needs to be applied
+            if balancelist.count(balancelist[0]) == 1:
+                solidarityname = [key for key in names if turfbalance_dummy[key] == balancelist[0]][0]
+
+                # Determine at which index the solidarity turfs need to be inserted, which is in front of the first turf at or after timetrack.
+                # It's not a bug that solidarity turfs aren't visible in the future it's a feature (they go in front of the last turf)
+                index = bisect.bisect_left(timelst, minutetrack)
+                if index == len(timelst):
+                    index = len(timelst) - 1
+
+                solidarityturfs.append((index, TurfEvent(minutetrack,'turf',solidarityname,'Solidarity',balancelist[1] - balancelist[0])))
+                self.profiler.count('solidarity turfs')
+                solidaritytimes.append(minutetrack)
+                solidaritycount[solidarityname] += balancelist[1] - balancelist[0]
+                turfbalance_dummy[solidarityname] = balancelist[1]
+
+            lastwindow = timetrack
+            if sync:
+                timetrack += datetime.timedelta(days=7)
+            else:
+                timetrack += delta_solidarity
+                sync = True
+
+        return turfbalance_dummy, solidarityturfs, checkpoint
+
+
+
+    def _parse_TurfFile(self):
+        """Reads all lines of the turf file in a single pass and sorts them by time once.\
+            The sort is stable, so lines with the same time keep the order in which they were written.
+            The csv turf file is followed, so only lines appended since the last time are read, see _follow_TurfFile.
+
+        Returns:
+            tuple: Turfs sorted by time, as TurfEvent objects (or a TurfColumns for the binary turf file).
+        """
+        if self.turfformat != 'binary':
+            return self._follow_TurfFile()
+
+        with self.profiler.phase('parse'):
+            events = self._read_Turfbinary()
+        self.profiler.count('turfs parsed', len(events))
+
+        with self.profiler.phase('sort'):
+            events = events.sorted()
+
+        return events
+
+
+
+    # Every version of the followed turf list gets a new number, so the cache can tell them apart
+    turfversions = itertools.count()
+
+    def _follow_TurfFile(self):
+        """Reads the csv turf file, but remembers where it stopped, so the next time only the lines appended since are\
+            sorted in. If anything before that changed, the whole file is read again.
+
+        Returns:
+            tuple: Turfs sorted by time, as TurfEvent objects. A new tuple whenever turfs were added.
+        """
+        turffile = open(self.turfpath, 'rb')
+        try:
+            with self._lock_TurfFile(shared=True) as lockfile:
+                turfstat = os.fstat(turffile.fileno())
+                size = self._complete_Turfsize(lockfile, turfstat)
+
+            tail = self.turftail
+            if tail is not None and (turfstat.st_ino, turfstat.st_dev) == tail['file'] and size >= tail['offset']:
+                turffile.seek(tail['offset'] - len(tail['tailbytes']))
+                turfdata = turffile.read(size - turffile.tell())
+                if not turfdata.startswith(tail['tailbytes']):
+                    tail = None
+            else:
+                tail = None
+
+            if tail is None:
+                tail = {'file': (turfstat.st_ino, turfstat.st_dev),
+                        'offset': 0,
+                        'tailbytes': b'',
+                        'events': (),
+                        'minutes': [],
+                        'last': None,
+                        'balances': {},
+                        'sweeps': {},
+                        'version': next(TurfTool.turfversions)}
+                turffile.seek(0)
+                turfdata = turffile.read(size)
+        finally:
+            turffile.close()
+
+        # A line without newline at the end is either still being written or left over from a crashed write, skip it
+        newdata = turfdata[len(tail['tailbytes']):]
+        newdata = newdata[:newdata.rfind(b'\n') + 1]
+        if len(newdata) == 0:
+            self.turftail = tail
+            return tail['events']
+
+        with self.profiler.phase('parse'):
+            newturfs = self._decode_Turfbytes(newdata, header=tail['offset'] == 0)
+
+        # Without solidarity the order doesn't matter, so the balances simply add up.
+        # This goes first, since merging identical lines changes the quantity of the new turfs.
+        with self.profiler.phase('balance'):
+            balances = {}
+            for key, balance in tail['balances'].items():
+                balances[key] = balance.copy()
+                for name, value in self._calc_Turfbalance(newturfs,list(key)).items():
+                    balances[key][name] += value
+
+        with self.profiler.phase('parse'):
+            # Older turf files write turfs worth multiple turfjes as identical lines right after each other, those become one event.
+            # That can also be the last line from before. Turfs that are in an earlier list are never changed, they are replaced instead.
+            events, minutes = list(tail['events']), tail['minutes']
+            last, owned = tail['last'], False
+            added = []
+            appended = True
+            for turf in newturfs:
+                if last is not None and (turf.minute, turf.category, turf.name, turf.reason) == \
+                        (last.minute, last.category, last.name, last.reason):
+                    if not owned:
+                        appended = False
+                        merged = TurfEvent(last.minute, last.category, last.name, last.reason, last.quantity)
+                        index = bisect.bisect_left(minutes, last.minute)
+                        while events[index] is not last:
+                            index += 1
+                        events[index] = merged
+                        last, owned = merged, True
+                    last.quantity += turf.quantity
+                else:
+                    added.append(turf)
+                    last, owned = turf, True
+        self.profiler.count('turfs parsed', len(newturfs))
+
+        with self.profiler.phase('sort'):
+            added.sort(key=lambda event: event.minute)
+            if len(added) == 0 or len(minutes) == 0 or added[0].minute >= minutes[-1]:
+                events += added
+                minutes = minutes + [turf.minute for turf in added]
+            else:
+                # Sorting is stable and the earlier turfs go first, so this gives the same order as sorting everything again
+                self.profiler.count('turfs out of order', len(added))
+                appended = False
+                start = bisect.bisect_right(minutes, added[0].minute)
+                events[start:] = sorted(events[start:] + added, key=lambda event: event.minute)
+                minutes = minutes[:start] + [turf.minute for turf in events[start:]]
+
+        self.turftail = {'file': tail['file'],
+                         'offset': tail['offset'] + len(newdata),
+                         'tailbytes': (tail['tailbytes'] + newdata)[-64:],
+                         'events': tuple(events),
+                         'minutes': minutes,
+                         'last': last,
+                         'balances': balances,
+                         'sweeps': dict(tail['sweeps']) if appended else {},
+                         'version': next(TurfTool.turfversions)}
+        return self.turftail['events']
+
+
+
+    def _follow_Balance(self,turfset,names):
+        """Turf balance without solidarity of the followed turf list. It's kept up to date while following the turf file,
+            so it's only calculated in full once.
+
+        Args:
+            turfset (list): List of turfs as returned by _parse_TurfFile.
+            names (list): List of names.
+
+        Returns:
+            dict: Turf balance.
+        """
+        tail = self.turftail
+        if tail is None or tail['events'] is not turfset:
+            return self._calc_Turfbalance(turfset,names)
+
+        key = tuple(names)
+        if key not in tail['balances']:
+            tail['balances'][key] = self._calc_Turfbalance(turfset,names)
+        return tail['balances'][key].copy()
+
+
+
+    def _follow_Solidarity(self,turfset,names,forcenonegative):
+        """Applies the solidarity rule to the followed turf list. Continues from the last solidarity window that\
+            wasn't complete yet, unless turfs were written before it.
+
+        Args:
+            turfset (list): List of turfs as returned by _parse_TurfFile.
+            names (list): List of names.
+            forcenonegative (bool): Whether to implement the no-negative-turf rule.
+
+        Returns:
+            dict: Turf balance.
+            list: Solidarity turfs formatted as [(index1,turf1),...]. The index is where the turf goes in turfset.
+        """
+        tail = self.turftail
+        if tail is None or tail['events'] is not turfset or len(turfset) == 0:
+            turfbalance, solidarityturfs, _ = self._sweep_Solidarity(turfset,names,forcenonegative)
+            return turfbalance, solidarityturfs
+
+        key = (tuple(names), forcenonegative, self.day0, self.solidarityday, self.solidaritytime)
+        sweep = tail['sweeps'].get(key)
+        if sweep is None:
+            sweep = self._resume_Checkpoint(turfset,names,forcenonegative)
+        if sweep is not None:
+            windowstart = TurfEvent.to_minute(sweep['state']['timetrack'] - datetime.timedelta(days=7))
+            if len(turfset) > sweep['count'] and turfset[sweep['count']].minute <= windowstart:
+                sweep = None
+
+        if sweep is None:
+            turfbalance, solidarityturfs, state = self._sweep_Solidarity(turfset,names,forcenonegative,holdback=turfset[-1].time)
+        else:
+            # Only the turfs inside the window matter, the solidarity turfs before it stay where they were
+            offset = bisect.bisect_right(tail['minutes'], windowstart)
+            turfbalance, newturfs, state = self._sweep_Solidarity(turfset[offset:],
+                                                                  names,
+                                                                  forcenonegative,
+                                                                  state=sweep['state'],
+                                                                  holdback=turfset[-1].time)
+            solidarityturfs = sweep['before'] + [(offset + index, turf) for index, turf in newturfs]
+
+        statemoment = TurfEvent.to_minute(state['timetrack'])
+        tail['sweeps'][key] = {'state': state,
+                               'count': len(turfset),
+                               'before': [(index, turf) for index, turf in solidarityturfs if turf.minute < statemoment]}
+        return turfbalance, solidarityturfs
+
+
+
+    def _resume_Checkpoint(self,turfset,names,forcenonegative):
+        """Picks up the solidarity sweep of the followed turf list from the checkpoint file, if read_Turfbalance\
+            made one with the same settings.
+
+        Args:
+            turfset (list): List of turfs as returned by _parse_TurfFile.
+            names (list): List of names.
+            forcenonegative (bool): Whether to implement the no-negative-turf rule.
+
+        Returns:
+            dict: Sweep to continue from, as kept in the followed turf list. None if the checkpoint can't be used.
+        """
+        tail = self.turftail
+        turffile = open(self.turfpath, 'rb')
+        try:
+            checkpoint = self._load_Checkpoint(self._checkpoint_Settings(names, forcenonegative, True), turffile, os.fstat(turffile.fileno()))
+            if checkpoint['state'] is None or checkpoint['file'] != list(tail['file']) or checkpoint['offset'] > tail['offset']:
+                return None
+
+            # Turfs that were read after the checkpoint was made
+            turffile.seek(checkpoint['offset'])
+            newturfs = self._decode_Turfbytes(turffile.read(tail['offset'] - checkpoint['offset']), header=checkpoint['offset'] == 0)
+        finally:
+            turffile.close()
+
+        # Same as in read_Turfbalance, turfs before the start of the next window would change solidarity that was already applied
+        windowstart = TurfEvent.to_minute(checkpoint['state']['timetrack'] - datetime.timedelta(days=7))
+        firstwindowstart = TurfEvent.to_minute(self.day0 - datetime.timedelta(days=7))
+        if any(firstwindowstart < turf.minute <= windowstart for turf in newturfs):
+            return None
+
+        self.profiler.count('solidarity from checkpoint')
+        return {'state': checkpoint['state'],
+                'count': len(turfset),
+                'before': [(bisect.bisect_left(tail['minutes'], minute), TurfEvent(minute, 'turf', name, 'Solidarity', quantity))
+                           for minute, name, quantity in checkpoint['solidarity']]}
+
+
+
+    def _read_Turfbinary(self,size=None):
+        """Reads the binary turf file. Every block has "TRF1", the amount of records and new names and reasons, then\
+            the new names and reasons, and lastly the columns minutes, quantity, name id, reason id and category.
+
+        Args:
+            size (int, optional): Size of the binary turf file to consider. Defaults to a size read while holding the lock.
+
+        Returns:
+            TurfColumns: Turfs in file order, which still work like a list of TurfEvent objects.
+        """
+        names, reasons, columns, _ = self._map_Turfbinary(size=size)
+        return TurfColumns(*columns, names, reasons)
+
+
+
+    def _map_Turfbinary(self,size=None):
+        """Memory maps the binary turf file and collects its columns over all blocks.\
+            If the last block is incomplete because a TurfTool crashed while writing it, that block is skipped.
+
+        Args:
+            size (int, optional): Size of the binary turf file to consider. Defaults to a size read while holding the lock.
+
+        Returns:
+            list: Names in order of their id.
+            list: Reasons in order of their id.
+            list: The arrays of the epoch minutes, quantity, name id, reason id and category columns.
+            int: Position right after the last complete block.
+        """
+        names, reasons = [], []
+        columns = [array.array('i'), array.array('H'), array.array('H'), array.array('H'), array.array('B')]
+
+        if size is None:
+            with self._lock_TurfFile(shared=True):
+                size = os.path.getsize(self.binarypath) if os.path.exists(self.binarypath) else 0
+        if size == 0:
+            return names, reasons, columns, 0
+
+        binaryfile = open(self.binarypath, 'rb')
+        turfmap = mmap.mmap(binaryfile.fileno(), size, access=mmap.ACCESS_READ)
+
+        position = 0
+        headersize = struct.calcsize('<4sIHH')
+        try:
+            while position + headersize <= size:
+                title, amount, newnames, newreasons = struct.unpack_from('<4sIHH', turfmap, position)
+                if title != b'TRF1':
+                    raise ValueError(f'Binary turf file is damaged at byte {position}.')
+                blockstart = position
+                position += headersize
+
+                # Read the new names and reasons
+                blocknames, blockreasons = [], []
+                for stringtable, newstrings in [(blocknames, newnames), (blockreasons, newreasons)]:
+                    for i in range(newstrings):
+                        length, = struct.unpack_from('<H', turfmap, position)
+                        stringtable.append(turfmap[position+2:position+2+length].decode('utf-8'))
+                        position += 2 + length
+
+                # Stop if the block isn't complete
+                position += amount * sum(column.itemsize for column in columns)
+                if position > size:
+                    position = blockstart
+                    break
+
+                # Read the columns
+                names += blocknames
+                reasons += blockreasons
+                columnstart = position - amount * sum(column.itemsize for column in columns)
+                for column in columns:
+                    column.frombytes(turfmap[columnstart:columnstart+amount*column.itemsize])
+                    columnstart += amount * column.itemsize
+        except (struct.error, UnicodeDecodeError):
+            # The block header or strings are cut off
+            position = blockstart
+        finally:
+            turfmap.close()
+            binaryfile.close()
+
+        # The file is little-endian
+        if sys.byteorder == 'big':
+            for column in columns:
+                column.byteswap()
+
+        return names, reasons, columns, position
+
+
+
+    def _write_Turfbinary(self,lines,overwrite=False,durable=False):
+        """Appends a block of turf lines to the binary turf file. Identical lines right after each other are stored as one record.
+
+        Args:
+            lines (list): Turf lines, formatted like the lines of the csv turf file.
+            overwrite (bool, optional): Whether to replace the whole binary file instead of appending. Defaults to False.
+            durable (bool, optional): Whether to wait until the block is actually on the disk. Defaults to False.
+        """
+        # The string tables depend on the blocks before, so nobody else may write in between
+        with self._lock_TurfFile():
+            if overwrite:
+                block = self._compile_Turfblock(lines, [], [])
+                binaryfile = open(self.binarypath + '.tmp', 'wb')
+                binaryfile.write(block)
+                binaryfile.flush()
+                if durable:
+                    os.fsync(binaryfile.fileno())
+                binaryfile.close()
+                os.replace(self.binarypath + '.tmp', self.binarypath)
+            else:
+                if not os.path.exists(self.binarypath):
+                    open(self.binarypath, 'xb').close()
+                # The string tables are kept from the last write, as long as nobody else wrote since. Otherwise they are
+                # read from the whole file again
+                binarystat = os.stat(self.binarypath)
+                binarykey = (binarystat.st_ino, binarystat.st_dev, binarystat.st_size, binarystat.st_mtime_ns)
+                if self.binarytables is not None and self.binarytables[0] == binarykey:
+                    _, names, reasons, validend = self.binarytables
+                else:
+                    names, reasons, _, validend = self._map_Turfbinary(size=binarystat.st_size)
+                names, reasons = list(names), list(reasons)
+
+                # If a TurfTool crashed halfway through writing a block, that block is cut off first
+                self._append_Turfdata(self.binarypath, self._compile_Turfblock(lines, names, reasons), validend, durable)
+                binarystat = os.stat(self.binarypath)
+                self.binarytables = ((binarystat.st_ino, binarystat.st_dev, binarystat.st_size, binarystat.st_mtime_ns),
+                                     names, reasons, binarystat.st_size)
+
+
+
+    def _compile_Turfblock(self,lines,names,reasons):
+        """Compiles turf lines into a block of the binary turf file.
+
+        Args:
+            lines (list): Turf lines, formatted like the lines of the csv turf file.
+            names (list): Names that are already in the binary turf file, in order of their id. New names are added to it.
+            reasons (list): Reasons that are already in the binary turf file, in order of their id. New reasons are added to it.
+
+        Returns:
+            bytes: The block.
+        """
+        nameids = {name: i for i, name in enumerate(names)}
+        reasonids = {reason: i for i, reason in enumerate(reasons)}
+        newnames, newreasons = [], []
+
+        columns = [array.array('i'), array.array('H'), array.array('H'), array.array('H'), array.array('B')]
+        minutes, quantity, nameid, reasonid, category = columns
+        previous = None
+        for line in lines:
+            if line[0].lower() not in ['minus','turf']:
+                raise ValueError(f'Category "{line[0]}" can not be stored in the binary turf file, it should be either "turf" or "minus".')
+
+            # Add new names and reasons to the string tables
+            for value, ids, newvalues in [(line[1], nameids, newnames), (line[6], reasonids, newreasons)]:
+                if value not in ids:
+                    ids[value] = len(ids)
+                    newvalues.append(value)
+
+            record = (TurfEvent.to_minute(self._decode_Turftime(line[2], line[3], line[4], line[5])),
+                      nameids[line[1]],
+                      reasonids[line[6]],
+                      ['minus','turf'].index(line[0].lower()))
+
+            # Lines from before the quantity column count as 1 turf
+            linequantity = int(line[7]) if len(line) > 7 else 1
+            while linequantity > 0:
+                if record == previous and quantity[-1] < 65535:
+                    added = min(linequantity, 65535 - quantity[-1])
+                    quantity[-1] += added
+                else:
+                    added = min(linequantity, 65535)
+                    minutes.append(record[0])
+                    quantity.append(added)
+                    nameid.append(record[1])
+                    reasonid.append(record[2])
+                    category.append(record[3])
+                    previous = record
+                linequantity -= added
+
+        if sys.byteorder == 'big':
+            for column in columns:
+                column.byteswap()
+
+        block = bytearray(struct.pack('<4sIHH', b'TRF1', len(minutes), len(newnames), len(newreasons)))
+        for value in newnames + newreasons:
+            value = value.encode('utf-8')
+            block += struct.pack('<H', len(value)) + value
+        for column in columns:
+            block += column.tobytes()
+
+        names += newnames
+        reasons += newreasons
+        return bytes(block)
+
+
+
+    def convert_TurfFile(self,turfformat):
+        """Converts the turf file between the csv and the binary format. Times are written as HH:MM in both directions.
+
+        Args:
+            turfformat (str): Format to convert to, so either "csv" or "binary".
+        """
+        if turfformat == 'binary':
+            turfreader = csv.reader(io.StringIO(self._snapshot_TurfFile().decode(locale.getpreferredencoding(False)), newline=''), delimiter=';')
+            # Skip over the title line
+            next(turfreader, None)
+            self._write_Turfbinary(list(turfreader), overwrite=True)
+
+        elif turfformat == 'csv':
+            events = self._read_Turfbinary()
+            with self._lock_TurfFile():
+                turffile = open(self.turfpath + '.tmp','w',newline='')
+                turfwriter = csv.writer(turffile,delimiter=';')
+                turfwriter.writerow(['Category','Name','Time','Day','Month','Year','Reason','Quantity'])
+                turfwriter.writerows([turf.line for turf in events])
+                turffile.close()
+                os.replace(self.turfpath + '.tmp', self.turfpath)
+
+        else:
+            raise ValueError(f'Unknown turf file format "{turfformat}", choose either csv or binary.')
+
+
+
+    def migrate_TurfFile(self):
+        """Migrates a turf file from before the quantity column, by merging identical lines right after each other\
+            into one line with a quantity. The old file is kept as a backup next to it.
+        """
+        # Nobody may append while the turf file is rewritten
+        with self._lock_TurfFile():
+            turffile = open(self.turfpath, 'r', newline='')
+            turfreader = csv.reader(turffile,delimiter=';')
+            header = next(turfreader, None)
+            if header is None or 'Quantity' in header:
+                turffile.close()
+                return
+            turflines = self._merge_Turflines(list(turfreader))
+            turffile.close()
+
+            if self.debug:
+                print("Migrating the turf file to the format with quantities...")
+
+            # Keep the original as a backup and replace the turf file in one go
+            backuppath = os.path.splitext(self.turfpath)[0] + '_backup.csv'
+            shutil.copy2(self.turfpath, backuppath)
+            turffile = open(self.turfpath + '.tmp', 'w', newline='')
+            turfwriter = csv.writer(turffile,delimiter=';')
+            turfwriter.writerow(['Category','Name','Time','Day','Month','Year','Reason','Quantity'])
+            turfwriter.writerows(turflines)
+            turffile.close()
+            os.replace(self.turfpath + '.tmp', self.turfpath)
+
+            # Keep the modification time, otherwise the turf file would look newer than the binary turf file
+            os.utime(self.turfpath, (os.path.getatime(backuppath), os.path.getmtime(backuppath)))
+
+
+
+    def compact_TurfFile(self,cutoff=None):
+        """Folds all turfs before a cutoff into a snapshot, e.g. when a new season starts. The folded lines are moved\
+            to an archive file, and the balance, all-time turfs and totals per reason stay the same.
+
+        Args:
+            cutoff (datetime.datetime, optional): Turfs before this moment are folded. Defaults to day 0, or a week before it with solidarity.
+
+        Returns:
+            str: Path to the archive file, or None if there was nothing to fold.
+            int: Amount of turf lines moved to the archive.
+            int: Amount of turf lines in the snapshot.
+        """
+        firstwindowstart = self.day0 - datetime.timedelta(days=7)
+        if cutoff is None:
+            cutoff = firstwindowstart if self.solidarity else self.day0
+        if self.solidarity and cutoff > firstwindowstart:
+            raise ValueError(f'With solidarity the cutoff can be at most a week before day 0, so {firstwindowstart:%H:%M %d %b %Y}. '\
+                             'Move day 0 in the settings cfg file to the start of the new season first.')
+        cutoffminute = TurfEvent.to_minute(cutoff)
+        archivepath = os.path.splitext(self.turfpath)[0] + f'_archive_{cutoff:%Y-%m-%d_%H%M}.csv'
+
+        # Nobody may append while the turf file is rewritten
+        with self._lock_TurfFile() as lockfile:
+            if self.turfformat == 'binary':
+                turflines = [turf.line for turf in self._read_Turfbinary(size=os.path.getsize(self.binarypath))]
+            else:
+                turffile = open(self.turfpath, 'rb')
+                turfdata = turffile.read(self._complete_Turfsize(lockfile, os.fstat(turffile.fileno())))
+                turffile.close()
+                # A line without newline at the end is left over from a crashed write, it's cut off by the next write anyway
+                turfdata = turfdata[:turfdata.rfind(b'\n') + 1]
+                turfreader = csv.reader(io.StringIO(turfdata.decode(locale.getpreferredencoding(False)), newline=''), delimiter=';')
+                next(turfreader, None)
+                turflines = list(turfreader)
+
+            # Add up everything before the cutoff per person, category and reason, in the order they were first turfed
+            archived, kept = [], []
+            archivedturfs = []
+            totals = {}
+            for line in turflines:
+                turf = TurfEvent.from_line(self._decode_Turftime(line[2], line[3], line[4], line[5]), line)
+                if turf.minute < cutoffminute:
+                    archived.append(line)
+                    archivedturfs.append(turf)
+                    totals[(turf.category, turf.name, turf.reason)] = totals.get((turf.category, turf.name, turf.reason), 0) + turf.quantity
+                else:
+                    kept.append(line)
+
+            if len(archived) == 0:
+                return None, 0, 0
+            if os.path.exists(archivepath):
+                raise FileExistsError(f'{archivepath} already exists, so this cutoff was already used. Move it away to compact again.')
+
+            # Follow the balances up to the cutoff in time order, like TurfIndex, to see how much of the innings the rule absorbed
+            absorbed = collections.Counter()
+            if self.forcenonegative:
+                balance = collections.Counter()
+                for turf in sorted(archivedturfs, key=lambda turf: turf.minute):
+                    if turf.category == 'turf':
+                        balance[turf.name] += turf.quantity
+                    elif turf.category == 'minus':
+                        balance[turf.name] -= turf.quantity
+                        if balance[turf.name] < 0:
+                            absorbed[turf.name] -= balance[turf.name]
+                            balance[turf.name] = 0
+
+            # The absorbed innings first, then the turfs and then the rest of the innings
+            absorbedlines, turfedlines, inninglines = [], [], []
+            for (category, name, reason), quantity in totals.items():
+                if category == 'minus' and absorbed[name] > 0 and quantity > 0:
+                    part = min(quantity, absorbed[name])
+                    absorbed[name] -= part
+                    quantity -= part
+                    absorbedlines.append(TurfEvent(cutoffminute - 1, category, name, reason, part).line)
+                if quantity != 0:
+                    (inninglines if category == 'minus' else turfedlines).append(TurfEvent(cutoffminute - 1, category, name, reason, quantity).line)
+            snapshot = absorbedlines + turfedlines + inninglines
+
+            if self.debug:
+                print(f"Folding {len(archived)} turf lines into {len(snapshot)} snapshot lines...")
+
+            # First put the archive in place, only then replace the turf file. If anything goes wrong in between, no turf is lost.
+            for path, lines in [(archivepath, archived), (self.turfpath, snapshot + kept)]:
+                if path == self.turfpath and self.turfformat == 'binary':
+                    path = self.binarypath
+                    turfdata = self._compile_Turfblock(lines, [], [])
+                else:
+                    turfdata = io.StringIO(newline='')
+                    turfwriter = csv.writer(turfdata,delimiter=';')
+                    turfwriter.writerow(['Category','Name','Time','Day','Month','Year','Reason','Quantity'])
+                    turfwriter.writerows(lines)
+                    turfdata = turfdata.getvalue().encode(locale.getpreferredencoding(False))
+
+                turffile = open(path + '.tmp', 'wb')
+                turffile.write(turfdata)
+                turffile.flush()
+                if self.durablewrites:
+                    os.fsync(turffile.fileno())
+                turffile.close()
+                os.replace(path + '.tmp', path)
+
+        # Anything cached is outdated now, the checkpoint file notices by itself
+        self.statisticscache.clear()
+
+        return archivepath, len(archived), len(snapshot)
+
+
+
+    def _merge_Turflines(self,turflines):
+        """Merges identical turf lines right after each other into one line with a quantity.
+
+        Args:
+            turflines (list): Turf lines, with or without the quantity column.
+
+        Returns:
+            list: Turf lines with the quantity column.
+        """
+        merged = []
+        for line in turflines:
+            quantity = int(line[7]) if len(line) > 7 else 1
+            if len(merged) > 0 and merged[-1][:7] == list(line[:7]):
+                merged[-1][7] = str(int(merged[-1][7]) + quantity)
+            else:
+                merged.append(list(line[:7]) + [str(quantity)])
+        return merged
+
+
+
+    def _sync_TurfFormats(self):
+        """Converts the other turf file format to the selected one, if that was written to more recently.
+        """
+        if self.turfformat == 'binary':
+            selectedpath, otherpath = self.binarypath, self.turfpath
+        else:
+            selectedpath, otherpath = self.turfpath, self.binarypath
+
+        if not os.path.exists(otherpath):
+            return
+        if not os.path.exists(selectedpath) or os.path.getmtime(otherpath) > os.path.getmtime(selectedpath):
+            if self.debug:
+                print(f"Converting the turf file to the {self.turfformat} format...")
+            self.convert_TurfFile(self.turfformat)
+
+
+
+    def _decode_Turftime(self,Time,Day,Month,Year):
+        """Decodes the Time, Day, Month and Year columns of a turf line into a datetime.\
+            This replaces the strptime call on the glued-together columns, which was by far the slowest part of reading the turf file.\
+            Both padded and unpadded times are accepted, so "09:05" as well as "9:5".
+
+        Args:
+            Time (str): Time of the turf event in format HH:MM.
+            Day (str): Day of the turf event in format DD.
+            Month (str): Month of the turf event in format Mth.
+            Year (str): Year of the turf event in format YYYY.
+
+        Returns:
+            datetime.datetime: Time of the turf event.
+        """
+        try:
+            hours, minutes = str(Time).split(':')
+            if not (0 < len(hours) <= 2 and 0 < len(minutes) <= 2):
+                raise ValueError
+            return datetime.datetime(*self._decode_Turfdate(Day, Month, Year), int(hours), int(minutes))
+        except (ValueError, KeyError):
+            # Anything that doesn't fit the fixed layout is left to strptime, which also gives the usual error message
+            return datetime.datetime.strptime(f'{Time}{Day}{Month}{Year}', "%H:%M%d%b%Y")
+
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _decode_Turfdate(Day,Month,Year):
+        """Cached decoder for the Day, Month and Year columns. A turf file contains a lot of turfs on the same day,
+            so every date only needs to be decoded once. 4096 dates is a bit over 11 years of daily turfing.
+
+        Args:
+            Day (str): Day of the turf event in format DD.
+            Month (str): Month of the turf event in format Mth.
+            Year (str): Year of the turf event in format YYYY.
+
+        Returns:
+            tuple: Year, month and day as integers.
+        """
+        months = ['jan','feb','mar','apr','may','jun','jul','aug','sep','oct','nov','dec']
+        date = datetime.date(int(Year), months.index(str(Month).lower()) + 1, int(Day))
+        return date.year, date.month, date.day
+
+
+
+    def _calc_Turfbalance(self,turflist,names,alltime=False):
+        """Calculate the turf balance or all-time turf balance (so with no inning considered) from a given turf list.
+
+        Args:
+            turflist (list): List of turfs as TurfEvent objects, as generated by read_TurfFile()
+            names (list): List of names for which to generate the turflist. \
+                            Only considers these names when generating the balance.
+            alltime (bool, optional): Whether to consider inned turfs. Defaults to False.
+
+        Returns:
+            _type_: _description_
+        """        
+        if isinstance(turflist, TurfColumns):
+            return turflist.balance(names,alltime)
+
+        turfbalance = {name: 0 for name in names}
+        for turf in turflist:
+            if turf.name not in names:
+                pass
+            elif turf.category.lower() == 'turf':
+                turfbalance[turf.name] += turf.quantity
+            elif turf.category.lower() == 'minus' and not alltime:
+                if turfbalance[turf.name] >= 1 and self.forcenonegative:
+                    turfbalance[turf.name] -= turf.quantity
+                else:
+                    turfbalance[turf.name] -= turf.quantity
+
+        return turfbalance
+
+
+
+
+class TurfManager():
+    """Hosts the TurfTools of many committees in one process. Every call names the committee it's for,\
+        and only the most recently used committees keep their read turf files in memory.
+    """
+    def __init__(self,committees,maxloaded=16,processes=None):
+        """Loads the committees with a couple of processes. The first maxloaded committees also get their read\
+            csv turf file sent back, the others continue from their checkpoint files when they're used.
+
+        Args:
+            committees (dict): Path to the settings cfg file of every committee, keyed by committee id.
+            maxloaded (int, optional): Amount of committees that keep their read turf files in memory. Defaults to 16.
+            processes (int, optional): Amount of processes to read the turf files with. Defaults to the amount of processors.
+        """
+        self.maxloaded = maxloaded
+        self.configs = dict(committees)
+
+        # Read all settings cfg files and turf files in parallel first
+        tasks = [(config, i < maxloaded) for i, config in enumerate(self.configs.values())]
+        if processes == 1 or len(self.configs) <= 1:
+            states = [TurfManager._warm_Committee(*task) for task in tasks]
+        else:
+            import multiprocessing
+            with multiprocessing.Pool(processes) as pool:
+                states = pool.starmap(TurfManager._warm_Committee, tasks)
+
+        self.tools = {committee: TurfManager._load_Committee(state) for committee, state in zip(self.configs.keys(), states)}
+
+        # One lock per committee, so calls for different committees can run at the same time
+        self.locks = {committee: threading.RLock() for committee in self.configs.keys()}
+
+        # Committees that have their turf files in memory, least recently used first
+        self.loaded = collections.OrderedDict((committee, True) for committee, tool in self.tools.items()
+                                              if tool.turftail is not None)
+        self.loadedlock = threading.Lock()
+
+    @classmethod
+    def from_folder(cls,folder,**kwargs):
+        """Loads every committee in a folder, so every subfolder with a settings.cfg file. The name of the subfolder is the committee id.
+
+        Args:
+            folder (str): Folder with a subfolder per committee.
+
+        Returns:
+            TurfManager: The manager.
+        """
+        committees = {}
+        for committee in sorted(os.listdir(folder)):
+            config = os.path.join(folder, committee, 'settings.cfg')
+            if os.path.isfile(config):
+                committees[committee] = config
+        return cls(committees,**kwargs)
+
+    @staticmethod
+    def _warm_Committee(config,keep=True):
+        """Loads a committee in a loading process and reads its turf file, which brings its checkpoint file up to date.
+
+        Args:
+            config (str): Path to the settings cfg file.
+            keep (bool, optional): Whether to send the read csv turf file back as well. Defaults to True.
+
+        Returns:
+            dict: Attributes of the TurfTool, for _load_Committee.
+        """
+        tool = TurfTool(config)
+        tool.read_Turfbalance()
+        if keep and tool.turfformat != 'binary':
+            tool.read_TurfFile()
+        else:
+            tool.turftail = None
+        return {key: value for key, value in tool.__dict__.items() if key not in ['statisticscache', 'profiler']}
+
+    @staticmethod
+    def _load_Committee(state):
+        """Makes the TurfTool of a committee out of what its loading process sent back.
+
+        Args:
+            state (dict): Attributes of the TurfTool, as given by _warm_Committee.
+
+        Returns:
+            TurfTool: The TurfTool.
+        """
+        tool = TurfTool.__new__(TurfTool)
+        tool.__dict__.update(state)
+        tool.statisticscache = collections.OrderedDict()
+        tool.profiler = TurfProfiler()
+        tool.currenttime = max(tool.currenttime, datetime.datetime.now())
+        # The versions of the turf lists were counted in the loading process, so it gets a version from this one
+        if tool.turftail is not None:
+            tool.turftail['version'] = next(TurfTool.turfversions)
+        return tool
+
+    def tool(self,committee):
+        """Gets the TurfTool of a committee. If too many committees have their turf files in memory, the least recently used one lets go of it.
+
+        Args:
+            committee (str): Committee id.
+
+        Returns:
+            TurfTool: The TurfTool of the committee.
+        """
+        if committee not in self.tools:
+            raise KeyError(f'Unknown committee "{committee}".')
+
+        with self.loadedlock:
+            self.loaded[committee] = True
+            self.loaded.move_to_end(committee)
+            # Only let go of a committee that nobody is using right now. Waiting for it here could deadlock with a call
+            # for that committee that's waiting for this one, so a committee in use is let go of at a later call instead.
+            for oldest in list(self.loaded.keys()):
+                if len(self.loaded) <= self.maxloaded or oldest == committee:
+                    break
+                if not self.locks[oldest].acquire(blocking=False):
+                    continue
+                try:
+                    del self.loaded[oldest]
+                    self.tools[oldest].statisticscache.clear()
+                    self.tools[oldest].turftail = None
+                finally:
+                    self.locks[oldest].release()
+
+        return self.tools[committee]
+
+    def read_Turfbalance(self,committee):
+        """Current and all-time turf balance of a committee, see TurfTool.read_Turfbalance.
+        """
+        with self.locks[committee]:
+            return self.tool(committee).read_Turfbalance()
+
+    def read_TurfFile(self,committee,**kwargs):
+        """Turf balance and all turfs of a committee, see TurfTool.read_TurfFile.
+        """
+        with self.locks[committee]:
+            return self.tool(committee).read_TurfFile(**kwargs)
+
+    def write_TurfBatch(self,committee,turfs,**kwargs):
+        """Writes turfs for a committee, see TurfTool.write_TurfBatch.
+        """
+        with self.locks[committee]:
+            return self.tool(committee).write_TurfBatch(turfs,**kwargs)
+
+    def import_Turfs(self,committee,importlines,**kwargs):
+        """Imports turfs and innings for a committee, see TurfTool.import_Turfs.
+        """
+        with self.locks[committee]:
+            return self.tool(committee).import_Turfs(importlines,**kwargs)
+
+
+
+
+class TurfService():
+    """Serves a TurfTool over HTTP with JSON. Responses are kept until the turf file changes, the TurfTool only\
+        runs in one worker thread and turfs that come in at the same time are written in one go.
+
+        GET /balance gives the current and all-time balance. GET /statistics gives the data behind the Statistics plots,
+        for everyone or for ?group=GROUP or ?names=NAME,NAME. GET /history?at=TIME gives the balances and reasons at a moment
+        and GET /history?start=TIME&end=TIME what happened in between, with ISO times like 2025-07-03T20:15. POST /turf and POST /inning take a JSON object (or a list of them)
+        with the same fields as an imported line: names, reason, amount, date and time, where everything but names can be left out.
+    """
+    def __init__(self,tool,host='127.0.0.1',port=8642):
+        """Sets up the service, it only starts listening with serve.
+
+        Args:
+            tool (TurfTool): The TurfTool to serve.
+            host (str, optional): Address to listen on. Defaults to '127.0.0.1', so only this computer can reach it.
+            port (int, optional): Port to listen on. Defaults to 8642.
+        """
+        self.tool = tool
+        self.host = host
+        self.port = port
+
+        # The TurfTool isn't made for being used by multiple threads at once, so it gets exactly one
+        import concurrent.futures
+        self.worker = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        # Ready-made responses, which belong to the turf file as it was at self.state
+        self.state = None
+        self.responses = {}
+
+    def serve(self):
+        """Runs the service until it's interrupted.
+        """
+        # The asyncio, http and urllib imports are only done in the service, so they don't slow down every start
+        import asyncio
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        """Starts the writer and the server, and answers requests until the service is stopped.
+        """
+        import asyncio
+        self.writequeue = asyncio.Queue()
+        writer = asyncio.create_task(self._write_Turfs())
+        server = await asyncio.start_server(self._handle_Connection, self.host, self.port)
+        print(f'Serving the TurfTool at http://{self.host}:{self.port}')
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer.cancel()
+            self.worker.shutdown()
+
+    def _read_State(self):
+        """Checks whether the turf file could have changed since the responses were made. This only asks the file system,
+            so it's a lot quicker than reading the turf file. With solidarity, passing time can also change the balance.
+
+        Returns:
+            tuple: Size and modification time of the turf file, plus the current minute if solidarity is on.
+        """
+        path = self.tool.binarypath if self.tool.turfformat == 'binary' else self.tool.turfpath
+        turfstat = os.stat(path)
+        minute = int(time.time() // 60) if self.tool.solidarity else None
+        return turfstat.st_size, turfstat.st_mtime_ns, minute
+
+    async def _respond(self,key,make):
+        """Gets a ready-made response, or makes it in the worker thread if the turf file changed since.
+            Besides responses, this also keeps the turf index.
+
+        Args:
+            key (tuple): Which response it is.
+            make (function): Makes the response, runs in the worker thread.
+
+        Returns:
+            bytes: The response as JSON, or the turf index.
+        """
+        import asyncio
+        state = self._read_State()
+        if state != self.state:
+            self.state = state
+            self.responses = {}
+        if key not in self.responses:
+            # Requests coming in while it's being made wait for the same response
+            self.responses[key] = asyncio.get_running_loop().run_in_executor(self.worker, make)
+        try:
+            return await self.responses[key]
+        except Exception:
+            # Don't keep failures around, the next request tries again
+            if self.responses.get(key) is not None and self.responses[key].done():
+                self.responses.pop(key)
+            raise
+
+    def _make_Balance(self):
+        """Makes the balance response. Runs in the worker thread.
+
+        Returns:
+            bytes: Current and all-time balance as JSON.
+        """
+        self.tool.currenttime = max(self.tool.currenttime, datetime.datetime.now())
+        turfbalance, alltimebalance = self.tool.read_Turfbalance()
+        return json.dumps({'balance': turfbalance,
+                           'alltime': alltimebalance,
+                           'time': self.tool.currenttime.isoformat(timespec='minutes')}).encode()
+
+    def _make_Statistics(self,group):
+        """Makes the statistics response, with the same data as the Statistics plots at the current time. Runs in the worker thread.
+
+        Args:
+            group (list): Names of the people to give the statistics of.
+
+        Returns:
+            bytes: Times of the turfs, the current and all-time balance of everyone after every turf and the turf reasons as JSON.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('The statistics need numpy, which is not installed. Run requirements.bat to install it.') from None
+
+        self.tool.currenttime = max(self.tool.currenttime, datetime.datetime.now())
+        turfbalance, turfset = self.tool.read_TurfFile()
+        statistics = {'time': [], 'balance': {}, 'alltime': {}, 'reasons': {}, 'other': []}
+        if len(turfset) > 0:
+            with self.tool.profiler.phase('turfmat'):
+                turfmat, nondisplayedreasons = self.tool._build_Turfmat(turfset,group)
+            statistics['time'] = [turftime.isoformat(timespec='minutes') for turftime in turfmat['time']]
+            statistics['balance'] = {name: turfmat[name]['current'].tolist() for name in dict.fromkeys(group)}
+            statistics['alltime'] = {name: turfmat[name]['alltime'].tolist() for name in dict.fromkeys(group)}
+            statistics['reasons'] = self.tool._count_Turfreasons(turfmat,-1)
+            statistics['other'] = sorted(set(nondisplayedreasons))
+        return json.dumps(statistics).encode()
+
+    def _make_Turfindex(self):
+        """Makes the turf index for the history requests. Runs in the worker thread.
+
+        Returns:
+            TurfIndex: The index. It's never changed afterwards, so it can be queried from anywhere.
+        """
+        self.tool.currenttime = max(self.tool.currenttime, datetime.datetime.now())
+        return self.tool.read_Turfindex()
+
+    def _select_Group(self,query):
+        """Works out whose statistics are asked for, in the same way as in the Statistics prompt.
+
+        Args:
+            query (dict): Parsed query string of the request.
+
+        Returns:
+            list: Names of the selected people.
+        """
+        if 'group' in query:
+            group = self.tool._aliastranslate(self.tool.groupindex,query['group'][0])
+            if group not in self.tool.groups.keys():
+                raise ValueError(f'Unknown group "{query["group"][0]}"')
+            return self.tool.groups[group]
+        elif 'names' in query:
+            return self.tool._import_Names(query['names'][0])
+        return list(self.tool.names.values())
+
+    async def _write_Turfs(self):
+        """The writer. Writes everything that's waiting in one go, so the turf file is only locked once however many\
+            turfs come in at the same time.
+        """
+        import asyncio
+        while True:
+            batch = [await self.writequeue.get()]
+            while not self.writequeue.empty():
+                batch.append(self.writequeue.get_nowait())
+
+            turfs = [turf for turflist, _ in batch for turf in turflist]
+            try:
+                await asyncio.get_running_loop().run_in_executor(self.worker, self.tool.write_TurfBatch, turfs)
+            except Exception as error:
+                for _, written in batch:
+                    written.set_exception(error)
+            else:
+                for turflist, written in batch:
+                    written.set_result(len(turflist))
+
+    async def _add_Turfs(self,category,body):
+        """Checks posted turfs or innings and hands them to the writer. Either all of them are written, or none if any has a mistake.
+
+        Args:
+            category (str): Either "turf" or "inning".
+            body (bytes): A JSON object, or a list of them, with names, reason, amount, date and time.
+
+        Returns:
+            int: HTTP status.
+            dict: The response.
+        """
+        import asyncio
+        try:
+            posted = json.loads(body)
+        except ValueError:
+            return 400, {'errors': [[0, 'Body is not valid JSON']]}
+        if isinstance(posted, dict):
+            posted = [posted]
+        if not isinstance(posted, list) or not all(isinstance(turf, dict) for turf in posted):
+            return 400, {'errors': [[0, 'Expected a JSON object or a list of JSON objects']]}
+
+        importrows = [[category] + [str(turf.get(field) if turf.get(field) is not None else '')
+                                    for field in ['names','reason','amount','date','time']] for turf in posted]
+        turfs, errors = await asyncio.get_running_loop().run_in_executor(self.worker, self.tool._compile_Imports, importrows)
+        if len(errors) > 0:
+            return 400, {'errors': errors}
+
+        written = asyncio.get_running_loop().create_future()
+        await self.writequeue.put((turfs, written))
+        return 200, {'written': await written}
+
+    async def _handle_Connection(self,reader,writer):
+        """Answers the requests coming in over one connection, until the client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): Incoming side of the connection.
+            writer (asyncio.StreamWriter): Outgoing side of the connection.
+        """
+        import asyncio
+        import http
+        try:
+            while True:
+                requestline = await reader.readline()
+                if requestline == b'':
+                    break
+                try:
+                    method, target, version = requestline.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    headerline = await reader.readline()
+                    if headerline in [b'\r\n', b'\n', b'']:
+                        break
+                    header, _, value = headerline.decode('latin-1').partition(':')
+                    headers[header.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, response = await self._route(method, target, body)
+                keepalive = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+                writer.write(f'HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n'
+                             'Content-Type: application/json\r\n'
+                             f'Content-Length: {len(response)}\r\n'
+                             f'Connection: {"keep-alive" if keepalive else "close"}\r\n\r\n'.encode('latin-1') + response)
+                await writer.drain()
+                if not keepalive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self,method,target,body):
+        """Sends a request to the right endpoint.
+
+        Args:
+            method (str): HTTP method.
+            target (str): Path and query string.
+            body (bytes): Request body.
+
+        Returns:
+            int: HTTP status.
+            bytes: The response as JSON.
+        """
+        import urllib.parse
+        url = urllib.parse.urlsplit(target)
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            if method == 'GET' and url.path == '/balance':
+                return 200, await self._respond(('balance',), self._make_Balance)
+            elif method == 'GET' and url.path == '/statistics':
+                group = tuple(self._select_Group(query))
+                return 200, await self._respond(('statistics', group), functools.partial(self._make_Statistics, list(group)))
+            elif method == 'GET' and url.path == '/history':
+                group = self._select_Group(query)
+                moments = {key: datetime.datetime.fromisoformat(query[key][0]) if key in query else None for key in ['at', 'start', 'end']}
+                if moments['at'] is None and None in [moments['start'], moments['end']]:
+                    raise ValueError('Give either at, or both start and end')
+                # The index is kept like the other responses, a query itself is quick enough to answer right away
+                turfindex = await self._respond(('turfindex',), self._make_Turfindex)
+                if moments['at'] is not None:
+                    return 200, json.dumps(turfindex.query(moments['at'], group)).encode()
+                return 200, json.dumps(turfindex.query_Range(moments['start'], moments['end'], group)).encode()
+            elif method == 'POST' and url.path in ['/turf', '/inning']:
+                status, response = await self._add_Turfs(url.path[1:], body)
+                return status, json.dumps(response).encode()
+            elif url.path in ['/balance', '/statistics', '/history', '/turf', '/inning']:
+                return 405, json.dumps({'error': f'{method} is not allowed on {url.path}'}).encode()
+            return 404, json.dumps({'error': f'Unknown endpoint {url.path}'}).encode()
+        except ValueError as error:
+            return 400, json.dumps({'error': str(error)}).encode()
+        except ImportError as error:
+            # Only the statistics need numpy, the rest keeps working without it
+            return 503, json.dumps({'error': str(error)}).encode()
+        except Exception as error:
+            return 500, json.dumps({'error': str(error)}).encode()
+
+
+
+
+if __name__ == '__main__':
+    sys.tracebacklimit = 0
+    # Weird thing that happens is that dirname reads two different things depending on whether you run the .py or the .bat file,
+    # making it absolute first gives the same folder either way (and also works outside of Windows).
+    config = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.cfg')
+
+    # Without arguments the prompts are opened, otherwise turfs can be imported from a file or stdin
+    import argparse
+    parser = argparse.ArgumentParser(description='TurfTool. Opens the prompts when started without a command.')
+    parser.add_argument('--config', default=config, help='path to the settings cfg file')
+    parser.add_argument('--trace', help='time every phase and write the timings and counters as a JSON trace to this file when done')
+    parser.add_argument('--profile', help='run cProfile and write its statistics to this file when done')
+    commands = parser.add_subparsers(dest='command')
+    importparser = commands.add_parser('import', help='import turfs and innings without the prompts')
+    importparser.add_argument('file', help='file with a "Category;Names;Reason;Amount;Date;Time" line per turf, or - to read from stdin')
+    importparser.add_argument('--check', action='store_true', help='only check the file, nothing is written')
+    reportparser = commands.add_parser('report', help='render the statistics of every group and person to images and an index.html')
+    reportparser.add_argument('outdir', help='folder to put the report in')
+    reportparser.add_argument('--format', nargs='+', default=['png'], choices=['png','svg'], help='image formats to render')
+    reportparser.add_argument('--processes', type=int, default=None, help='amount of processes to render with, defaults to the amount of processors')
+    compactparser = commands.add_parser('compact', help='fold the turfs before a cutoff into a snapshot and move them to an archive file')
+    compactparser.add_argument('--cutoff', help='fold the turfs before this moment, formatted like day0 (e.g. "16:00 10 Sep 2024"), defaults to day0 or a week before it with solidarity')
+    serveparser = commands.add_parser('serve', help='answer balance, statistics, turf and inning requests over HTTP with JSON')
+    serveparser.add_argument('--host', default='127.0.0.1', help='address to listen on, defaults to only this computer')
+    serveparser.add_argument('--port', type=int, default=8642, help='port to listen on')
+    args = parser.parse_args()
+
+    # A trace needs every phase, otherwise only the last ones are kept for debugging
+    profiler = TurfProfiler(enabled=args.trace is not None, profile=args.profile is not None,
+                            maxphases=None if args.trace is not None else 10000)
+    try:
+        Turf = TurfTool(args.config, profiler=profiler)
+        if args.command == 'import':
+            importfile = sys.stdin if args.file == '-' else open(args.file, 'r', newline='')
+            written, errors = Turf.import_Turfs(importfile, check=args.check)
+            importfile.close()
+
+            for linenumber, error in errors:
+                print(f'Line {linenumber}: {error}', file=sys.stderr)
+            print(f'{"Checked" if args.check else "Imported"} {written} turf lines, {len(errors)} lines were skipped because of errors.')
+            sys.exit(1 if len(errors) > 0 else 0)
+        elif args.command == 'report':
+            print(f'Report written to {Turf.render_Report(args.outdir, tuple(args.format), args.processes)}')
+        elif args.command == 'compact':
+            cutoff = None if args.cutoff is None else datetime.datetime.strptime(args.cutoff, '%H:%M %d %b %Y')
+            archivepath, archived, snapshot = Turf.compact_TurfFile(cutoff)
+            if archivepath is None:
+                print('There are no turfs before the cutoff, nothing was changed.')
+            else:
+                print(f'Folded {archived} turf lines into {snapshot} snapshot lines, the folded lines are kept in {archivepath}')
+        elif args.command == 'serve':
+            TurfService(Turf, args.host, args.port).serve()
+        else:
+            Turf.launch()
+    finally:
+        # Also write down the timings if it crashed or was stopped, that's usually when they're most interesting
+        if args.trace is not None:
+            profiler.export_Trace(args.trace)
+        if args.profile is not None:
+            profiler.export_Profile(args.profile)
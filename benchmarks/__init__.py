@@ -0,0 +1 @@
+'''Benchmarks for the TurfTool. Run them from the folder of the TurfTool, e.g. python -m benchmarks.suite'''
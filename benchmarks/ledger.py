@@ -0,0 +1,141 @@
+'''Synthetic turf files for the benchmarks, which look like a committee that has been turfing for a while'''
+
+import argparse
+import configparser
+import csv
+import datetime
+import os
+import random
+
+# Names are picked from here in order, after that they get a number
+FIRST_NAMES = ['Wouter', 'Thijs', 'Meine', 'Anna', 'Eva', 'Lotte', 'Sam', 'Matthijs', 'Sophie', 'Julia',
+               'Daan', 'Lucas', 'Emma', 'Noor', 'Finn', 'Tess', 'Jesse', 'Lieke', 'Bram', 'Fleur']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+
+def read_Reasons(config):
+    """Reads the turf and inning reasons with their standard values from a settings cfg file.
+
+    Args:
+        config (str): Path to the settings cfg file.
+
+    Returns:
+        dict: Standard value per turf reason.
+        dict: Standard value per inning reason.
+    """
+    ConfigParser = configparser.ConfigParser(interpolation=None)
+    ConfigParser.optionxform = str
+    ConfigParser.read(config)
+    turfreasons = {reason: int(value.split('],')[1]) for reason, value in ConfigParser.items('turfreasons')}
+    inningreasons = {reason: int(value.split('],')[1]) for reason, value in ConfigParser.items('inningreasons')}
+    return turfreasons, inningreasons
+
+
+
+def generate_Ledger(folder,rows=10000,members=7,seed=0,days=365,config=None):
+    """Writes a settings cfg file and a turf file with the given amount of lines and members to a folder.
+        The same arguments always give exactly the same files.\
+        The settings are copied from the settings cfg file of the repo, with the members filled in. Every member
+        gets an alias, and there are a couple of groups. Most turfs are handed out in a weekly meeting, the rest
+        is spread over the week, and a turf is usually worth the standard value of its reason.
+        About a quarter of the lines are innings, which are paid off in batches by people with a lot of turfs.
+
+    Args:
+        folder (str): Folder to write settings.cfg and Turfjes.csv to. It's created if it doesn't exist yet.
+        rows (int, optional): Amount of lines in the turf file. Defaults to 10000.
+        members (int, optional): Amount of committee members. Defaults to 7.
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+        days (int, optional): Amount of days the turfs are spread over, starting at day0. Defaults to 365.
+        config (str, optional): Settings cfg file to take the reasons and rules from. Defaults to the one in the repo.
+
+    Returns:
+        str: Path to the generated settings cfg file.
+    """
+    if config is None:
+        config = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'settings.cfg')
+    rnd = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+
+    ConfigParser = configparser.ConfigParser(interpolation=None)
+    ConfigParser.optionxform = str
+    ConfigParser.read(config)
+    turfreasons, inningreasons = read_Reasons(config)
+    day0 = datetime.datetime.strptime(ConfigParser.get('plotsettings','day0'), '%H:%M %d %b %Y')
+
+    # Fill in the members, their aliases and the groups
+    names = [FIRST_NAMES[i] if i < len(FIRST_NAMES) else f'{FIRST_NAMES[i % len(FIRST_NAMES)]} {i // len(FIRST_NAMES) + 1}'
+             for i in range(members)]
+    for section in ['names', 'aliases', 'groups', 'groupsaliases']:
+        ConfigParser.remove_section(section)
+        ConfigParser.add_section(section)
+    for i, name in enumerate(names):
+        ConfigParser.set('names', f'F{i + 1}', name)
+        ConfigParser.set('aliases', f'F{i + 1}', f'[{i + 1},{name[0]}{i + 1}]')
+    groups = {'Iedereen': (names, 'i'), 'Helft': (names[:max(1, members // 2)], 'h'), 'DB': (names[:min(3, members)], 'd')}
+    for group, (people, alias) in groups.items():
+        ConfigParser.set('groups', group, f'[{",".join(people)}]')
+        ConfigParser.set('groupsaliases', group, f'[{alias}]')
+
+    # The plots want a colour per person
+    colours = [f'{rnd.randrange(0x1000000):06X}' for _ in names]
+    ConfigParser.set('plotsettings', 'colours', f'[{",".join(colours)}]')
+    if ConfigParser.has_section('files'):
+        ConfigParser.set('files', 'turfformat', 'csv')
+
+    configpath = os.path.join(folder, 'settings.cfg')
+    with open(configpath, 'w') as configfile:
+        ConfigParser.write(configfile)
+
+    # Some people get turfed a lot more than others
+    weights = [rnd.uniform(0.2, 2) for _ in names]
+    turflist = list(turfreasons.keys())
+    inninglist = list(inningreasons.keys())
+    turfcount = {name: 0 for name in names}
+
+    # Put down the turf times first, about two thirds are on the evening of the weekly meeting
+    minutes = []
+    for _ in range(rows):
+        if rnd.random() < 0.65:
+            day = rnd.randrange(days) // 7 * 7 + 1
+            minute = day * 24 * 60 + 19 * 60 + rnd.randrange(180)
+        else:
+            minute = rnd.randrange(days * 24 * 60)
+        minutes.append(minute)
+    minutes.sort()
+
+    with open(os.path.join(folder, 'Turfjes.csv'), 'w', newline='') as turffile:
+        writer = csv.writer(turffile, delimiter=';')
+        writer.writerow(['Category', 'Name', 'Time', 'Day', 'Month', 'Year', 'Reason', 'Quantity'])
+        for minute in minutes:
+            eventtime = day0 + datetime.timedelta(minutes=minute)
+            if rnd.random() < 0.75:
+                name = rnd.choices(names, weights)[0]
+                reason = rnd.choice(turflist)
+                category, quantity = 'turf', turfreasons[reason] if rnd.random() < 0.9 else rnd.randint(1, 5)
+                turfcount[name] += quantity
+            else:
+                # Innings mostly come from whoever has the most turfs
+                name = max(rnd.sample(names, min(3, members)), key=turfcount.get)
+                reason = rnd.choice(inninglist)
+                category, quantity = 'minus', inningreasons[reason]
+                turfcount[name] -= quantity
+
+            # A few turfs were written down with a time without leading zeros, as older versions did
+            clock = f'{eventtime.hour:02d}:{eventtime.minute:02d}' if rnd.random() < 0.95 else f'{eventtime.hour}:{eventtime.minute}'
+            writer.writerow([category, name, clock, str(eventtime.day), MONTHS[eventtime.month - 1], str(eventtime.year), reason, quantity])
+
+    return configpath
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Writes a synthetic settings cfg file and turf file for benchmarking.')
+    parser.add_argument('folder', help='folder to write settings.cfg and Turfjes.csv to')
+    parser.add_argument('--rows', type=int, default=10000, help='amount of lines in the turf file')
+    parser.add_argument('--members', type=int, default=7, help='amount of committee members')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random generator')
+    parser.add_argument('--days', type=int, default=365, help='amount of days the turfs are spread over')
+    args = parser.parse_args()
+
+    print(f'Written {generate_Ledger(args.folder, args.rows, args.members, args.seed, args.days)}')
@@ -0,0 +1,78 @@
+'''Startup benchmark for the TurfTool, measures the time until the first prompt shows up'''
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Runs in a fresh interpreter, such that nothing is imported yet. The first input() is the first prompt, so stop there.
+STARTUP_SCRIPT = r'''
+import time
+start = time.perf_counter()
+import builtins, os, sys
+sys.path.insert(0, sys.argv[1])
+if sys.argv[3] == 'eager':
+    import matplotlib.pyplot
+    from matplotlib.widgets import Slider
+import TurfTool
+class FirstPrompt(Exception):
+    pass
+def firstprompt(prompt=''):
+    raise FirstPrompt
+builtins.input = firstprompt
+os.system = lambda command: 0
+sys.stdout = open(os.devnull, 'w')
+try:
+    TurfTool.TurfTool(sys.argv[2]).launch()
+except FirstPrompt:
+    pass
+sys.__stdout__.write(f'{time.perf_counter() - start}\n')
+'''
+
+
+
+def measure_Startup(runs=10,eager=False):
+    """Starts the TurfTool a couple of times in a new Python process and times how long it takes until the first prompt.
+
+    Args:
+        runs (int, optional): Amount of times to start the TurfTool. Defaults to 10.
+        eager (bool, optional): Whether to import matplotlib before the TurfTool, like the TurfTool used to do itself. Defaults to False.
+
+    Returns:
+        list: Time until the first prompt in seconds, once inside Python and once including starting Python itself, for every run.
+    """
+    repodir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    # Use a copy of the settings in a temporary folder, so the turf files are made there
+    tempdir = tempfile.mkdtemp()
+    shutil.copy(os.path.join(repodir, 'settings.cfg'), tempdir)
+
+    timings = []
+    try:
+        for run in range(runs):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, repodir, os.path.join(tempdir, 'settings.cfg'), 'eager' if eager else 'lazy'],
+                                    capture_output=True, text=True, cwd=tempdir, check=True)
+            total = time.perf_counter() - start
+            timings.append((float(result.stdout.strip().splitlines()[-1]), total))
+    finally:
+        shutil.rmtree(tempdir, ignore_errors=True)
+
+    return timings
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Times how long the TurfTool takes to show its first prompt.')
+    parser.add_argument('--runs', type=int, default=10, help='amount of times to start the TurfTool')
+    parser.add_argument('--eager', action='store_true', help='import matplotlib at startup like older versions did, to compare against')
+    args = parser.parse_args()
+
+    timings = measure_Startup(args.runs, args.eager)
+    print(f'Startup with {"eager" if args.eager else "lazy"} matplotlib import, median over {args.runs} runs:')
+    print(f'  until first prompt: {statistics.median(timing[0] for timing in timings)*1000:.1f} ms')
+    print(f'  including Python:   {statistics.median(timing[1] for timing in timings)*1000:.1f} ms')
@@ -0,0 +1,163 @@
+'''Benchmark suite for the TurfTool, times reading the turf file, the balances, the aliases and the statistics on synthetic turf files'''
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPODIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPODIR)
+
+import TurfTool
+from benchmarks.ledger import MONTHS, generate_Ledger
+
+
+
+def time_Call(function,repeat=5,setup=None):
+    """Times a function a couple of times.
+
+    Args:
+        function (function): Function to time, called without arguments.
+        repeat (int, optional): Amount of times to call it. Defaults to 5.
+        setup (function, optional): Called before every call, outside of the timing. Defaults to None.
+
+    Returns:
+        dict: Median, fastest and all timings in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {'median': statistics.median(timings), 'min': min(timings), 'runs': timings}
+
+
+
+def bench_Ledger(folder,repeat=5):
+    """Runs all benchmarks on one generated turf file.
+
+    Args:
+        folder (str): Folder with the settings cfg file and the turf file, as made by generate_Ledger.
+        repeat (int, optional): Amount of times to run every benchmark. Defaults to 5.
+
+    Returns:
+        dict: Timings per benchmark.
+    """
+    Turf = TurfTool.TurfTool(os.path.join(folder, 'settings.cfg'))
+    # Solidarity runs up to the current time, so stop at the last turf to get the same work on every day
+    turfset = Turf._parse_TurfFile()
+    if len(turfset) > 0:
+        Turf.currenttime = turfset[-1].time
+    names = list(Turf.names.values())
+    results = {}
+
+    # Every read should read the whole turf file itself, not the statistics cache or what was followed before
+    def forget():
+        Turf.statisticscache.clear()
+        Turf.turftail = None
+    results['read_TurfFile'] = time_Call(lambda: Turf.read_TurfFile(solidarity=False), repeat, forget)
+    results['read_TurfFile_solidarity'] = time_Call(lambda: Turf.read_TurfFile(solidarity=True), repeat, forget)
+
+    # While the TurfTool is open, reading after a turf was written only reads that turf
+    def append():
+        Turf.read_TurfFile()
+        now = Turf.currenttime
+        Turf.write_TurfBatch([['turf', names[0], f'{now.hour:02d}:{now.minute:02d}', str(now.day),
+                               MONTHS[now.month - 1], str(now.year), turfset[-1].reason, 1]])
+    results['read_TurfFile_append'] = time_Call(lambda: Turf.read_TurfFile(), repeat, append)
+
+    _, turfset = Turf.read_TurfFile()
+    results['_calc_Turfbalance'] = time_Call(lambda: Turf._calc_Turfbalance(turfset, names), repeat)
+    results['_calc_Turfbalance_alltime'] = time_Call(lambda: Turf._calc_Turfbalance(turfset, names, alltime=True), repeat)
+
+    # Look up a mix of names, aliases, typos and things that don't exist, like people type them
+    responses = []
+    for name in names[:50]:
+        responses += [name, Turf.aliases[name][-1], name[:-1] + name[-1].upper(), name[1:], 'x' + name[::-1]]
+    def translate():
+        for response in responses:
+            Turf._aliastranslate(Turf.nameindex, response)
+    results['_aliastranslate'] = time_Call(translate, repeat)
+    results['_aliastranslate']['lookups'] = len(responses)
+
+    # What Statistics does before showing anything, for everyone and for one group
+    group = Turf.groups['DB']
+    def prepare(group):
+        turfmat, _ = Turf._build_Turfmat(turfset, group)
+        Turf._count_Turfreasons(turfmat, -1)
+        Turf._count_Turfreasons(turfmat, len(turfmat['reasonid']) // 2)
+    try:
+        import numpy
+    except ImportError:
+        results['statistics'] = results['statistics_group'] = None
+    else:
+        results['statistics'] = time_Call(lambda: prepare(names), repeat)
+        results['statistics_group'] = time_Call(lambda: prepare(group), repeat)
+
+    return results
+
+
+
+def run_Suite(sizes,repeat=5,seed=0):
+    """Generates a turf file for every size and runs the benchmarks on it.
+
+    Args:
+        sizes (list): Sizes as [(rows, members),...].
+        repeat (int, optional): Amount of times to run every benchmark. Defaults to 5.
+        seed (int, optional): Seed for the generated turf files. Defaults to 0.
+
+    Returns:
+        dict: The environment and the timings per size, ready to be written as JSON.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, cwd=REPODIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    report = {'commit': commit,
+              'date': datetime.datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'repeat': repeat,
+              'seed': seed,
+              'results': []}
+
+    for rows, members in sizes:
+        tempdir = tempfile.mkdtemp()
+        try:
+            generate_Ledger(tempdir, rows, members, seed)
+            report['results'].append({'rows': rows, 'members': members, 'timings': bench_Ledger(tempdir, repeat)})
+        finally:
+            shutil.rmtree(tempdir, ignore_errors=True)
+
+    return report
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Times the TurfTool on synthetic turf files and writes the timings as JSON.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='amount of lines of the turf files')
+    parser.add_argument('--members', type=int, nargs='+', default=[7], help='amount of committee members, every amount is run with every amount of lines')
+    parser.add_argument('--repeat', type=int, default=5, help='amount of times to run every benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated turf files')
+    parser.add_argument('--output', default='-', help='file to write the JSON to, defaults to the screen')
+    args = parser.parse_args()
+
+    report = run_Suite([(rows, members) for members in args.members for rows in args.rows], args.repeat, args.seed)
+    if args.output == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, 'w') as outputfile:
+            json.dump(report, outputfile, indent=2)
+        for result in report['results']:
+            timings = ', '.join(f'{name} {timing["median"]*1000:.1f} ms' for name, timing in result['timings'].items() if timing is not None)
+            print(f'{result["rows"]} lines, {result["members"]} members: {timings}')
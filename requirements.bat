@@ -1 +1 @@
-python -m pip install matplotlib
\ No newline at end of file
+python -m pip install matplotlib numpy
\ No newline at end of file
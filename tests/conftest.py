@@ -0,0 +1,36 @@
+'''Shared setup for the tests, makes the TurfTool and the benchmarks importable from the repo'''
+
+import os
+import sys
+
+import pytest
+
+REPODIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPODIR)
+
+import TurfTool
+from benchmarks.ledger import generate_Ledger
+
+
+
+@pytest.fixture
+def make_Ledger(tmp_path):
+    """Makes a TurfTool on a generated turf file in a temporary folder.
+
+    Returns:
+        function: Takes the same arguments as generate_Ledger after the folder, plus turfformat and solidarity
+                  to change those settings, and gives the TurfTool.
+    """
+    def make(rows=2000,members=7,seed=0,turfformat='csv',solidarity=None,**kwargs):
+        folder = tmp_path / f'ledger{rows}_{members}_{seed}_{turfformat}'
+        configpath = generate_Ledger(str(folder), rows, members, seed, **kwargs)
+        if turfformat != 'csv' or solidarity is not None:
+            with open(configpath) as configfile:
+                config = configfile.read()
+            config = config.replace('turfformat = csv', f'turfformat = {turfformat}')
+            if solidarity is not None:
+                config = config.replace('solidarity = True', f'solidarity = {solidarity}')
+            with open(configpath, 'w') as configfile:
+                configfile.write(config)
+        return TurfTool.TurfTool(configpath)
+    return make
@@ -0,0 +1,85 @@
+'''The binary turf file gives the same turfs, balances and plots as the csv turf file'''
+
+import pytest
+
+import TurfTool
+
+
+
+def read_Both(Turf,solidarity):
+    """Reads the turf file as csv and as binary.
+
+    Returns:
+        tuple: Turf balance and turf list of the csv turf file.
+        tuple: Turf balance and turf list of the binary turf file.
+    """
+    Turf.currenttime = Turf._parse_TurfFile()[-1].time
+    csvread = Turf.read_TurfFile(solidarity=solidarity)
+    Turf.convert_TurfFile('binary')
+    Turf.turfformat = 'binary'
+    return csvread, Turf.read_TurfFile(solidarity=solidarity)
+
+
+
+@pytest.mark.parametrize('solidarity', [False, True])
+def test_same_turfs_as_csv(make_Ledger,solidarity):
+    Turf = make_Ledger(rows=5000, seed=6)
+    (csvbalance, csvturfs), (binarybalance, binaryturfs) = read_Both(Turf, solidarity)
+    assert isinstance(binaryturfs, TurfTool.TurfColumns)
+    assert binarybalance == csvbalance
+    assert [repr(turf) for turf in binaryturfs] == [repr(turf) for turf in csvturfs]
+
+    names = list(Turf.names.values())
+    assert Turf._calc_Turfbalance(binaryturfs, names, alltime=True) == Turf._calc_Turfbalance(csvturfs, names, alltime=True)
+
+
+
+def test_same_turfmat_as_csv(make_Ledger):
+    np = pytest.importorskip('numpy')
+    Turf = make_Ledger(rows=5000, seed=7)
+    (_, csvturfs), (_, binaryturfs) = read_Both(Turf, True)
+    group = list(Turf.names.values())[:3]
+
+    csvmat, csvreasons = Turf._build_Turfmat(csvturfs, group)
+    binarymat, binaryreasons = Turf._build_Turfmat(binaryturfs, group)
+    assert binaryreasons == csvreasons
+    assert csvmat.keys() == binarymat.keys()
+    for key, value in csvmat.items():
+        if isinstance(value, dict):
+            for column in value:
+                assert np.array_equal(value[column], binarymat[key][column])
+        elif isinstance(value, np.ndarray):
+            assert np.array_equal(value, binarymat[key])
+        else:
+            assert value == binarymat[key]
+
+
+
+def test_writes_after_each_other(make_Ledger):
+    # The string tables are kept between writes, a new name in between has to end up in the file
+    Turf = make_Ledger(rows=500, seed=8)
+    read_Both(Turf, False)
+    name = list(Turf.names.values())[0]
+    Turf.write_TurfBatch([['turf', 'Nieuw', '09:05', '3', 'Jul', '2031', 'Iets', 2]])
+    Turf.write_TurfBatch([['minus', name, '09:06', '3', 'Jul', '2031', 'Iets anders', 1],
+                          ['turf', 'Nieuw', '09:07', '3', 'Jul', '2031', 'Iets', 1]])
+
+    turfs = list(Turf._read_Turfbinary())[-3:]
+    assert [(turf.category, turf.name, turf.reason, turf.quantity) for turf in turfs] == \
+           [('turf', 'Nieuw', 'Iets', 2), ('minus', name, 'Iets anders', 1), ('turf', 'Nieuw', 'Iets', 1)]
+
+
+
+def test_cached_turfs_are_read_only(make_Ledger):
+    Turf = make_Ledger(rows=500, seed=11)
+    (_, csvturfs), (_, binaryturfs) = read_Both(Turf, True)
+    assert isinstance(csvturfs, tuple)
+    with pytest.raises(TypeError):
+        binaryturfs[0] = csvturfs[0]
+
+    # The fingerprint stays the same until something is written, so the cached turfs are used until then
+    fingerprint = Turf._fingerprint_TurfFile()
+    assert Turf.read_TurfFile()[1] is Turf.read_TurfFile()[1]
+    assert Turf._fingerprint_TurfFile() == fingerprint
+    Turf.write_TurfBatch([['turf', list(Turf.names.values())[0], '09:05', '3', 'Jul', '2031', 'Iets', 1]])
+    assert Turf._fingerprint_TurfFile() != fingerprint
@@ -0,0 +1,115 @@
+'''The checkpoint file gives the same balances as reading everything, and only reads what was written since'''
+
+import datetime
+import os
+import random
+
+import pytest
+
+import TurfTool
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+
+def append_Turfs(Turf,start,amount,seed):
+    """Writes random turfs and innings after a moment.
+
+    Args:
+        Turf (TurfTool): The TurfTool to write with.
+        start (datetime.datetime): Time of the first turf, the others follow within a couple of days.
+        amount (int): Amount of turfs.
+        seed (int): Seed of the random generator.
+    """
+    rnd = random.Random(seed)
+    names = list(Turf.names.values())
+    turfs = []
+    for _ in range(amount):
+        eventtime = start + datetime.timedelta(minutes=rnd.randrange(3*24*60))
+        turfs.append([rnd.choice(['turf', 'turf', 'minus']), rnd.choice(names), f'{eventtime.hour:02d}:{eventtime.minute:02d}',
+                      str(eventtime.day), MONTHS[eventtime.month - 1], str(eventtime.year), 'Spelling', rnd.randint(1, 3)])
+    Turf.write_TurfBatch(turfs)
+
+
+
+def read_Fresh(Turf,solidarity):
+    """Reads everything with a new TurfTool that has no checkpoint file and hasn't read anything yet.
+
+    Returns:
+        dict: Turf balance.
+        dict: All-time turf balance.
+        list: The turf list as read_TurfFile gives it.
+    """
+    if os.path.exists(Turf.checkpointpath):
+        os.remove(Turf.checkpointpath)
+    Fresh = TurfTool.TurfTool(os.path.join(os.path.dirname(Turf.turfpath), 'settings.cfg'))
+    Fresh.currenttime = Turf.currenttime
+    turfbalance, turfset = Fresh.read_TurfFile(solidarity=solidarity)
+    return turfbalance, Fresh._calc_Turfbalance(turfset, list(Fresh.names.values()), alltime=True), turfset
+
+
+
+@pytest.mark.parametrize('solidarity', [False, True])
+def test_same_balance_as_reading_everything(make_Ledger,solidarity):
+    Turf = make_Ledger(rows=3000, seed=1)
+    last = Turf._parse_TurfFile()[-1].time
+    Turf.currenttime = last
+
+    steps = [(last + datetime.timedelta(hours=1), 30),          # the usual case, new turfs at the end
+             (last - datetime.timedelta(days=30), 5),           # turfs written for a month ago
+             (last + datetime.timedelta(days=20), 40)]          # turfs after a couple of solidarity moments
+    Turf.read_Turfbalance(solidarity=solidarity)
+    for seed, (start, amount) in enumerate(steps):
+        append_Turfs(Turf, start, amount, seed)
+        Turf.currenttime = max(Turf.currenttime, start + datetime.timedelta(days=3))
+        turfbalance, alltimebalance = Turf.read_Turfbalance(solidarity=solidarity)
+        checkpointed = open(Turf.checkpointpath, 'rb').read()
+        expected = read_Fresh(Turf, solidarity)
+        assert (turfbalance, alltimebalance) == expected[:2]
+        open(Turf.checkpointpath, 'wb').write(checkpointed)
+
+
+
+def test_only_reads_new_turfs(make_Ledger):
+    Turf = make_Ledger(rows=3000, seed=2)
+    Turf.profiler.enabled = True
+    Turf.currenttime = Turf._parse_TurfFile()[-1].time
+    Turf.read_Turfbalance()
+
+    parsed = Turf.profiler.counters['turfs parsed']
+    append_Turfs(Turf, Turf.currenttime + datetime.timedelta(hours=1), 7, 0)
+    Turf.read_Turfbalance()
+    assert Turf.profiler.counters['turfs parsed'] - parsed == 7
+
+
+
+def test_rewritten_turf_file(make_Ledger):
+    Turf = make_Ledger(rows=3000, seed=3)
+    Turf.currenttime = Turf._parse_TurfFile()[-1].time
+    Turf.read_Turfbalance()
+
+    # Someone changes the first turf, like Excel would by writing a new file
+    turfdata = open(Turf.turfpath, 'rb').read()
+    firstline = turfdata.index(b'\n') + 1
+    open(Turf.turfpath + '.tmp', 'wb').write(turfdata[:firstline] + turfdata[firstline:].replace(b';1\r\n', b';3\r\n', 1))
+    os.replace(Turf.turfpath + '.tmp', Turf.turfpath)
+    assert Turf.read_Turfbalance() == read_Fresh(Turf, Turf.solidarity)[:2]
+
+
+
+def test_statistics_continue_from_checkpoint(make_Ledger):
+    Turf = make_Ledger(rows=3000, seed=4)
+    Turf.currenttime = Turf._parse_TurfFile()[-1].time
+    Turf.read_Turfbalance()
+    append_Turfs(Turf, Turf.currenttime + datetime.timedelta(hours=1), 10, 0)
+
+    # A new TurfTool takes the solidarity up to the checkpoint from the checkpoint file
+    Opened = TurfTool.TurfTool(os.path.join(os.path.dirname(Turf.turfpath), 'settings.cfg'))
+    Opened.profiler.enabled = True
+    Opened.currenttime = Turf.currenttime
+    turfbalance, turfset = Opened.read_TurfFile()
+    assert Opened.profiler.counters['solidarity from checkpoint'] == 1
+
+    expected = read_Fresh(Turf, True)
+    assert turfbalance == expected[0]
+    assert [repr(turf) for turf in turfset] == [repr(turf) for turf in expected[2]]
@@ -0,0 +1,32 @@
+'''Compacting the turf file keeps the balances, all-time turfs and reasons from the cutoff onwards'''
+
+import datetime
+
+import pytest
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+
+@pytest.mark.parametrize('forcenonegative', [True, False])
+def test_same_index_after_compacting(make_Ledger,forcenonegative):
+    Turf = make_Ledger(rows=3000, seed=12, solidarity=False)
+    Turf.forcenonegative = forcenonegative
+    turfset = Turf._parse_TurfFile()
+    cutoff = turfset[len(turfset) // 2].time
+    Turf.currenttime = turfset[-1].time
+
+    # Someone ins way more than they have before the cutoff, which the no-negative-turf rule partly absorbs
+    innedtime = cutoff - datetime.timedelta(days=30)
+    name = list(Turf.names.values())[0]
+    Turf.write_TurfBatch([['minus', name, f'{innedtime.hour:02d}:{innedtime.minute:02d}', str(innedtime.day),
+                           MONTHS[innedtime.month - 1], str(innedtime.year), 'Bier', 5000]])
+
+    before = Turf.read_Turfindex()
+    moments = [cutoff] + [turf.time for turf in turfset[len(turfset) // 2::50]] + [Turf.currenttime]
+    expected = [before.query(moment) for moment in moments]
+    archivepath, archived, snapshot = Turf.compact_TurfFile(cutoff)
+    assert archived > snapshot > 0
+
+    after = Turf.read_Turfindex()
+    assert [after.query(moment) for moment in moments] == expected
@@ -0,0 +1,32 @@
+'''The compiled settings are written as JSON and give exactly the same TurfTool as compiling the settings cfg file'''
+
+import json
+import os
+
+import TurfTool
+
+
+
+def test_same_settings_as_compiling(make_Ledger):
+    Compiled = make_Ledger(rows=100, seed=13)
+    configpath = os.path.join(os.path.dirname(Compiled.turfpath), 'settings.cfg')
+    compiledpath = os.path.splitext(configpath)[0] + '.compiled'
+    with open(compiledpath, encoding='utf-8') as compiledfile:
+        assert json.load(compiledfile)['key'][0] == TurfTool.TurfTool.configversion
+
+    # Loading the compiled file doesn't compile again
+    profiler = TurfTool.TurfProfiler(enabled=True)
+    Loaded = TurfTool.TurfTool(configpath, profiler=profiler)
+    assert profiler.counters['config compiled'] == 0
+    for setting in ['names', 'aliases', 'groups', 'turfreasons', 'inningreasons', 'day0', 'solidaritydelta', 'colours']:
+        assert getattr(Loaded, setting) == getattr(Compiled, setting)
+        assert type(getattr(Loaded, setting)) is type(getattr(Compiled, setting))
+    for response in ['Wouter', 'w1', 'Wuoter', 'Thjis', 'nobody at all']:
+        assert Loaded.nameindex.translate(response) == Compiled.nameindex.translate(response)
+
+    # A damaged compiled file is simply compiled again
+    with open(compiledpath, 'wb') as compiledfile:
+        compiledfile.write(b'\x80\x04garbage')
+    profiler = TurfTool.TurfProfiler(enabled=True)
+    assert TurfTool.TurfTool(configpath, profiler=profiler).day0 == Compiled.day0
+    assert profiler.counters['config compiled'] == 1
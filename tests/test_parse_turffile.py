@@ -0,0 +1,173 @@
+'''The one-pass loader gives the same turfs and balances as the original loader'''
+
+import collections
+import csv
+import datetime
+import itertools
+
+
+
+def read_Baseline(turfpath):
+    """The original loader: strptime for every line, which is sorted in by sorting all times again and inserting it.\
+        This is a copy of the old read_TurfFile logic rather than a call to it, since that is gone from TurfTool.
+        The original glued the time and date together without spaces, which misreads times without leading zeros
+        like 13:2, so the fields are kept apart here.
+
+    Args:
+        turfpath (str): Path to the turf file.
+
+    Returns:
+        list: Times of the turfs, sorted.
+        list: Lines of the turf file in the same order.
+    """
+    turffile = open(turfpath, 'r', newline='')
+    turfreader = csv.reader(turffile, delimiter=';')
+    next(turfreader)
+
+    turffile_sorted = []
+    timelst = []
+    for line in turfreader:
+        eventtime = datetime.datetime.strptime(' '.join(line[2:6]), "%H:%M %d %b %Y")
+        timelst.append(eventtime)
+        timelst = sorted(timelst)
+        turffile_sorted.insert(timelst.index(eventtime), line)
+    turffile.close()
+    return timelst, turffile_sorted
+
+
+
+def test_same_turfs_as_baseline(make_Ledger):
+    Turf = make_Ledger(rows=10000, seed=3)
+    timelst, baseline = read_Baseline(Turf.turfpath)
+    turfset = Turf._parse_TurfFile()
+
+    # The same times come out, sorted
+    times = [turf.time for turf in turfset]
+    assert times == sorted(times)
+    assert set(times) == set(timelst)
+
+    # Per minute the same turfs, identical lines right after each other are one turf with a quantity
+    def per_Minute(turfs):
+        counts = collections.Counter()
+        for eventtime, category, name, reason, quantity in turfs:
+            counts[(eventtime, category, name, reason)] += quantity
+        return counts
+    assert per_Minute((eventtime, line[0], line[1], line[6], int(line[7])) for eventtime, line in zip(timelst, baseline)) == \
+           per_Minute((turf.time, turf.category, turf.name, turf.reason, turf.quantity) for turf in turfset)
+
+
+
+def test_same_order_as_file_within_a_minute(make_Ledger):
+    # The original loader put a line in front of earlier lines with the same time, the new one keeps the file order
+    Turf = make_Ledger(rows=5000, seed=4)
+    turfset = Turf._parse_TurfFile()
+    filelines = [turf.line for turf in Turf._decode_Turfbytes(open(Turf.turfpath, 'rb').read(), header=True)]
+    merged = []
+    for line in filelines:
+        if len(merged) > 0 and merged[-1][:7] == line[:7]:
+            merged[-1] = merged[-1][:7] + [str(int(merged[-1][7]) + int(line[7]))]
+        else:
+            merged.append(line)
+    stable = sorted(merged, key=lambda line: Turf._decode_Turftime(line[2], line[3], line[4], line[5]))
+    assert [turf.line for turf in turfset] == stable
+
+
+
+def test_same_balance_as_baseline(make_Ledger):
+    Turf = make_Ledger(rows=5000, seed=5)
+    _, baseline = read_Baseline(Turf.turfpath)
+    names = list(Turf.names.values())
+
+    # Without solidarity the original balance just adds up every line
+    expected = {name: 0 for name in names}
+    alltime = {name: 0 for name in names}
+    for line in baseline:
+        if line[0] == 'turf':
+            expected[line[1]] += int(line[7])
+            alltime[line[1]] += int(line[7])
+        else:
+            expected[line[1]] -= int(line[7])
+
+    turfbalance, turfset = Turf.read_TurfFile(solidarity=False)
+    assert turfbalance == expected
+    assert Turf._calc_Turfbalance(turfset, names, alltime=True) == alltime
+
+
+
+def apply_Baseline_Solidarity(Turf,timelst,turffile_sorted,names,currenttime):
+    """The solidarity rule of the old read_TurfFile, copied rather than called like read_Baseline.\
+        Every solidarity moment it adds up the turfs of the week before it, including earlier solidarity turfs, and
+        inserts one single turf at a time for the one lonely at the bottom. Lines count their quantity, which the
+        original file didn't have yet.
+
+    Args:
+        Turf (TurfTool): TurfTool for day 0 and the solidarity moment.
+        timelst (list): Times of the turfs as given by read_Baseline, the solidarity turfs are inserted.
+        turffile_sorted (list): Lines of the turf file as given by read_Baseline, the solidarity turfs are inserted.
+        names (list): List of names.
+        currenttime (datetime.datetime): Time up to which solidarity is applied, like the current time of the TurfTool.
+
+    Returns:
+        dict: Turf balance.
+    """
+    timetrack = Turf.day0
+    turfbalance_dummy = {name: 0 for name in names}
+    sync = False
+
+    while timetrack <= currenttime+datetime.timedelta(days=7):
+        turfs_window = [turffile_sorted[i] for i in range(len(turffile_sorted))
+                        if timetrack - datetime.timedelta(days=7) < timelst[i] and timelst[i] <= timetrack]
+        for turf in turfs_window:
+            if turf[0].lower() == 'turf':
+                turfbalance_dummy[turf[1]] += int(turf[7])
+            elif turf[0].lower() == 'minus':
+                turfbalance_dummy[turf[1]] -= int(turf[7])
+
+        balancelist = turfbalance_dummy.values()
+        if list(balancelist).count(min(balancelist)) == 1:
+            try:
+                index = [timelst[i] >= timetrack for i in range(len(timelst))].index(True)
+            except ValueError:
+                index = -1
+            for i in range(sorted(balancelist)[1] - sorted(balancelist)[0]):
+                solidarityname = [key for key in names if turfbalance_dummy[key] == min(balancelist)][0]
+                turffile_sorted.insert(index,['turf', solidarityname, f'{timetrack.hour}:{timetrack.minute}', timetrack.day,
+                                              None, timetrack.year, 'Solidarity', '1'])
+                timelst.insert(index,timetrack)
+                turfbalance_dummy[solidarityname] += 1
+
+        if sync:
+            timetrack += datetime.timedelta(days=7)
+        else:
+            timetrack += Turf.solidaritydelta
+            sync = True
+
+    return turfbalance_dummy
+
+
+
+def test_same_solidarity_as_baseline(make_Ledger):
+    Turf = make_Ledger(rows=3000, seed=6, solidarity=True)
+    names = list(Turf.names.values())
+    timelst, baseline = read_Baseline(Turf.turfpath)
+
+    # Both run up to the last turf, rather than up to now
+    Turf.currenttime = timelst[0]
+    expected = apply_Baseline_Solidarity(Turf, timelst, baseline, names, timelst[-1])
+    turfbalance, turfset = Turf.read_TurfFile(solidarity=True)
+    assert turfbalance == expected
+    assert any(turf.reason == 'Solidarity' for turf in turfset)
+
+    # The whole turf list is the same, apart from the order within a minute and identical lines being merged.
+    # The original inserted solidarity turfs one at a time, which are merged into a single turf with a quantity here,
+    # but they should still come in front of the other turfs of that minute
+    def per_Run(turfs):
+        runs = []
+        for (eventtime, solidarity), run in itertools.groupby(turfs, key=lambda turf: (turf[0], turf[3] == 'Solidarity')):
+            counts = collections.Counter()
+            for _, category, name, reason, quantity in run:
+                counts[(category, name, reason)] += quantity
+            runs.append((eventtime, solidarity, counts))
+        return runs
+    assert per_Run((eventtime, line[0], line[1], line[6], int(line[7])) for eventtime, line in zip(timelst, baseline)) == \
+           per_Run((turf.time, turf.category, turf.name, turf.reason, turf.quantity) for turf in turfset)
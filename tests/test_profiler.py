@@ -0,0 +1,20 @@
+'''The profiler keeps a bounded amount of phases, but its summary adds up all of them'''
+
+import TurfTool
+
+
+
+def test_phases_are_bounded(tmp_path):
+    profiler = TurfTool.TurfProfiler(enabled=True, maxphases=10)
+    for _ in range(1000):
+        with profiler.phase('redraw'):
+            pass
+    assert len(profiler.phases) == 10
+    assert profiler.summary()['redraw']['calls'] == 1000
+
+    # A trace keeps everything
+    profiler = TurfTool.TurfProfiler(enabled=True, maxphases=None)
+    for _ in range(1000):
+        with profiler.phase('redraw'):
+            pass
+    assert len(profiler.phases) == 1000
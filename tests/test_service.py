@@ -0,0 +1,32 @@
+'''The TurfService answers /statistics with a clear error when numpy is missing, and keeps answering the rest'''
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+import TurfTool
+
+
+
+def test_statistics_without_numpy(make_Ledger, monkeypatch):
+    Service = TurfTool.TurfService(make_Ledger(rows=200))
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+
+    status, response = asyncio.run(Service._route('GET', '/statistics', b''))
+    assert status == 503
+    assert 'numpy' in json.loads(response)['error']
+    assert 'requirements.bat' in json.loads(response)['error']
+
+    status, response = asyncio.run(Service._route('GET', '/balance', b''))
+    assert status == 200
+
+
+
+def test_statistics_with_numpy(make_Ledger):
+    pytest.importorskip('numpy')
+    Service = TurfTool.TurfService(make_Ledger(rows=200))
+    status, response = asyncio.run(Service._route('GET', '/statistics', b''))
+    assert status == 200
+    assert len(json.loads(response)['time']) > 0
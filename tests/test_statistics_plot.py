@@ -0,0 +1,90 @@
+'''Moving the slider changes the plots in place, which should look the same as drawing them from scratch'''
+
+import bisect
+import datetime
+import itertools
+
+import pytest
+
+import TurfTool
+
+
+
+def draw_Reference(Turf,plt,turfmat,group,val):
+    """Draws the bar and pie chart from scratch at a slider value, like the statistics did before they were changed in place.
+
+    Returns:
+        Axes: The bar chart.
+        Axes: The pie chart.
+        list: The wedges of the pie chart.
+    """
+    tselect = min(turfmat['time'][0],Turf.day0) + val*(Turf.currenttime - min(turfmat['time'][0],Turf.day0)+datetime.timedelta(minutes=1))
+    index_t = bisect.bisect_left(list(itertools.accumulate(turfmat['time'], max)), tselect) - 1
+
+    plt.figure()
+    ax1 = plt.subplot(2,2,1)
+    X_axis = list(range(len(group)))
+    ax1.bar([x - 0.2 for x in X_axis], [turfmat[name]['current'][index_t] for name in group], 0.4)
+    ax1.bar([x + 0.2 for x in X_axis], [turfmat[name]['alltime'][index_t] for name in group], 0.4)
+
+    ax2 = plt.subplot(2,2,2)
+    turfeventcount = Turf._count_Turfreasons(turfmat,index_t)
+    turftotal = sum(turfeventcount.values())
+    wedges, _, _ = ax2.pie(turfeventcount.values(),
+                           colors=Turf.colours,
+                           startangle=90,
+                           autopct=lambda i: int(round((i/100)*turftotal)),
+                           pctdistance=1.1)
+    ax2.legend([f"{key} ({turfeventcount[key]})" for key in turfeventcount.keys()], loc='center right', bbox_to_anchor=(-0.16, 0.5))
+    ax2.autoscale()
+    return ax1, ax2, wedges
+
+
+
+def test_same_as_full_redraw(make_Ledger):
+    pytest.importorskip('numpy')
+    matplotlib = pytest.importorskip('matplotlib')
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    Turf = make_Ledger(rows=2000, seed=7)
+    Turf.usecolours = True
+    Turf.maxreasons = 6
+    Turf.currenttime = datetime.datetime(2000, 1, 1)
+    _, turfset = Turf.read_TurfFile()
+    group = list(Turf.names.values())
+    turfmat, _ = Turf._build_Turfmat(turfset,group)
+
+    figure = plt.figure()
+    updateplots = Turf._plot_Statistics(plt,turfmat,group)
+    ax1, ax2 = figure.axes[:2]
+
+    # Back and forth, so the amount of reasons in the pie goes both up and down
+    reasoncounts = set()
+    for val in [0.002, 0.01, 1, 0.0005, 0.3, 0.003, 0.7]:
+        updateplots(val)
+        ref1, ref2, refwedges = draw_Reference(Turf,plt,turfmat,group,val)
+
+        assert [bar.get_height() for bar in ax1.patches] == [bar.get_height() for bar in ref1.patches]
+        assert ax1.get_ylim() == pytest.approx(ref1.get_ylim())
+
+        wedges = [wedge for wedge in ax2.patches if wedge.get_visible()]
+        assert len(wedges) == len(refwedges)
+        for wedge, refwedge in zip(wedges, refwedges):
+            assert (wedge.theta1, wedge.theta2) == pytest.approx((refwedge.theta1, refwedge.theta2))
+            assert wedge.get_facecolor() == refwedge.get_facecolor()
+        # The wedges have empty labels as well, only the numbers next to them have text
+        def numbers(ax):
+            return [text for text in ax.texts if text.get_visible() and text.get_text() != '']
+        assert [text.get_text() for text in numbers(ax2)] == [text.get_text() for text in numbers(ref2)]
+        assert [xy for text in numbers(ax2) for xy in text.get_position()] == \
+               pytest.approx([xy for text in numbers(ref2) for xy in text.get_position()])
+        assert [text.get_text() for text in ax2.get_legend().get_texts()] == [text.get_text() for text in ref2.get_legend().get_texts()]
+        # The limits come from the outlines of the wedges, which are a tiny bit different depending on their angles
+        assert ax2.get_xlim() == pytest.approx(ref2.get_xlim(), abs=1e-3)
+        assert ax2.get_ylim() == pytest.approx(ref2.get_ylim(), abs=1e-3)
+        reasoncounts.add(len(refwedges))
+        plt.close(plt.gcf())
+
+    assert len(reasoncounts) > 2
+    plt.close('all')
@@ -0,0 +1,79 @@
+'''Several TurfTools writing the same turf file at once don't lose or damage turfs, and a crashed batch is left out entirely'''
+
+import multiprocessing
+import os
+
+import pytest
+
+import TurfTool
+
+WORKERS = 6
+BATCHES = 40
+ROWS = 5
+
+
+
+def write_Batches(configpath,worker):
+    """Writes BATCHES batches of ROWS turfs, every turf with its own reason so none of them are merged."""
+    Turf = TurfTool.TurfTool(configpath)
+    name = list(Turf.names.values())[worker % len(Turf.names)]
+    for batch in range(BATCHES):
+        Turf.write_TurfBatch([['turf', name, '12:00', '1', 'Jan', '2030', f'Stress {worker} {batch} {row}', 1] for row in range(ROWS)])
+
+
+
+def read_Lines(Turf):
+    """Parses every line of the turf file, which fails on a damaged line."""
+    return Turf._decode_Turfbytes(open(Turf.turfpath, 'rb').read(), header=True)
+
+
+
+def test_writers_at_the_same_time(make_Ledger):
+    Turf = make_Ledger(rows=500, seed=9)
+    configpath = os.path.join(os.path.dirname(Turf.turfpath), 'settings.cfg')
+    before = len(read_Lines(Turf))
+
+    workers = [multiprocessing.Process(target=write_Batches, args=(configpath, worker)) for worker in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    turfs = read_Lines(Turf)
+    assert len(turfs) == before + WORKERS * BATCHES * ROWS
+    stressed = sorted(turf.reason for turf in turfs if turf.reason.startswith('Stress'))
+    assert stressed == sorted(f'Stress {worker} {batch} {row}' for worker in range(WORKERS) for batch in range(BATCHES) for row in range(ROWS))
+
+
+
+def test_crash_halfway_through_a_batch(make_Ledger,monkeypatch):
+    Turf = make_Ledger(rows=500, seed=10)
+    Turf.currenttime = Turf._parse_TurfFile()[-1].time
+    turfbalance, turfset = Turf.read_TurfFile()
+    size = os.path.getsize(Turf.turfpath)
+
+    # The TurfTool dies after writing the first half of the batch, just after a newline
+    def crash(turffile,turfdata):
+        os_write(turffile, turfdata[:turfdata.index(b'\n', len(turfdata) // 2) + 1])
+        raise KeyboardInterrupt
+    os_write = os.write
+    monkeypatch.setattr(os, 'write', crash)
+    name = list(Turf.names.values())[0]
+    with pytest.raises(KeyboardInterrupt):
+        Turf.write_TurfBatch([['turf', name, '12:00', '1', 'Jan', '2030', f'Crash {row}', 1] for row in range(10)])
+    monkeypatch.undo()
+    assert os.path.getsize(Turf.turfpath) > size
+
+    # Other TurfTools don't see any of the batch
+    Other = TurfTool.TurfTool(os.path.join(os.path.dirname(Turf.turfpath), 'settings.cfg'))
+    Other.currenttime = Turf.currenttime
+    otherbalance, otherset = Other.read_TurfFile()
+    assert otherbalance == turfbalance
+    assert [repr(turf) for turf in otherset] == [repr(turf) for turf in turfset]
+    assert Other.read_Turfbalance()[0] == turfbalance
+
+    # The next batch cuts it off
+    Other.write_TurfBatch([['turf', name, '12:00', '2', 'Jan', '2030', 'After', 1]])
+    reasons = [turf.reason for turf in read_Lines(Turf)]
+    assert reasons[-1] == 'After' and not any(reason.startswith('Crash') for reason in reasons)
@@ -0,0 +1,54 @@
+'''The TurfManager loads its committees in parallel and only lets go of a committee that isn't being used'''
+
+import os
+import threading
+
+import TurfTool
+from benchmarks.ledger import generate_Ledger
+
+
+
+def make_Manager(folder,maxloaded,processes):
+    """Makes a TurfManager over three generated committees."""
+    for seed in range(3):
+        generate_Ledger(str(folder / f'committee{seed}'), rows=1000, seed=seed)
+    return TurfTool.TurfManager.from_folder(str(folder), maxloaded=maxloaded, processes=processes)
+
+
+
+def test_loaded_in_parallel(tmp_path):
+    Manager = make_Manager(tmp_path, 2, 2)
+
+    # The first two committees come back with their turf files read, the third one only with its settings
+    assert list(Manager.loaded.keys()) == ['committee0', 'committee1']
+    assert Manager.tools['committee2'].turftail is None
+    for committee, config in Manager.configs.items():
+        Fresh = TurfTool.TurfTool(config)
+        Fresh.currenttime = Manager.tools[committee].currenttime
+        assert Manager.read_Turfbalance(committee) == Fresh.read_Turfbalance()
+
+
+
+def test_committee_in_use_is_kept(tmp_path):
+    Manager = make_Manager(tmp_path, 1, 1)
+    Manager.read_Turfbalance('committee0')
+    Manager.read_TurfFile('committee1')
+    assert Manager.tools['committee1'].turftail is not None
+
+    # Another call is still busy with committee1, so it keeps its turf file until it's done
+    busy, done = threading.Event(), threading.Event()
+    def use_Committee():
+        with Manager.locks['committee1']:
+            busy.set()
+            done.wait()
+    user = threading.Thread(target=use_Committee)
+    user.start()
+    busy.wait()
+    Manager.read_TurfFile('committee2')
+    assert Manager.tools['committee1'].turftail is not None
+    done.set()
+    user.join()
+
+    Manager.read_TurfFile('committee2')
+    assert Manager.tools['committee1'].turftail is None
+    assert list(Manager.loaded.keys()) == ['committee2']